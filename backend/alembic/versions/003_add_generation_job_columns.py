@@ -0,0 +1,25 @@
+"""Add async generation job columns
+
+Revision ID: 003
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.add_column('generated_documents', sa.Column('job_id', sa.String(), nullable=True))
+    op.add_column('generated_documents', sa.Column('google_status', sa.String(), nullable=True))
+    op.add_column('generated_documents', sa.Column('google_error', sa.Text(), nullable=True))
+    op.create_index('ix_generated_documents_job_id', 'generated_documents', ['job_id'])
+
+def downgrade():
+    op.drop_index('ix_generated_documents_job_id', table_name='generated_documents')
+    op.drop_column('generated_documents', 'google_error')
+    op.drop_column('generated_documents', 'google_status')
+    op.drop_column('generated_documents', 'job_id')
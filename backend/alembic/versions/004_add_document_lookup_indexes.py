@@ -0,0 +1,66 @@
+"""Add lookup indexes on generated_documents
+
+Revision ID: 004
+Create Date: 2026-10-18
+
+On PostgreSQL the indexes are built CONCURRENTLY so the table stays writable
+while they build. Other databases get the same indexes built normally, minus
+the trigram index.
+"""
+
+from alembic import context, op
+import sqlalchemy as sa
+
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+TABLE = 'generated_documents'
+
+
+def upgrade():
+    conn = op.get_bind()
+    if conn.dialect.name != 'postgresql':
+        op.create_index('ix_generated_documents_doc_id', TABLE, ['doc_id'], unique=True)
+        op.create_index('ix_generated_documents_created_at_id', TABLE,
+                        [sa.text('created_at DESC'), sa.text('id DESC')])
+        op.create_index('ix_generated_documents_date', TABLE, ['date'])
+        return
+
+    if not context.is_offline_mode():
+        duplicates = conn.execute(sa.text(
+            "SELECT doc_id FROM generated_documents WHERE doc_id IS NOT NULL "
+            "GROUP BY doc_id HAVING count(*) > 1 LIMIT 5"
+        )).scalars().all()
+        if duplicates:
+            # A failed concurrent build leaves an INVALID index behind, so refuse up front
+            raise RuntimeError(f"Duplicate doc_id values must be resolved first: {duplicates}")
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index('ix_generated_documents_doc_id', TABLE, ['doc_id'],
+                        unique=True, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_generated_documents_created_at_id', TABLE,
+                        [sa.text('created_at DESC'), sa.text('id DESC')],
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_generated_documents_date', TABLE, ['date'],
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_generated_documents_name_trgm', TABLE, ['name'],
+                        postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'},
+                        postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade():
+    conn = op.get_bind()
+    if conn.dialect.name != 'postgresql':
+        op.drop_index('ix_generated_documents_date', table_name=TABLE)
+        op.drop_index('ix_generated_documents_created_at_id', table_name=TABLE)
+        op.drop_index('ix_generated_documents_doc_id', table_name=TABLE)
+        return
+
+    with op.get_context().autocommit_block():
+        for name in ('ix_generated_documents_name_trgm', 'ix_generated_documents_date',
+                     'ix_generated_documents_created_at_id', 'ix_generated_documents_doc_id'):
+            op.drop_index(name, table_name=TABLE, postgresql_concurrently=True, if_exists=True)
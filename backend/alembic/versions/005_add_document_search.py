@@ -0,0 +1,70 @@
+"""Add full-text search over document name and content
+
+Revision ID: 005
+Create Date: 2026-10-18
+
+PostgreSQL: a stored generated tsvector column plus a GIN index (built
+CONCURRENTLY). Adding a stored generated column rewrites the table, so run
+this in a maintenance window on large installs.
+SQLite: an external-content FTS5 table kept in sync by triggers.
+"""
+
+from alembic import op
+
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+SQLITE_FTS = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS generated_documents_fts USING fts5("
+    "name, content, content='generated_documents', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS generated_documents_fts_ai AFTER INSERT ON generated_documents BEGIN "
+    "INSERT INTO generated_documents_fts(rowid, name, content) VALUES (new.id, new.name, new.content); END",
+    "CREATE TRIGGER IF NOT EXISTS generated_documents_fts_ad AFTER DELETE ON generated_documents BEGIN "
+    "INSERT INTO generated_documents_fts(generated_documents_fts, rowid, name, content) "
+    "VALUES ('delete', old.id, old.name, old.content); END",
+    "CREATE TRIGGER IF NOT EXISTS generated_documents_fts_au AFTER UPDATE ON generated_documents BEGIN "
+    "INSERT INTO generated_documents_fts(generated_documents_fts, rowid, name, content) "
+    "VALUES ('delete', old.id, old.name, old.content); "
+    "INSERT INTO generated_documents_fts(rowid, name, content) VALUES (new.id, new.name, new.content); END",
+    # Index the rows that already exist
+    "INSERT INTO generated_documents_fts(generated_documents_fts) VALUES ('rebuild')",
+)
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        for statement in SQLITE_FTS:
+            op.execute(statement)
+        return
+    if dialect != 'postgresql':
+        return
+
+    op.execute(
+        "ALTER TABLE generated_documents ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        "GENERATED ALWAYS AS ("
+        "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(content, '')), 'B')) STORED"
+    )
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_generated_documents_search_vector "
+            "ON generated_documents USING gin (search_vector)"
+        )
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        for name in ('generated_documents_fts_au', 'generated_documents_fts_ad', 'generated_documents_fts_ai'):
+            op.execute(f"DROP TRIGGER IF EXISTS {name}")
+        op.execute("DROP TABLE IF EXISTS generated_documents_fts")
+        return
+    if dialect != 'postgresql':
+        return
+
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_generated_documents_search_vector")
+    op.execute("ALTER TABLE generated_documents DROP COLUMN IF EXISTS search_vector")
@@ -0,0 +1,19 @@
+"""Add generation job lease column
+
+Revision ID: 006
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.add_column('generated_documents', sa.Column('google_claimed_at', sa.DateTime(), nullable=True))
+
+def downgrade():
+    op.drop_column('generated_documents', 'google_claimed_at')
@@ -1,7 +1,7 @@
 from .utils.logger import setup_logger
 setup_logger()  # Initialize logging first
 
-from .database import Base, get_db, init_db
+from .database import Base, get_db, get_async_db, get_read_db, init_db
 from .main import app
 
-__all__ = ['app', 'Base', 'get_db', 'init_db']
\ No newline at end of file
+__all__ = ['app', 'Base', 'get_db', 'get_async_db', 'get_read_db', 'init_db']
\ No newline at end of file
@@ -1,10 +1,178 @@
+import logging
+import time
+import uuid
+from typing import List
+from fastapi import Request, Response
 from sqlalchemy import create_engine
+from sqlalchemy.exc import SQLAlchemyError, TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from .config import DATABASE_URL
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool, StaticPool
+from .config import (
+    DATABASE_URL,
+    ASYNC_DATABASE_URL,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE,
+    DB_PGBOUNCER,
+    DATABASE_REPLICA_URLS,
+    REPLICA_RETRY_SECONDS,
+    READ_YOUR_WRITES_SECONDS,
+)
+from .services.monitoring import (
+    DB_POOL_CHECKOUT_WAIT,
+    DB_POOL_IN_USE,
+    DB_POOL_OVERFLOW,
+    DB_POOL_TIMEOUTS,
+)
 
-engine = create_engine(DATABASE_URL)
+logger = logging.getLogger(__name__)
+
+ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+def async_database_url(url: str) -> str:
+    """Swap the sync driver in a database URL for its asyncio counterpart"""
+    scheme, rest = url.split("://", 1)
+    dialect = scheme.split("+", 1)[0]
+    driver = ASYNC_DRIVERS.get(dialect)
+    return f"{dialect}+{driver}://{rest}" if driver else url
+
+class _TimedPoolMixin:
+    """Records how long checkouts wait for a connection, labelled by engine"""
+
+    metrics_label = "primary"
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics_label = self.metrics_label
+        return pool
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except PoolTimeoutError:
+            DB_POOL_TIMEOUTS.labels(engine=self.metrics_label).inc()
+            raise
+        finally:
+            DB_POOL_CHECKOUT_WAIT.labels(engine=self.metrics_label).observe(time.perf_counter() - start)
+            report_pool_usage(self)
+
+    def _return_conn(self, record):
+        # The "checkin" event fires before the connection is back in the pool
+        super()._return_conn(record)
+        report_pool_usage(self)
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    pass
+
+class TimedAsyncQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+def report_pool_usage(pool):
+    DB_POOL_IN_USE.labels(engine=pool.metrics_label).set(pool.checkedout())
+    # overflow() counts up from -pool_size while the pool is still filling
+    DB_POOL_OVERFLOW.labels(engine=pool.metrics_label).set(max(pool.overflow(), 0))
+
+def pgbouncer_connect_args(url: str) -> dict:
+    """asyncpg arguments for PgBouncer transaction pooling: no cached or reused statement names"""
+    if not url.startswith("postgresql+asyncpg"):
+        # psycopg2 never prepares statements server-side
+        return {}
+    return {
+        "statement_cache_size": 0,
+        "prepared_statement_cache_size": 0,
+        "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+    }
+
+def engine_options(url: str, is_async: bool = False) -> dict:
+    """Pool settings for an engine on this URL"""
+    if ":memory:" in url:
+        # One shared connection, otherwise every connection gets its own empty database
+        return {"poolclass": StaticPool} if is_async else {}
+    options = {
+        "poolclass": TimedAsyncQueuePool if is_async else TimedQueuePool,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+        "pool_recycle": DB_POOL_RECYCLE,
+    }
+    if DB_PGBOUNCER:
+        options["connect_args"] = pgbouncer_connect_args(url)
+    return options
+
+def instrument_pool(sync_engine, label: str):
+    """Report the engine's pool metrics under this label"""
+    if isinstance(sync_engine.pool, _TimedPoolMixin):
+        sync_engine.pool.metrics_label = label
+
+engine = create_engine(DATABASE_URL, **engine_options(DATABASE_URL))
+instrument_pool(engine, "primary")
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+_async_url = ASYNC_DATABASE_URL or async_database_url(DATABASE_URL)
+async_engine = create_async_engine(_async_url, **engine_options(_async_url, is_async=True))
+instrument_pool(async_engine.sync_engine, "async")
+# Keep attributes loaded after commit; lazy loads can't happen implicitly under asyncio
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
+
+class ReplicaRouter:
+    """Round-robin over read replicas, skipping any that recently failed to connect"""
+
+    def __init__(self, engines: List[AsyncEngine], retry_after: float = REPLICA_RETRY_SECONDS):
+        self.engines = list(engines)
+        self.retry_after = retry_after
+        self._next = 0
+        self._down_until = {}
+
+    def candidates(self) -> List[AsyncEngine]:
+        """Healthy replicas, starting with the next one in turn"""
+        if not self.engines:
+            return []
+        start = self._next
+        self._next = (start + 1) % len(self.engines)
+        now = time.monotonic()
+        ordered = self.engines[start:] + self.engines[:start]
+        return [engine for engine in ordered if self._down_until.get(engine, 0) <= now]
+
+    def mark_down(self, engine: AsyncEngine):
+        self._down_until[engine] = time.monotonic() + self.retry_after
+
+def _replica_engine(url: str, index: int) -> AsyncEngine:
+    url = async_database_url(url)
+    replica = create_async_engine(url, **engine_options(url, is_async=True))
+    instrument_pool(replica.sync_engine, f"replica{index}")
+    return replica
+
+replica_router = ReplicaRouter([_replica_engine(url, i) for i, url in enumerate(DATABASE_REPLICA_URLS)])
+
+# Set on responses to writes; while present the client's reads go to the primary
+READ_YOUR_WRITES_COOKIE = "saam_recent_write"
+
+def remember_write(response: Response):
+    """Route this client's reads to the primary until replicas have caught up"""
+    if READ_YOUR_WRITES_SECONDS > 0 and replica_router.engines:
+        response.set_cookie(READ_YOUR_WRITES_COOKIE, "1", max_age=READ_YOUR_WRITES_SECONDS, httponly=True)
+
+async def open_read_session(recent_write: bool = False) -> AsyncSession:
+    """Session on a reachable replica, or on the primary after a recent write or when none is up"""
+    if not recent_write:
+        for replica in replica_router.candidates():
+            session = AsyncSessionLocal(bind=replica)
+            try:
+                await session.connection()
+                return session
+            except (SQLAlchemyError, OSError) as e:
+                await session.close()
+                replica_router.mark_down(replica)
+                logger.warning(f"Read replica {replica.url!r} unavailable, skipping it: {e}")
+    return AsyncSessionLocal()
+
 Base = declarative_base()
 
 def get_db():
@@ -14,5 +182,15 @@ def get_db():
     finally:
         db.close()
 
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def get_read_db(request: Request):
+    """Session for read-only endpoints, served by a replica when one is configured"""
+    db = await open_read_session(READ_YOUR_WRITES_COOKIE in request.cookies)
+    async with db:
+        yield db
+
 def init_db():
     Base.metadata.create_all(bind=engine)
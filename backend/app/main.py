@@ -1,13 +1,25 @@
-from fastapi import FastAPI, Depends, HTTPException
+from fastapi import FastAPI, Depends, HTTPException, Response
 from pydantic import BaseModel, Field, validator
+from pydantic import ValidationError as RequestValidationError
 from datetime import datetime
-from typing import Optional
-from sqlalchemy.orm import Session
-from .database import get_db, engine
+from typing import Any, Dict, List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from .database import AsyncSessionLocal, get_async_db, get_read_db, remember_write
 from .services.document import DocumentService
 from .services.google_drive import GoogleDriveService
+from .services.google_executor import shutdown_google_executor
+from .services.insert_batcher import document_inserter
+from .services.google_rest import close_google_http_client
+from .services.google_tokens import stop_token_cache
+from .services.cache import get_shared_cache, invalidate_document_lists
+from .services.redis_pool import get_redis_pool, close_redis_pools
+from .services.records import get_document_record
+from .services.jobs import generation_pool, JOB_PENDING, JOB_DONE, JOB_FAILED
 from .exceptions import ValidationError, DocumentServiceException, TemplateError, GoogleAPIError
 from .models import GeneratedDocument
+from .config import DOCUMENT_GENERATION_MODE, BATCH_MAX_ITEMS, TESTING
+import uuid
 import logging
 from fastapi.middleware.cors import CORSMiddleware
 from .utils.logger import logger
@@ -17,6 +29,9 @@ logger = logging.getLogger(__name__)
 def get_document_service():
     return DocumentService()
 
+def get_google_drive_service():
+    return GoogleDriveService()
+
 app = FastAPI()
 
 app.add_middleware(
@@ -27,6 +42,28 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("startup")
+async def start_services():
+    try:
+        await generation_pool.start()
+    except Exception as e:
+        logger.error(f"Failed to start generation workers: {e}")
+    if not TESTING:
+        get_redis_pool()
+        cache = get_shared_cache()
+        await cache.initialize()
+        cache.start_invalidation_listener()
+
+@app.on_event("shutdown")
+async def shutdown_services():
+    await document_inserter.drain()
+    await generation_pool.stop()
+    await close_google_http_client()
+    await get_shared_cache().stop_invalidation_listener()
+    await close_redis_pools()
+    shutdown_google_executor()
+    stop_token_cache()
+
 class DocumentRequest(BaseModel):
     name: str = Field(
         ..., 
@@ -54,6 +91,10 @@ class DocumentRequest(BaseModel):
             raise ValueError("Date cannot be in the future")
         return value
 
+class BatchDocumentRequest(BaseModel):
+    # Items are validated one by one so a bad item doesn't reject the whole batch
+    items: List[Dict[str, Any]] = Field(..., min_length=1, max_length=BATCH_MAX_ITEMS)
+
 @app.get("/", tags=["Health"])
 def health_check():
     """
@@ -64,9 +105,12 @@ def health_check():
 @app.post("/generate-document", tags=["Documents"])
 async def generate_document(
     request: DocumentRequest,
-    db: Session = Depends(get_db),
+    response: Response,
+    mode: Optional[str] = None,
     service: DocumentService = Depends(get_document_service)
 ):
+    if (mode or DOCUMENT_GENERATION_MODE) == "async":
+        return await _generate_document_async(request, response, service)
     try:
         # Generate document content
         result = await service.generate_document_content(
@@ -76,47 +120,208 @@ async def generate_document(
             template_type=request.template_type
         )
         
-        # Create database record
-        document = GeneratedDocument(
-            name=request.name,
-            date=datetime.strptime(request.date, "%Y-%m-%d").date(),
-            amount=request.amount,
-            content=result["content"],
-            doc_id=result.get("doc_id"),
-            doc_url=result.get("doc_url")
-        )
-        
-        db.add(document)
-        db.commit()
-        db.refresh(document)
+        # Create database record, committed together with concurrent requests' rows
+        row = {
+            "name": request.name,
+            "date": datetime.strptime(request.date, "%Y-%m-%d").date(),
+            "amount": request.amount,
+            "content": result["content"],
+            "doc_id": result.get("doc_id"),
+            "doc_url": result.get("doc_url")
+        }
+        document_pk, created_at = await document_inserter.insert(row)
+        document = GeneratedDocument(id=document_pk, created_at=created_at, **row)
+        remember_write(response)
+        await invalidate_document_lists()
         
         return {
             "status": "success",
-            "data": document,
+            "data": document.to_dict(),
             "message": "Document generated successfully"
         }
     except Exception as e:
         logger.error(f"Error generating document: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/generate-documents/batch", tags=["Documents"])
+async def generate_documents_batch(
+    request: BatchDocumentRequest,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    service: DocumentService = Depends(get_document_service)
+):
+    """Generate many documents in one call, reporting success or error per item"""
+    results: List[Optional[dict]] = [None] * len(request.items)
+
+    valid = []
+    for index, item in enumerate(request.items):
+        try:
+            document_request = DocumentRequest(**item)
+        except RequestValidationError as e:
+            results[index] = {
+                "index": index,
+                "status": "error",
+                "error": "; ".join(error["msg"] for error in e.errors())
+            }
+            continue
+        valid.append((index, {
+            "name": document_request.name,
+            "date": document_request.date,
+            "amount": document_request.amount,
+            "template_type": document_request.template_type
+        }))
+
+    try:
+        outcomes = await service.generate_documents_batch(db, [item for _, item in valid])
+    except DocumentServiceException as e:
+        logger.error(f"Error generating document batch: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+    for (index, _), outcome in zip(valid, outcomes):
+        if isinstance(outcome, Exception):
+            results[index] = {"index": index, "status": "error", "error": str(outcome)}
+        else:
+            results[index] = {"index": index, "status": "success", "data": outcome}
+
+    succeeded = sum(1 for result in results if result["status"] == "success")
+    failed = len(results) - succeeded
+    if succeeded:
+        remember_write(response)
+        await invalidate_document_lists()
+    return {
+        "status": "success" if not failed else "partial",
+        "data": {
+            "items": results,
+            "succeeded": succeeded,
+            "failed": failed
+        },
+        "message": f"Generated {succeeded} of {len(results)} documents"
+    }
+
+async def _generate_document_async(
+    request: DocumentRequest,
+    response: Response,
+    service: DocumentService
+):
+    """Render and persist now; a worker creates the Google Doc later"""
+    try:
+        result = service.render_document_content(
+            name=request.name,
+            date=request.date,
+            amount=request.amount,
+            template_type=request.template_type
+        )
+    except (ValidationError, TemplateError) as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    try:
+        document = GeneratedDocument(
+            name=request.name,
+            date=datetime.strptime(request.date, "%Y-%m-%d").date(),
+            amount=request.amount,
+            template_type=request.template_type,
+            content=result["content"],
+            job_id=uuid.uuid4().hex,
+            google_status=JOB_PENDING
+        )
+        # Only this path needs a session; the sync path goes through the insert batcher
+        async with AsyncSessionLocal() as db:
+            db.add(document)
+            await db.commit()
+            await db.refresh(document)
+    except Exception as e:
+        logger.error(f"Error saving pending document: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+    generation_pool.submit(document.id)
+
+    remember_write(response)
+    await invalidate_document_lists()
+    response.status_code = 202
+    return {
+        "status": "accepted",
+        "data": {
+            "job_id": document.job_id,
+            "document_id": document.id,
+            "status": document.google_status,
+            "status_url": f"/jobs/{document.job_id}"
+        },
+        "message": "Document generation accepted"
+    }
+
+@app.get("/jobs/{job_id}", tags=["Documents"])
+async def get_job(
+    job_id: str,
+    # Polled right after the job is accepted, so read from the primary, not a lagging replica
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Report the progress of an async document generation job"""
+    result = await db.execute(
+        select(GeneratedDocument).where(GeneratedDocument.job_id == job_id)
+    )
+    document = result.scalars().first()
+
+    if not document:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return {
+        "data": {
+            "job_id": document.job_id,
+            "status": document.google_status,
+            "error": document.google_error if document.google_status == JOB_FAILED else None,
+            "document": document.to_dict() if document.google_status == JOB_DONE else None
+        }
+    }
+
+def _select_fields(fields: Optional[str], view: Optional[str]) -> Optional[List[str]]:
+    if fields:
+        return [field.strip() for field in fields.split(",") if field.strip()]
+    if view in (None, "full"):
+        return None
+    if view == "summary":
+        return list(GeneratedDocument.SUMMARY_FIELDS)
+    raise ValidationError("view must be 'summary' or 'full'")
+
+def _item_dict(item, selected: Optional[List[str]]) -> dict:
+    """Serialize a listed document; cached items are full dicts and get the same field filter"""
+    if not isinstance(item, dict):
+        return item.to_dict(selected)
+    if selected is None:
+        return item
+    return {field: item[field] for field in selected}
+
 @app.get("/documents", tags=["Documents"])
 async def get_documents(
     page: int = 1,
     page_size: int = 10,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    name: Optional[str] = None,
+    date: Optional[str] = None,
+    q: Optional[str] = None,
+    fields: Optional[str] = None,
+    view: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """Get paginated documents"""
+    """Get paginated documents, by page number or by the next_cursor of the previous page.
+
+    `fields` (comma-separated) or `view=summary` returns only some columns per document.
+    """
     service = DocumentService()
     try:
-        result = await service.get_documents(db, page=page, page_size=page_size)
-        # The items are already GeneratedDocument objects, so we need to convert them to dicts
+        selected = _select_fields(fields, view)
+        result = await service.get_documents(
+            db, page=page, page_size=page_size, cursor=cursor, fields=selected, name=name, date=date, q=q
+        )
+        # Items are records, or full dicts when served from the cache
         return {
             "data": {
-                "items": [item.to_dict() for item in result["items"]],
+                "items": [_item_dict(item, selected) for item in result["items"]],
                 "total": result["total"],
                 "page": result["page"],
                 "page_size": result["page_size"],
-                "pages": result["pages"]
+                "pages": result["pages"],
+                "total_exact": result["total_exact"],
+                "next_cursor": result["next_cursor"]
             }
         }
     except ValidationError as e:
@@ -127,13 +332,11 @@ async def get_documents(
 @app.get("/documents/{doc_id}", tags=["Documents"])
 async def get_document(
     doc_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get a specific document by ID"""
     try:
-        document = db.query(GeneratedDocument).filter(
-            GeneratedDocument.doc_id == doc_id
-        ).first()
+        document = await get_document_record(db, doc_id)
         
         if not document:
             raise HTTPException(status_code=404, detail="Document not found")
@@ -147,15 +350,17 @@ async def get_document(
 @app.post("/documents/{doc_id}/save-to-google", tags=["Documents"])
 async def save_to_google_drive(
     doc_id: str,
-    db: Session = Depends(get_db),
-    service: GoogleDriveService = Depends(lambda: GoogleDriveService())
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    service: GoogleDriveService = Depends(get_google_drive_service)
 ):
     """Save a document to Google Drive"""
     try:
         # Get document from database
-        document = db.query(GeneratedDocument).filter(
-            GeneratedDocument.doc_id == doc_id
-        ).first()
+        result = await db.execute(
+            select(GeneratedDocument).where(GeneratedDocument.doc_id == doc_id)
+        )
+        document = result.scalars().first()
         
         if not document:
             raise HTTPException(status_code=404, detail="Document not found")
@@ -172,7 +377,9 @@ async def save_to_google_drive(
         # Update document with Google Drive info
         document.google_doc_id = result['doc_id']
         document.doc_url = result['doc_url']
-        db.commit()
+        await db.commit()
+        remember_write(response)
+        await get_shared_cache().invalidate_document(doc_id)
         
         return {
             "status": "success",
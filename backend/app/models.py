@@ -1,9 +1,21 @@
-from sqlalchemy import Column, Integer, String, Date, Float, Text, DateTime, text
+from sqlalchemy import Column, Integer, String, Date, Float, Text, DateTime, Index, DDL, event, inspect, text
 from datetime import datetime
+from typing import Optional, Sequence
 from .database import Base
 
 class GeneratedDocument(Base):
     __tablename__ = "generated_documents"
+    __table_args__ = (
+        Index("ix_generated_documents_doc_id", "doc_id", unique=True),
+        # Matches the list order (newest first, id as tie-breaker) used by OFFSET and keyset paging
+        Index("ix_generated_documents_created_at_id", text("created_at DESC"), text("id DESC")),
+        Index("ix_generated_documents_date", "date"),
+        # Lets ILIKE '%name%' use an index instead of scanning every row
+        Index(
+            "ix_generated_documents_name_trgm", "name",
+            postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}
+        ).ddl_if(dialect="postgresql"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
@@ -14,17 +26,85 @@ class GeneratedDocument(Base):
     doc_url = Column(String, nullable=True)
     content = Column(Text, nullable=False)
     google_doc_id = Column(String, nullable=True)
-    created_at = Column(DateTime, nullable=False, server_default=text('CURRENT_TIMESTAMP'))
-
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "name": self.name,
-            "date": self.date.strftime("%Y-%m-%d"),
-            "amount": self.amount,
-            "doc_id": self.doc_id,
-            "doc_url": self.doc_url,
-            "content": self.content,
-            "google_doc_id": self.google_doc_id,
-            "created_at": self.created_at.isoformat()
-        }
\ No newline at end of file
+    job_id = Column(String, nullable=True, index=True)
+    google_status = Column(String, nullable=True)
+    google_error = Column(Text, nullable=True)
+    # When a generation worker claimed the job; lets another worker take over after the lease
+    google_claimed_at = Column(DateTime, nullable=True)
+    # Set in Python too: microsecond precision keeps keyset order stable, and on SQLite
+    # the stored text then matches how SQLAlchemy binds datetimes in comparisons
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow,
+                        server_default=text('CURRENT_TIMESTAMP'))
+
+    # Columns exposed by to_dict, and the subset list pages need
+    SERIALIZED_FIELDS = (
+        "id", "name", "date", "amount", "doc_id", "doc_url", "content",
+        "google_doc_id", "google_status", "created_at"
+    )
+    SUMMARY_FIELDS = ("id", "name", "date", "amount", "doc_id", "doc_url", "created_at")
+
+    def to_dict(self, fields: Optional[Sequence[str]] = None):
+        if fields is None:
+            # Skip columns deferred at query time instead of lazy-loading them one row at a time;
+            # columns merely expired by a commit are still reloaded
+            state = inspect(self)
+            unloaded = state.unloaded - state.expired_attributes if state.has_identity else ()
+            fields = [field for field in self.SERIALIZED_FIELDS if field not in unloaded]
+        data = {}
+        for field in fields:
+            value = getattr(self, field)
+            if field == "date":
+                value = value.strftime("%Y-%m-%d")
+            elif field == "created_at":
+                value = value.isoformat()
+            data[field] = value
+        return data
+
+
+event.listen(
+    GeneratedDocument.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql")
+)
+
+# Full-text search over name and content. PostgreSQL keeps a stored tsvector column
+# (not mapped here; see services/search.py), SQLite an FTS5 index kept in sync by triggers.
+event.listen(
+    GeneratedDocument.__table__,
+    "after_create",
+    DDL(
+        "ALTER TABLE generated_documents ADD COLUMN search_vector tsvector "
+        "GENERATED ALWAYS AS ("
+        "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(content, '')), 'B')) STORED"
+    ).execute_if(dialect="postgresql")
+)
+event.listen(
+    GeneratedDocument.__table__,
+    "after_create",
+    DDL(
+        "CREATE INDEX IF NOT EXISTS ix_generated_documents_search_vector "
+        "ON generated_documents USING gin (search_vector)"
+    ).execute_if(dialect="postgresql")
+)
+
+SQLITE_FTS_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS generated_documents_fts USING fts5("
+    "name, content, content='generated_documents', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS generated_documents_fts_ai AFTER INSERT ON generated_documents BEGIN "
+    "INSERT INTO generated_documents_fts(rowid, name, content) VALUES (new.id, new.name, new.content); END",
+    "CREATE TRIGGER IF NOT EXISTS generated_documents_fts_ad AFTER DELETE ON generated_documents BEGIN "
+    "INSERT INTO generated_documents_fts(generated_documents_fts, rowid, name, content) "
+    "VALUES ('delete', old.id, old.name, old.content); END",
+    "CREATE TRIGGER IF NOT EXISTS generated_documents_fts_au AFTER UPDATE ON generated_documents BEGIN "
+    "INSERT INTO generated_documents_fts(generated_documents_fts, rowid, name, content) "
+    "VALUES ('delete', old.id, old.name, old.content); "
+    "INSERT INTO generated_documents_fts(rowid, name, content) VALUES (new.id, new.name, new.content); END",
+)
+for statement in SQLITE_FTS_DDL:
+    event.listen(GeneratedDocument.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+event.listen(
+    GeneratedDocument.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS generated_documents_fts").execute_if(dialect="sqlite")
+)
@@ -1,18 +1,86 @@
-from typing import Optional, Any
+from typing import Optional, Any, Union
+import asyncio
 import logging
-from redis import asyncio as aioredis
+import sys
+import uuid
+from collections import OrderedDict
 from datetime import datetime
-from ..config import REDIS_HOST, REDIS_PORT, REDIS_DB, TESTING
-import json
+from ..config import REDIS_HOST, REDIS_PORT, REDIS_DB, TESTING, CACHE_LOCAL_MAX_BYTES, CACHE_LOCAL_TTL
+from .cache_codec import CacheCodec
 from .cache_decorator import cache_response
+from .monitoring import CACHE_TIER_EVENTS, CACHE_LOCAL_BYTES
+from .redis_pool import get_redis_client
 import time
 
 logger = logging.getLogger(__name__)
 
 # In-memory cache for testing
 IN_MEMORY_CACHE = {}
+# Namespace of cached document lists; bumped by every document write
+DOCUMENTS_NAMESPACE = "documents"
+_RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+# Workers publish changed keys here so every process drops its local copy
+INVALIDATION_CHANNEL = "cache:invalidate"
 redis_client = None
 
+class LocalLRUCache:
+    """In-process LRU with per-entry expiry, bounded by approximate size in bytes"""
+
+    def __init__(self, max_bytes: int = CACHE_LOCAL_MAX_BYTES, max_ttl: float = CACHE_LOCAL_TTL):
+        self.max_bytes = max_bytes
+        self.max_ttl = max_ttl
+        # key -> (value, expires_at, size), least recently used first
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self.bytes = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] <= time.monotonic():
+            self._remove(key)
+            entry = None
+        if entry is None:
+            CACHE_TIER_EVENTS.labels(tier="local", event="miss").inc()
+            return None
+        self._entries.move_to_end(key)
+        CACHE_TIER_EVENTS.labels(tier="local", event="hit").inc()
+        return entry[0]
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        self._remove(key)
+        size = sys.getsizeof(key) + sys.getsizeof(value)
+        if size > self.max_bytes:
+            return
+        ttl = min(ttl, self.max_ttl) if ttl else self.max_ttl
+        self._entries[key] = (value, time.monotonic() + ttl, size)
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            CACHE_TIER_EVENTS.labels(tier="local", event="eviction").inc()
+        CACHE_LOCAL_BYTES.set(self.bytes)
+
+    def delete(self, key: str):
+        self._remove(key)
+        CACHE_LOCAL_BYTES.set(self.bytes)
+
+    def clear(self):
+        self._entries.clear()
+        self.bytes = 0
+        CACHE_LOCAL_BYTES.set(0)
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry[2]
+
+    def __len__(self):
+        return len(self._entries)
+
 class RedisCache:
     def __init__(self, host=REDIS_HOST, port=REDIS_PORT):
         self.redis = None
@@ -20,35 +88,42 @@ class RedisCache:
         self.port = port
         self._cache = {}
         self._expiry = {}
+        # Checked before Redis; other workers' writes evict entries through pub/sub
+        self.local = LocalLRUCache()
+        self.codec = CacheCodec()
+        self._listener: Optional[asyncio.Task] = None
 
     async def initialize(self):
-        """Initialize Redis connection"""
+        """Attach to the shared Redis connection pool"""
         if not TESTING and not self.redis:
             try:
-                self.redis = await aioredis.Redis(
-                    host=self.host,
-                    port=self.port,
-                    decode_responses=True
-                ).initialize()
+                self.redis = get_redis_client(self.host, self.port)
             except Exception as e:
                 logger.error(f"Redis connection error: {e}")
                 # Fallback to in-memory cache
                 self.redis = None
 
-    async def get(self, key: str) -> Optional[str]:
-        """Get cache entry"""
+    async def get(self, key: str) -> Optional[Union[str, bytes]]:
+        """Get raw cache entry, from the local tier when it has it"""
+        value = self.local.get(key)
+        if value is not None:
+            return value
         try:
             if TESTING:
-                return self._cache.get(key)
-            else:
-                if self.redis:
-                    return await self.redis.get(key)
+                value = self._cache.get(key)
+            elif self.redis:
+                value = await self.redis.get(key)
         except Exception as e:
             logger.error(f"Cache get error: {e}")
-        return None
+            return None
+        CACHE_TIER_EVENTS.labels(tier="redis", event="miss" if value is None else "hit").inc()
+        if value is not None:
+            self.local.set(key, value)
+        return value
 
-    async def set(self, key: str, value: str, expire_time: int = 300):
+    async def set(self, key: str, value: Union[str, bytes], expire_time: int = 300):
         """Set cache entry"""
+        self.local.set(key, value, expire_time)
         try:
             if TESTING:
                 self._cache[key] = value
@@ -59,29 +134,46 @@ class RedisCache:
         except Exception as e:
             logger.error(f"Cache set error: {e}")
 
+    async def get_value(self, key: str) -> Optional[Any]:
+        """Get and decode a cache entry written by set_value"""
+        cached = await self.get(key)
+        if cached is None:
+            return None
+        try:
+            return self.codec.decode(cached)
+        except Exception as e:
+            logger.error(f"Cache decode error for {key}: {e}")
+            return None
+
+    async def set_value(self, key: str, value: Any, expire_time: int = 300):
+        """Encode a value with the cache codec and store it"""
+        await self.set(key, self.codec.encode(value), expire_time)
+
     async def set_document(self, doc_id: str, document: dict):
         """Set document in cache"""
         key = f"doc:{doc_id}"
-        await self.set(key, json.dumps(document))
+        await self.set_value(key, document)
 
     async def get_document(self, doc_id: str) -> Optional[dict]:
         """Get document from cache"""
         key = f"doc:{doc_id}"
-        cached = await self.get(key)
-        return json.loads(cached) if cached else None
+        return await self.get_value(key)
 
     async def delete(self, key: str):
         """Delete cache entry"""
+        self.local.delete(key)
         try:
             if TESTING:
                 self._cache.pop(key, None)
             else:
                 await self.redis.delete(key)
+                await self._publish_invalidation(key)
         except Exception as e:
             logger.error(f"Cache delete error: {e}")
 
     async def clear(self):
         """Clear all cache entries"""
+        self.local.clear()
         if TESTING:
             self._cache.clear()
         else:
@@ -104,7 +196,98 @@ class RedisCache:
         # will be provided by the document service
         pass
 
+    async def namespace_version(self, namespace: str) -> int:
+        """Current version of a cache namespace; 0 until its first write"""
+        value = await self.get(f"cache:ns:{namespace}")
+        return int(value) if value else 0
+
+    async def bump_namespace(self, namespace: str):
+        """Move a namespace to a new version; entries keyed on the old one are never read again and expire"""
+        key = f"cache:ns:{namespace}"
+        self.local.delete(key)
+        try:
+            if TESTING:
+                self._cache[key] = str(int(self._cache.get(key) or 0) + 1)
+            elif self.redis:
+                await self.redis.incr(key)
+                await self._publish_invalidation(key)
+        except Exception as e:
+            logger.error(f"Cache namespace bump error: {e}")
+
+    async def acquire_lock(self, key: str, timeout_ms: int) -> Optional[str]:
+        """Take a short cross-worker lock; returns the token to release it with, or None if held"""
+        token = uuid.uuid4().hex
+        if TESTING or not self.redis:
+            # Single process: in-process coalescing already covers it
+            return token
+        try:
+            acquired = await self.redis.set(f"lock:{key}", token, nx=True, px=timeout_ms)
+        except Exception as e:
+            logger.error(f"Cache lock error: {e}")
+            return token
+        return token if acquired else None
+
+    async def release_lock(self, key: str, token: str):
+        if TESTING or not self.redis:
+            return
+        try:
+            # Only delete our own lock, not one taken after ours expired
+            await self.redis.eval(_RELEASE_LOCK_SCRIPT, 1, f"lock:{key}", token)
+        except Exception as e:
+            logger.error(f"Cache unlock error: {e}")
+
+    async def _publish_invalidation(self, key: str):
+        await self.redis.publish(INVALIDATION_CHANNEL, key)
+
+    async def listen_for_invalidations(self):
+        """Drop local entries other workers changed; runs for the life of the app"""
+        while True:
+            pubsub = self.redis.pubsub()
+            try:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                # Messages sent while we weren't subscribed are lost, so start clean
+                self.local.clear()
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        self.local.delete(message["data"].decode())
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Cache invalidation listener error: {e}")
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+
+    def start_invalidation_listener(self):
+        if not TESTING and self.redis and self._listener is None:
+            self._listener = asyncio.get_running_loop().create_task(self.listen_for_invalidations())
+
+    async def stop_invalidation_listener(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+
     async def invalidate_document(self, doc_id: str):
-        """Remove document from cache"""
+        """Remove document from cache, along with every cached document list"""
         key = f"doc:{doc_id}"
-        await self.delete(key)
\ No newline at end of file
+        await self.delete(key)
+        await self.bump_namespace(DOCUMENTS_NAMESPACE)
+
+
+_shared_cache: Optional[RedisCache] = None
+
+
+def get_shared_cache() -> RedisCache:
+    """The process-wide RedisCache used by services and the cache decorator"""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = RedisCache()
+    return _shared_cache
+
+
+async def invalidate_document_lists():
+    """Called after a document write so cached lists are recomputed"""
+    cache = get_shared_cache()
+    await cache.initialize()
+    await cache.bump_namespace(DOCUMENTS_NAMESPACE)
@@ -0,0 +1,92 @@
+import json
+import logging
+import zlib
+from typing import Any, Union
+from ..config import CACHE_CODEC, CACHE_COMPRESSION, CACHE_COMPRESS_MIN_BYTES
+
+try:
+    import orjson
+except ImportError:  # Optional: the standard library encoder writes the same JSON, only slower
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# Every encoded value starts with one tag byte: serializer in the low bits, compression in the
+# high bits. Values are decoded by their own tag, so the configured codec can change at any time.
+# Legacy entries are plain JSON text, and no character JSON text can start with is a valid tag.
+SERIALIZERS = {"json": 0x01, "msgpack": 0x02}
+COMPRESSIONS = {"none": 0x00, "zlib": 0x40, "zstd": 0x80}
+SERIALIZER_MASK = 0x0F
+COMPRESSION_MASK = 0xF0
+
+
+def _dumps_json(value: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value, default=str)
+    return json.dumps(value, separators=(",", ":"), default=str).encode()
+
+
+def _loads_json(data: bytes) -> Any:
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+class CacheCodec:
+    """Encodes cached values as tagged, optionally compressed bytes"""
+
+    def __init__(self, serializer: str = CACHE_CODEC, compression: str = CACHE_COMPRESSION,
+                 min_compress_bytes: int = CACHE_COMPRESS_MIN_BYTES):
+        if serializer == "msgpack" and msgpack is None:
+            logger.warning("msgpack is not installed, caching as JSON")
+            serializer = "json"
+        if compression == "zstd" and zstandard is None:
+            logger.warning("zstandard is not installed, compressing cache values with zlib")
+            compression = "zlib"
+        if serializer not in SERIALIZERS or compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown cache codec {serializer}/{compression}")
+        self.serializer = serializer
+        self.compression = compression
+        self.min_compress_bytes = min_compress_bytes
+
+    def encode(self, value: Any) -> bytes:
+        if self.serializer == "msgpack":
+            payload = msgpack.packb(value, default=str, use_bin_type=True)
+        else:
+            payload = _dumps_json(value)
+        compression = self.compression if len(payload) >= self.min_compress_bytes else "none"
+        if compression == "zlib":
+            payload = zlib.compress(payload, 1)
+        elif compression == "zstd":
+            payload = zstandard.ZstdCompressor(level=3).compress(payload)
+        return bytes([SERIALIZERS[self.serializer] | COMPRESSIONS[compression]]) + payload
+
+    def decode(self, data: Union[bytes, str]) -> Any:
+        if isinstance(data, str):
+            return json.loads(data)
+        tag = data[0] if data else 0
+        serializer = tag & SERIALIZER_MASK
+        compression = tag & COMPRESSION_MASK
+        if serializer not in SERIALIZERS.values() or compression not in COMPRESSIONS.values():
+            # Written before values were tagged
+            return json.loads(data)
+        payload = data[1:]
+        if compression == COMPRESSIONS["zlib"]:
+            payload = zlib.decompress(payload)
+        elif compression == COMPRESSIONS["zstd"]:
+            if zstandard is None:
+                raise ValueError("Cached value is zstd-compressed but zstandard is not installed")
+            payload = zstandard.ZstdDecompressor().decompress(payload)
+        if serializer == SERIALIZERS["msgpack"]:
+            if msgpack is None:
+                raise ValueError("Cached value is msgpack-encoded but msgpack is not installed")
+            return msgpack.unpackb(payload, raw=False)
+        return _loads_json(payload)
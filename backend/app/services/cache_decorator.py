@@ -1,71 +1,187 @@
+from contextlib import AsyncExitStack, asynccontextmanager
 from functools import wraps
-import json
+import asyncio
+import inspect
 import logging
-from typing import Any, Callable
-from ..config import TESTING
+from typing import Any, Awaitable, Callable, Dict, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from ..config import TESTING, CACHE_LOCK_TIMEOUT_MS, CACHE_LOCK_WAIT_MS
 import time
-from ..models import GeneratedDocument
+from .cache_keys import build_cache_key, function_name
+from .monitoring import (
+    CACHE_LOOKUPS,
+    CACHE_COALESCED,
+    CACHE_STALE_SERVES,
+    CACHE_REFRESH_LATENCY,
+)
 
 logger = logging.getLogger(__name__)
 
 # Global in-memory cache (moved from cache.py)
 IN_MEMORY_CACHE = {}
 
-def cache_response(expire_time: int = 300):
-    """Cache decorator for API responses"""
+# Computations running in this process, by cache key
+_in_flight: Dict[str, asyncio.Task] = {}
+# Background refreshes, by cache key; also keeps the tasks referenced until they finish
+_refreshing: Dict[str, asyncio.Task] = {}
+_MISS = object()
+LOCK_POLL_INTERVAL = 0.05
+
+def _cacheable(response: Any) -> Any:
+    """Serialize listed records/documents so the response can be stored"""
+    if isinstance(response, dict) and "items" in response:
+        return {
+            **response,
+            "items": [item.to_dict() if hasattr(item, 'to_dict') else item
+                      for item in response["items"]]
+        }
+    return response
+
+async def _read(cache, key: str) -> Any:
+    """The stored entry: {"value", "fresh_until", "stale_until"} (epoch seconds), or _MISS"""
+    if TESTING:
+        entry = IN_MEMORY_CACHE.get(key, _MISS)
+    else:
+        entry = await cache.get_value(key)
+    if not isinstance(entry, dict) or "value" not in entry or entry["stale_until"] <= time.time():
+        return _MISS
+    return entry
+
+async def _write(cache, key: str, response: Any, expire_time: int, stale_ttl: int):
+    now = time.time()
+    entry = {
+        "value": _cacheable(response),
+        "fresh_until": now + expire_time,
+        "stale_until": now + expire_time + stale_ttl
+    }
+    try:
+        if TESTING:
+            IN_MEMORY_CACHE[key] = entry
+        else:
+            await cache.set_value(key, entry, expire_time + stale_ttl)
+    except Exception as e:
+        logger.error(f"Cache error: {e}")
+
+async def _single_flight(key: str, compute: Callable[[], Awaitable[Any]], coalesced) -> Any:
+    """Run compute once per key at a time; concurrent callers await the same task"""
+    task = _in_flight.get(key)
+    if task is not None and task.get_loop() is asyncio.get_running_loop():
+        coalesced.inc()
+    else:
+        task = asyncio.get_running_loop().create_task(compute())
+        _in_flight[key] = task
+        task.add_done_callback(lambda done: _in_flight.pop(key, None) if _in_flight.get(key) is done else None)
+    # A cancelled caller must not cancel the computation the others are waiting on
+    return await asyncio.shield(task)
+
+def _refresh_in_background(key: str, refresh: Callable[[], Awaitable[Any]]):
+    if key in _refreshing:
+        return
+
+    def finished(task: asyncio.Task):
+        _refreshing.pop(key, None)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Background cache refresh failed for {key}: {task.exception()}")
+
+    task = asyncio.get_running_loop().create_task(refresh())
+    _refreshing[key] = task
+    task.add_done_callback(finished)
+
+@asynccontextmanager
+async def _detached_arguments(args, kwargs):
+    """Swap request-scoped sessions for new ones on the same database, for work that outlives the request"""
+    async with AsyncExitStack() as stack:
+        async def detach(value):
+            if isinstance(value, AsyncSession):
+                return await stack.enter_async_context(
+                    AsyncSession(bind=value.bind, expire_on_commit=False, autoflush=False)
+                )
+            if isinstance(value, Session):
+                return stack.enter_context(Session(bind=value.bind))
+            return value
+
+        yield [await detach(arg) for arg in args], {name: await detach(value) for name, value in kwargs.items()}
+
+def cache_response(expire_time: int = 300, namespace: Optional[str] = None,
+                   stale_ttl: int = 0, refresh_ahead: float = 0.0):
+    """Cache decorator for API responses.
+
+    With a namespace, keys include the namespace's version, so bumping it
+    (see RedisCache.bump_namespace) invalidates every entry at once. Concurrent
+    misses for one key share a single computation: in-process by awaiting it,
+    across workers through a short Redis lock.
+
+    stale_ttl keeps entries for that many seconds past expire_time; they are
+    served as-is while a background task recomputes them. refresh_ahead (a
+    fraction of expire_time) refreshes entries still being read that close to
+    expiry, so hot keys never go stale.
+    """
     def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+        name = function_name(func)
+        hits = CACHE_LOOKUPS.labels(function=name, result="hit")
+        misses = CACHE_LOOKUPS.labels(function=name, result="miss")
+        coalesced_in_process = CACHE_COALESCED.labels(function=name, via="in_process")
+        coalesced_by_lock = CACHE_COALESCED.labels(function=name, via="lock")
+        stale_serves = CACHE_STALE_SERVES.labels(function=name)
+        refresh_latency = CACHE_REFRESH_LATENCY.labels(function=name)
+
         @wraps(func)
         async def wrapper(*args, **kwargs):
-            # Use in-memory cache for testing
-            if TESTING:
-                cache_key = f"{func.__name__}:{str(args)}:{str(kwargs)}"
-                if cache_key in IN_MEMORY_CACHE:
-                    return IN_MEMORY_CACHE[cache_key]
-                
-                response = await func(*args, **kwargs)
-                # Serialize GeneratedDocument objects before caching
-                if isinstance(response, dict) and "items" in response:
-                    cached_response = {
-                        **response,
-                        "items": [item.to_dict() if isinstance(item, GeneratedDocument) else item 
-                                for item in response["items"]]
-                    }
-                else:
-                    cached_response = response
-                    
-                IN_MEMORY_CACHE[cache_key] = cached_response
-                return response
-            
-            try:
-                # Get cache instance and ensure it's initialized
-                from .cache import RedisCache
-                cache = RedisCache()
-                await cache.initialize()
-                
-                cache_key = f"{func.__name__}:{str(args)}:{str(kwargs)}"
-                cached_response = await cache.get(cache_key)
-                
-                if cached_response:
-                    return json.loads(cached_response)
-                
-                response = await func(*args, **kwargs)
-                
-                # Serialize response before caching
-                if isinstance(response, dict) and "items" in response:
-                    cached_response = {
-                        **response,
-                        "items": [item.to_dict() if hasattr(item, 'to_dict') else item 
-                                for item in response["items"]]
-                    }
-                else:
-                    cached_response = response
-                    
-                await cache.set(cache_key, json.dumps(cached_response), expire_time)
-                return response
-                
-            except Exception as e:
-                logger.error(f"Cache error: {e}")
-                return await func(*args, **kwargs)
+            # Shared instance on the app-wide pool; imported here to avoid an import cycle
+            from .cache import get_shared_cache
+            cache = get_shared_cache()
+            await cache.initialize()
+            scope = f"{namespace}@{await cache.namespace_version(namespace)}" if namespace else ""
+            cache_key = build_cache_key(func, args, kwargs, signature, scope)
+
+            async def compute(call_args, call_kwargs, wait: bool = True):
+                token = await cache.acquire_lock(cache_key, CACHE_LOCK_TIMEOUT_MS)
+                if token is None:
+                    if not wait:
+                        # Another worker is already refreshing it
+                        return None
+                    # Another worker is computing it; give it a moment before doing it ourselves
+                    deadline = time.monotonic() + CACHE_LOCK_WAIT_MS / 1000
+                    while time.monotonic() < deadline:
+                        await asyncio.sleep(LOCK_POLL_INTERVAL)
+                        cached = await _read(cache, cache_key)
+                        if cached is not _MISS:
+                            coalesced_by_lock.inc()
+                            return cached["value"]
+                try:
+                    response = await func(*call_args, **call_kwargs)
+                    await _write(cache, cache_key, response, expire_time, stale_ttl)
+                    return response
+                finally:
+                    if token is not None:
+                        await cache.release_lock(cache_key, token)
+
+            async def refresh():
+                start = time.perf_counter()
+                async with _detached_arguments(args, kwargs) as (call_args, call_kwargs):
+                    await compute(call_args, call_kwargs, wait=False)
+                refresh_latency.observe(time.perf_counter() - start)
+
+            entry = await _read(cache, cache_key)
+            if entry is not _MISS:
+                hits.inc()
+                remaining = entry["fresh_until"] - time.time()
+                if remaining <= 0:
+                    stale_serves.inc()
+                    _refresh_in_background(cache_key, refresh)
+                elif refresh_ahead and remaining < refresh_ahead * expire_time:
+                    _refresh_in_background(cache_key, refresh)
+                return entry["value"]
+            misses.inc()
+
+            async def shared():
+                # Coalesced callers may outlive this one, so the shared task gets its own sessions
+                async with _detached_arguments(args, kwargs) as (call_args, call_kwargs):
+                    return await compute(call_args, call_kwargs)
+
+            return await _single_flight(cache_key, shared, coalesced_in_process)
                 
         return wrapper
-    return decorator
\ No newline at end of file
+    return decorator
@@ -0,0 +1,57 @@
+import hashlib
+import inspect
+import json
+from typing import Any, Callable, Dict, Optional, Tuple
+from fastapi import Request, Response
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from sqlalchemy.orm import Session
+from ..config import CACHE_KEY_VERSION
+
+# Arguments that say how to compute a result, not which result: never part of a key
+NON_DATA_TYPES = (Session, AsyncSession, Connection, AsyncConnection, Request, Response)
+NON_DATA_NAMES = {"self", "cls"}
+
+# Longer argument payloads are hashed so keys stay short
+MAX_PLAIN_KEY_LENGTH = 200
+
+
+def function_name(func: Callable) -> str:
+    return f"{func.__module__}.{func.__qualname__}"
+
+
+def key_arguments(signature: inspect.Signature, args: Tuple, kwargs: Dict) -> Dict[str, Any]:
+    """The data arguments of a call by name, with defaults filled in and None values dropped.
+
+    Positional, keyword and defaulted spellings of the same call give the same result.
+    """
+    bound = signature.bind_partial(*args, **kwargs)
+    bound.apply_defaults()
+    arguments = {}
+    for name, value in bound.arguments.items():
+        kind = signature.parameters[name].kind
+        if kind == inspect.Parameter.VAR_KEYWORD:
+            arguments.update(value)
+        elif kind == inspect.Parameter.VAR_POSITIONAL:
+            if value:
+                arguments[name] = list(value)
+        else:
+            arguments[name] = value
+    return {
+        name: value for name, value in arguments.items()
+        if name not in NON_DATA_NAMES and value is not None and not isinstance(value, NON_DATA_TYPES)
+    }
+
+
+def build_cache_key(func: Callable, args: Tuple, kwargs: Dict,
+                    signature: Optional[inspect.Signature] = None, scope: str = "") -> str:
+    """Versioned cache key for a call: cache:v<version>:<function>[:<scope>]:<arguments>"""
+    signature = signature or inspect.signature(func)
+    payload = json.dumps(key_arguments(signature, args, kwargs), sort_keys=True, default=str,
+                         separators=(",", ":"))
+    if len(payload) > MAX_PLAIN_KEY_LENGTH:
+        payload = hashlib.sha256(payload.encode()).hexdigest()
+    prefix = f"cache:v{CACHE_KEY_VERSION}:{function_name(func)}"
+    if scope:
+        prefix = f"{prefix}:{scope}"
+    return f"{prefix}:{payload}"
@@ -1,25 +1,52 @@
 from ..exceptions import ValidationError, GoogleAPIError, TemplateError, DatabaseError
 from datetime import datetime
-from typing import Dict, Optional, List
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from typing import Dict, Optional, List, Tuple, Union
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import or_, insert, func, select
 from .google_docs import GoogleDocsService
 from .templates import DocumentTemplate
-from .cache import RedisCache
+from .cache import DOCUMENTS_NAMESPACE, get_shared_cache
 from .cache_decorator import cache_response
+from .pagination import (
+    KEYSET_ORDER,
+    apply_keyset,
+    encode_cursor,
+    count_cache_key,
+    get_cached_count,
+    set_cached_count,
+    estimate_document_count,
+)
+from .search import apply_search
+from .records import record_columns, select_documents, to_records
 from ..models import GeneratedDocument
 import logging
+import uuid
 import os
-from ..config import TESTING
+from ..config import (
+    TESTING,
+    DOCUMENT_COUNT_STRATEGY,
+    DOCUMENT_LIST_CACHE_TTL,
+    DOCUMENT_LIST_CACHE_STALE_TTL,
+    DOCUMENT_LIST_REFRESH_AHEAD,
+)
 from ..exceptions import DocumentServiceException
 
 
 logger = logging.getLogger(__name__)
 
+
+def mock_google_document() -> Dict:
+    """Stand-in Google Doc for test runs; ids are unique since doc_id has a unique index"""
+    doc_id = f"mock-{uuid.uuid4().hex}"
+    return {
+        "doc_id": doc_id,
+        "doc_url": f"https://docs.google.com/document/d/{doc_id}/edit"
+    }
+
 class DocumentService:
     def __init__(self):
         self.google_docs = GoogleDocsService()
-        self.cache = RedisCache()
+        self.cache = get_shared_cache()
         
     async def initialize(self):
         """Initialize service dependencies"""
@@ -53,9 +80,24 @@ class DocumentService:
         key_parts.extend(f"{k}:{v}" for k, v in sorted(kwargs.items()))
         return ":".join(key_parts)
 
-    @cache_response(expire_time=300)
-    async def get_documents(self, db: Session, page: int = 1, page_size: int = 10, **filters) -> Dict:
-        """Get paginated documents with caching"""
+    @cache_response(
+        expire_time=DOCUMENT_LIST_CACHE_TTL,
+        namespace=DOCUMENTS_NAMESPACE,
+        stale_ttl=DOCUMENT_LIST_CACHE_STALE_TTL,
+        refresh_ahead=DOCUMENT_LIST_REFRESH_AHEAD
+    )
+    async def get_documents(self, db: AsyncSession, page: int = 1, page_size: int = 10,
+                            cursor: Optional[str] = None, fields: Optional[List[str]] = None,
+                            **filters) -> Dict:
+        """Get paginated documents with caching.
+
+        Pages by `page` (OFFSET) or, when `cursor` is given, by seeking past the
+        (created_at, id) of the previous page's last row; cursor pages are not counted,
+        so total and pages are None. `q` runs a full-text search
+        over name and content and orders by relevance, so it pages by `page` only.
+        `fields` limits the columns loaded from the database. Items are read-only
+        records (see services/records.py), not ORM instances.
+        """
         # First ensure cache is initialized
         await self.initialize()
         # Validate parameters first, before any database operations
@@ -63,9 +105,17 @@ class DocumentService:
             raise ValidationError("Page number must be positive")
         if not 1 <= page_size <= 100:
             raise ValidationError("Page size must be between 1 and 100")
+        if cursor and filters.get('q'):
+            raise ValidationError("Search results are paged by page number, not cursor")
+        if fields:
+            unknown = set(fields) - set(GeneratedDocument.SERIALIZED_FIELDS)
+            if unknown:
+                raise ValidationError(f"Unknown fields: {', '.join(sorted(unknown))}")
         
         try:
-            query = db.query(GeneratedDocument)
+            # Read-only path: Core select into immutable records, no ORM instances
+            columns = record_columns(fields)
+            query = select_documents(columns)
             
             # Apply filters
             if filters.get('name'):
@@ -78,21 +128,53 @@ class DocumentService:
                 except ValueError:
                     raise ValidationError("Invalid date format. Use YYYY-MM-DD")
             
-            # Get total count before pagination
-            total_count = query.count()
-            
+            if filters.get('q'):
+                query = apply_search(query, db.get_bind().dialect.name, filters['q'])
+
             # Apply pagination
-            query = query.order_by(GeneratedDocument.created_at.desc())
-            query = query.offset((page - 1) * page_size).limit(page_size)
-            
-            documents = query.all()
+            query = query.order_by(*KEYSET_ORDER)
+            strategy = DOCUMENT_COUNT_STRATEGY
+            total_count = None
+            total_exact = True
+            if cursor:
+                # Fetch one extra row to learn whether another page follows
+                documents = to_records(
+                    await db.execute(apply_keyset(query, cursor).limit(page_size + 1)), columns
+                )
+                has_more = len(documents) > page_size
+                documents = documents[:page_size]
+            elif strategy == "window":
+                # Count in the same statement; an empty page carries no count, so fall back below
+                rows = (await db.execute(query.add_columns(func.count().over()).offset(
+                    (page - 1) * page_size).limit(page_size))).all()
+                documents = to_records((row[:-1] for row in rows), columns)
+                if rows:
+                    total_count = rows[0][-1]
+            else:
+                documents = to_records(
+                    await db.execute(query.offset((page - 1) * page_size).limit(page_size)), columns
+                )
+
+            # Cursor pages skip the count, which would make every deep page O(n) again
+            if total_count is None and not cursor:
+                total_count, total_exact = await self._count_documents(db, query, strategy, filters)
+            if not cursor:
+                # An estimate can undercount, so only trust it about the current page
+                has_more = page * page_size < total_count if total_exact else len(documents) == page_size
+
+            next_cursor = None
+            # Relevance order has no (created_at, id) keyset to resume from
+            if has_more and documents and not filters.get('q'):
+                next_cursor = encode_cursor(documents[-1].created_at, documents[-1].id)
             
             return {
                 "items": documents,
                 "total": total_count,
-                "page": page,
+                "page": None if cursor else page,
                 "page_size": page_size,
-                "pages": (total_count + page_size - 1) // page_size
+                "pages": None if cursor else (total_count + page_size - 1) // page_size,
+                "total_exact": None if cursor else total_exact,
+                "next_cursor": next_cursor
             }
             
         except ValidationError:
@@ -101,42 +183,156 @@ class DocumentService:
             logger.error(f"Database error while getting documents: {e}")
             raise DatabaseError(f"Error retrieving documents: {str(e)}")
 
-    async def generate_document_content(self, name: str, date: str, amount: float, template_type: str) -> Dict:
+    async def _count_documents(self, db: AsyncSession, query, strategy: str, filters: dict) -> Tuple[int, bool]:
+        """Return (total, exact) for the filtered query using the configured strategy"""
+        if strategy == "estimated" and not any(filters.values()):
+            estimate = await estimate_document_count(db)
+            if estimate is not None:
+                return estimate, False
+        elif strategy == "cached":
+            key = count_cache_key(filters)
+            cached = get_cached_count(key)
+            if cached is not None:
+                return cached, False
+            total_count = await self._count(db, query)
+            set_cached_count(key, total_count)
+            return total_count, True
+        return await self._count(db, query), True
+
+    async def _count(self, db: AsyncSession, query) -> int:
+        statement = select(func.count()).select_from(query.order_by(None).subquery())
+        return (await db.execute(statement)).scalar()
+
+    def render_document_content(self, name: str, date: str, amount: float, template_type: str) -> Dict:
+        """Validate the input and render the template, without calling Google"""
+        self.validate_document_data(name, date, amount, template_type)
+
+        content = DocumentTemplate.generate_template(template_type, {
+            "name": name,
+            "date": date,
+            "amount": amount
+        })
+
+        return {
+            "name": name,
+            "date": date,
+            "amount": amount,
+            "content": content,
+        }
+
+    async def create_google_document(self, name: str, content: str) -> Dict:
+        """Create the Google Doc for rendered content"""
+        if TESTING:
+            return mock_google_document()
+
         try:
-            self.validate_document_data(name, date, amount, template_type)
-            
-            content = DocumentTemplate.generate_template(template_type, {
-                "name": name,
-                "date": date,
-                "amount": amount
-            })
-            
-            result = {
-                "name": name,
-                "date": date,
-                "amount": amount,
-                "content": content,
+            google_doc = await self.google_docs.create_document(
+                title=name,
+                content=content
+            )
+            return {
+                "doc_id": google_doc["doc_id"],
+                "doc_url": google_doc["doc_url"]
             }
-            
-            if not TESTING:
-                try:
-                    google_doc = await self.google_docs.create_document(
-                        title=name,
-                        content=content
-                    )
-                    result["doc_id"] = google_doc["doc_id"]
-                    result["doc_url"] = google_doc["doc_url"]
-                except Exception as e:
-                    if isinstance(e, GoogleAPIError):
-                        raise
-                    raise GoogleAPIError(f"Failed to create Google document: {str(e)}")
-            else:
-                result["doc_id"] = "mock-doc-id"
-                result["doc_url"] = "https://docs.google.com/document/d/mock-doc-id/edit"
-            
+        except Exception as e:
+            if isinstance(e, GoogleAPIError):
+                raise
+            raise GoogleAPIError(f"Failed to create Google document: {str(e)}")
+
+    async def create_google_documents(self, documents: List[Tuple[str, str]]) -> List[Union[Dict, Exception]]:
+        """Create Google Docs for several (name, content) pairs in grouped requests"""
+        if TESTING:
+            return [mock_google_document() for _ in documents]
+
+        try:
+            results = await self.google_docs.create_documents(documents)
+        except Exception as e:
+            error = e if isinstance(e, GoogleAPIError) else GoogleAPIError(f"Failed to create Google documents: {str(e)}")
+            return [error] * len(documents)
+        return [
+            GoogleAPIError(f"Failed to create Google document: {str(r)}")
+            if isinstance(r, Exception) and not isinstance(r, GoogleAPIError) else r
+            for r in results
+        ]
+
+    async def delete_google_documents(self, doc_ids: List[str]):
+        """Best-effort removal of Google Docs whose rows were never saved; logs what is left behind"""
+        if TESTING or not doc_ids:
+            return
+        try:
+            results = await self.google_docs.delete_documents(doc_ids)
+        except Exception as e:
+            results = [e] * len(doc_ids)
+        orphaned = [doc_id for doc_id, exc in zip(doc_ids, results) if exc is not None]
+        if orphaned:
+            logger.error(f"Could not delete orphaned Google Docs: {', '.join(orphaned)}")
+
+    async def generate_documents_batch(self, db: AsyncSession, requests: List[Dict]) -> List[Union[Dict, Exception]]:
+        """Render, create Google Docs and insert rows for many documents at once.
+
+        Returns the serialized document or the exception for each request, in order.
+        """
+        outcomes: List[Union[Dict, Exception, None]] = [None] * len(requests)
+
+        rendered = []
+        for index, request in enumerate(requests):
+            try:
+                rendered.append((index, request, self.render_document_content(
+                    request["name"], request["date"], request["amount"], request["template_type"]
+                )))
+            except (ValidationError, TemplateError) as e:
+                outcomes[index] = e
+
+        google_docs = await self.create_google_documents(
+            [(result["name"], result["content"]) for _, _, result in rendered]
+        )
+
+        rows, row_indexes = [], []
+        for (index, request, result), google_doc in zip(rendered, google_docs):
+            if isinstance(google_doc, Exception):
+                outcomes[index] = google_doc
+                continue
+            rows.append({
+                "name": request["name"],
+                "date": datetime.strptime(request["date"], "%Y-%m-%d").date(),
+                "amount": request["amount"],
+                "template_type": request["template_type"],
+                "content": result["content"],
+                "doc_id": google_doc["doc_id"],
+                "doc_url": google_doc["doc_url"],
+            })
+            row_indexes.append(index)
+
+        if rows:
+            try:
+                # One multi-row INSERT ... RETURNING for the whole batch
+                inserted = (await db.execute(
+                    insert(GeneratedDocument).returning(
+                        GeneratedDocument.id,
+                        GeneratedDocument.created_at,
+                        sort_by_parameter_order=True
+                    ),
+                    rows
+                )).all()
+                await db.commit()
+            except Exception as e:
+                await db.rollback()
+                logger.error(f"Database error while inserting document batch: {e}")
+                await self.delete_google_documents([row["doc_id"] for row in rows])
+                raise DatabaseError(f"Error saving documents: {str(e)}")
+
+            for index, row, (doc_pk, created_at) in zip(row_indexes, rows, inserted):
+                outcomes[index] = GeneratedDocument(id=doc_pk, created_at=created_at, **row).to_dict()
+
+        return outcomes
+
+    async def generate_document_content(self, name: str, date: str, amount: float, template_type: str) -> Dict:
+        try:
+            result = self.render_document_content(name, date, amount, template_type)
+            result.update(await self.create_google_document(name, result["content"]))
             return result
         except (ValidationError, TemplateError, GoogleAPIError):
             raise
         except Exception as e:
             logger.error(f"Unexpected error in document generation: {e}")
-            raise DocumentServiceException(f"Failed to generate document: {str(e)}")
\ No newline at end of file
+            raise DocumentServiceException(f"Failed to generate document: {str(e)}")
@@ -0,0 +1,122 @@
+import asyncio
+import logging
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from ..config import GOOGLE_BATCH_MAX_SIZE, GOOGLE_BATCH_WINDOW_MS
+from ..exceptions import GoogleAPIError
+from .google_executor import run_google_call
+
+logger = logging.getLogger(__name__)
+
+BatchResult = Tuple[Optional[Any], Optional[Exception]]
+
+
+def execute_batch(service, requests: List[Any], max_size: int = GOOGLE_BATCH_MAX_SIZE) -> List[BatchResult]:
+    """Send googleapiclient requests as Google batch HTTP requests.
+
+    Blocking; call it through the Google executor. Returns one (response, exception)
+    pair per request, in request order.
+    """
+    results: List[BatchResult] = [(None, None)] * len(requests)
+
+    def callback(request_id, response, exception):
+        results[int(request_id)] = (response, exception)
+
+    for start in range(0, len(requests), max_size):
+        batch = service.new_batch_http_request(callback=callback)
+        for offset, request in enumerate(requests[start:start + max_size]):
+            batch.add(request, request_id=str(start + offset))
+        batch.execute()
+    return results
+
+
+class DriveBatcher:
+    """Coalesces Drive calls from concurrent requests into one batch request.
+
+    Calls are collected for a short window (or until the batch is full), sent as a
+    single batch request on the Google executor, and each caller gets its own result.
+    """
+
+    def __init__(self, service, window: float = GOOGLE_BATCH_WINDOW_MS / 1000,
+                 max_size: int = GOOGLE_BATCH_MAX_SIZE):
+        self.service = service
+        self.window = window
+        self.max_size = max_size
+        self._pending: List[Tuple[Callable, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._loop = None
+        # The loop only keeps weak references to tasks; hold in-flight sends until they finish
+        self._sending: Set[asyncio.Task] = set()
+
+    async def submit(self, build_request: Callable[[Any], Any]) -> Any:
+        """Queue a request built from the Drive service and wait for its response"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._pending = []
+            self._timer = None
+            self._sending = set()
+
+        future = loop.create_future()
+        self._pending.append((build_request, future))
+        if len(self._pending) >= self.max_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, []
+        if pending:
+            task = self._loop.create_task(self._send(pending))
+            self._sending.add(task)
+            task.add_done_callback(self._sending.discard)
+
+    async def _send(self, pending: List[Tuple[Callable, asyncio.Future]]):
+        builders = [build_request for build_request, _ in pending]
+        try:
+            # Requests are built inside the executor thread, on that thread's own client
+            results = await run_google_call(
+                lambda: execute_batch(self.service, [build(self.service) for build in builders], self.max_size)
+            )
+        except Exception as e:
+            logger.error(f"Drive batch request failed: {e}")
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(GoogleAPIError(f"Drive batch request failed: {str(e)}"))
+            return
+
+        for (_, future), (response, exception) in zip(pending, results):
+            if future.done():
+                continue
+            if exception is not None:
+                future.set_exception(exception)
+            else:
+                future.set_result(response)
+
+    async def create_permission(self, file_id: str, body: dict, fields: Optional[str] = None) -> Any:
+        kwargs = {'fileId': file_id, 'body': body}
+        if fields:
+            kwargs['fields'] = fields
+        return await self.submit(lambda service: service.permissions().create(**kwargs))
+
+    async def delete_file(self, file_id: str) -> Any:
+        return await self.submit(lambda service: service.files().delete(fileId=file_id))
+
+
+_batchers: Dict[int, DriveBatcher] = {}
+
+
+def get_drive_batcher(service) -> DriveBatcher:
+    """Return the shared batcher for a Drive service.
+
+    Services built from the same credentials share one batcher, so calls from
+    different requests end up in the same batch.
+    """
+    key = id(getattr(service, 'credentials', service))
+    batcher = _batchers.get(key)
+    if batcher is None:
+        batcher = _batchers[key] = DriveBatcher(service)
+    return batcher
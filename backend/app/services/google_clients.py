@@ -0,0 +1,86 @@
+import json
+import logging
+import threading
+from typing import Dict, Optional, Sequence, Tuple
+from google.oauth2 import service_account
+from googleapiclient.discovery import build_from_document
+from googleapiclient.discovery_cache import get_static_doc
+from ..exceptions import GoogleAPIError
+from .google_tokens import CachedCredentials
+
+logger = logging.getLogger(__name__)
+
+# Process-wide caches; discovery documents and credentials are safe to share
+_discovery_documents: Dict[Tuple[str, str], dict] = {}
+_credentials: Dict[Tuple[str, Tuple[str, ...]], CachedCredentials] = {}
+_lock = threading.Lock()
+
+# httplib2 is not thread-safe, so every thread builds and keeps its own clients
+_local = threading.local()
+
+
+def get_discovery_document(name: str, version: str) -> dict:
+    """Load the static discovery document shipped with googleapiclient once per process"""
+    key = (name, version)
+    document = _discovery_documents.get(key)
+    if document is None:
+        with _lock:
+            document = _discovery_documents.get(key)
+            if document is None:
+                content = get_static_doc(name, version)
+                if content is None:
+                    raise GoogleAPIError(f"No static discovery document for {name} {version}")
+                document = json.loads(content)
+                _discovery_documents[key] = document
+    return document
+
+
+def get_service_account_credentials(path: str, scopes: Optional[Sequence[str]] = None) -> CachedCredentials:
+    """Read the service-account file once per process for each set of scopes.
+
+    The returned credentials take their access tokens from the shared token cache.
+    """
+    key = (path, tuple(scopes or ()))
+    credentials = _credentials.get(key)
+    if credentials is None:
+        with _lock:
+            credentials = _credentials.get(key)
+            if credentials is None:
+                source = service_account.Credentials.from_service_account_file(path, scopes=scopes)
+                credentials = CachedCredentials(source)
+                _credentials[key] = credentials
+    return credentials
+
+
+def get_thread_client(name: str, version: str, credentials):
+    """Return the calling thread's client for the API, building it on first use"""
+    clients = getattr(_local, 'clients', None)
+    if clients is None:
+        clients = _local.clients = {}
+    key = (name, version, id(credentials))
+    client = clients.get(key)
+    if client is None:
+        client = build_from_document(get_discovery_document(name, version), credentials=credentials)
+        clients[key] = client
+        logger.debug(f"Built {name} {version} client for thread {threading.current_thread().name}")
+    return client
+
+
+class ThreadLocalClient:
+    """Stand-in for a googleapiclient Resource that resolves to the current thread's client"""
+
+    def __init__(self, name: str, version: str, credentials):
+        self.name = name
+        self.version = version
+        self.credentials = credentials
+
+    def __getattr__(self, attr):
+        return getattr(get_thread_client(self.name, self.version, self.credentials), attr)
+
+
+def reset_google_clients():
+    """Drop cached credentials and discovery documents (e.g. after rotating keys)"""
+    with _lock:
+        _discovery_documents.clear()
+        _credentials.clear()
+    _local.clients = {}
@@ -1,24 +1,48 @@
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
 import os
+import asyncio
+import uuid
 import logging
+from io import BytesIO
+from typing import List, Tuple, Union
+from googleapiclient.http import MediaIoBaseUpload
 from ..exceptions import GoogleAPIError
-from ..config import SKIP_GOOGLE_AUTH, TESTING
+from ..config import (
+    SKIP_GOOGLE_AUTH,
+    TESTING,
+    GOOGLE_API_BACKEND,
+    GOOGLE_BATCH_CONCURRENCY,
+    GOOGLE_DOC_CREATE_MODE,
+    GOOGLE_DRIVE_FOLDER_ID,
+    GOOGLE_SHARE_VIA_FOLDER,
+    GOOGLE_BATCH_ENABLED,
+)
+from .google_executor import run_google_call
+from .google_batch import execute_batch, get_drive_batcher
+from .google_rest import GoogleRestClient
+from .google_clients import ThreadLocalClient, get_service_account_credentials
 from unittest.mock import Mock
 
 logger = logging.getLogger(__name__)
 
+DOCS_SCOPES = [
+    'https://www.googleapis.com/auth/documents',
+    'https://www.googleapis.com/auth/drive.file'
+]
+
+GOOGLE_DOC_MIME_TYPE = 'application/vnd.google-apps.document'
+
 class GoogleDocsService:
     def __init__(self):
+        self.rest_client = None
+        self.create_mode = GOOGLE_DOC_CREATE_MODE
         if TESTING or SKIP_GOOGLE_AUTH:
             # Mocks for testing that can raise errors
             self.docs_service = Mock()
             self.drive_service = Mock()
             
-            # Default success response
-            mock_doc = {'documentId': 'mock-doc-id'}
+            # Default success response; ids stay unique like real ones (doc_id has a unique index)
             create_mock = Mock()
-            create_mock.execute.return_value = mock_doc
+            create_mock.execute.side_effect = lambda: {'documentId': f"mock-{uuid.uuid4().hex}"}
             
             # Configure the mock to allow error injection
             self.docs_service.documents.return_value.create.return_value = create_mock
@@ -29,41 +53,234 @@ class GoogleDocsService:
                 if not cred_path or not os.path.exists(cred_path):
                     raise GoogleAPIError("Google credentials file not found")
 
-                creds = service_account.Credentials.from_service_account_file(cred_path)
-                self.docs_service = build('docs', 'v1', credentials=creds)
-                self.drive_service = build('drive', 'v3', credentials=creds)
+                creds = get_service_account_credentials(cred_path, DOCS_SCOPES)
+                if GOOGLE_API_BACKEND == 'rest':
+                    self.rest_client = GoogleRestClient(creds)
+                    self.docs_service = None
+                    self.drive_service = None
+                else:
+                    # Clients are built once per executor thread and reused across requests
+                    self.docs_service = ThreadLocalClient('docs', 'v1', creds)
+                    self.drive_service = ThreadLocalClient('drive', 'v3', creds)
             except Exception as e:
                 raise GoogleAPIError(f"Failed to initialize Google services: {str(e)}")
 
     async def create_document(self, title: str, content: str) -> dict:
+        if self.create_mode == 'upload':
+            return await self._create_document_upload(title, content)
+        if self.rest_client:
+            return await self._create_document_rest(title, content)
         if not self.docs_service:
             raise GoogleAPIError("Docs service not initialized")
 
         try:
-            doc = self.docs_service.documents().create(body={'title': title}).execute()
+            doc = await run_google_call(
+                lambda: self.docs_service.documents().create(body={'title': title}).execute()
+            )
             doc_id = doc.get('documentId')
             if not doc_id:
                 raise GoogleAPIError("Failed to get document ID from response")
 
             # Do batch update
+            await run_google_call(
+                lambda: self.docs_service.documents().batchUpdate(
+                    documentId=doc_id,
+                    body={'requests': [{
+                        'insertText': {
+                            'location': {'index': 1},
+                            'text': content
+                        }
+                    }]}
+                ).execute()
+            )
+
+            # Set permissions, etc.
+            await self._share_document(doc_id)
+
+            return {'doc_id': doc_id, 'doc_url': f"https://docs.google.com/document/d/{doc_id}/edit"}
+
+        except Exception as exc:
+            logger.error(f"Error creating document: {exc}")
+            raise GoogleAPIError(f"Failed to create Google document: {str(exc)}")
+
+    async def _share_document(self, doc_id: str):
+        """Give anyone with the link read access"""
+        body = {'role': 'reader', 'type': 'anyone'}
+        if GOOGLE_BATCH_ENABLED:
+            await get_drive_batcher(self.drive_service).create_permission(doc_id, body)
+        else:
+            await run_google_call(
+                lambda: self.drive_service.permissions().create(fileId=doc_id, body=body).execute()
+            )
+
+    async def _create_document_rest(self, title: str, content: str) -> dict:
+        try:
+            doc = await self.rest_client.create_document(title)
+            doc_id = doc.get('documentId')
+            if not doc_id:
+                raise GoogleAPIError("Failed to get document ID from response")
+
+            await self.rest_client.batch_update_document(doc_id, [{
+                'insertText': {
+                    'location': {'index': 1},
+                    'text': content
+                }
+            }])
+            await self.rest_client.create_permission(doc_id, {'role': 'reader', 'type': 'anyone'})
+
+            return {'doc_id': doc_id, 'doc_url': f"https://docs.google.com/document/d/{doc_id}/edit"}
+
+        except Exception as exc:
+            logger.error(f"Error creating document: {exc}")
+            raise GoogleAPIError(f"Failed to create Google document: {str(exc)}")
+
+    async def _create_document_upload(self, title: str, content: str) -> dict:
+        """Create the Google Doc with one Drive upload that converts plain text"""
+        metadata = {'name': title, 'mimeType': GOOGLE_DOC_MIME_TYPE}
+        if GOOGLE_DRIVE_FOLDER_ID:
+            metadata['parents'] = [GOOGLE_DRIVE_FOLDER_ID]
+        # A shared parent folder already grants access, so the permission call can be skipped
+        share = not (GOOGLE_SHARE_VIA_FOLDER and GOOGLE_DRIVE_FOLDER_ID)
+
+        try:
+            if self.rest_client:
+                file = await self.rest_client.create_file(
+                    metadata,
+                    content=content.encode(),
+                    mime_type='text/plain',
+                    fields='id'
+                )
+            else:
+                file = await run_google_call(
+                    lambda: self.drive_service.files().create(
+                        body=metadata,
+                        media_body=MediaIoBaseUpload(BytesIO(content.encode()), mimetype='text/plain'),
+                        fields='id',
+                        supportsAllDrives=True
+                    ).execute()
+                )
+            doc_id = file.get('id')
+            if not doc_id:
+                raise GoogleAPIError("Failed to get document ID from response")
+
+            if share:
+                if self.rest_client:
+                    await self.rest_client.create_permission(doc_id, {'role': 'reader', 'type': 'anyone'})
+                else:
+                    await self._share_document(doc_id)
+
+            return {'doc_id': doc_id, 'doc_url': f"https://docs.google.com/document/d/{doc_id}/edit"}
+
+        except Exception as exc:
+            logger.error(f"Error creating document: {exc}")
+            raise GoogleAPIError(f"Failed to create Google document: {str(exc)}")
+
+    async def create_documents(self, documents: List[Tuple[str, str]]) -> List[Union[dict, Exception]]:
+        """Create several Google Docs from (title, content) pairs.
+
+        Returns a result dict or a GoogleAPIError per document, in order.
+        """
+        if self.rest_client or self.create_mode == 'upload':
+            # Media uploads can't go in a batch request; REST calls share pooled connections instead
+            semaphore = asyncio.Semaphore(GOOGLE_BATCH_CONCURRENCY)
+
+            async def create(title: str, content: str) -> dict:
+                async with semaphore:
+                    return await self.create_document(title, content)
+
+            return await asyncio.gather(
+                *(create(title, content) for title, content in documents),
+                return_exceptions=True
+            )
+        try:
+            results, abandoned = await run_google_call(self._create_documents_batched, documents)
+        except Exception as exc:
+            logger.error(f"Error creating documents in batch: {exc}")
+            error = GoogleAPIError(f"Failed to create Google documents: {str(exc)}")
+            return [error] * len(documents)
+        if abandoned:
+            await self._delete_abandoned(abandoned)
+        return results
+
+    async def _delete_abandoned(self, doc_ids: List[str]):
+        """Delete Docs that were created but failed a later step; logs any left behind"""
+        try:
+            deleted = await self.delete_documents(doc_ids)
+        except Exception as exc:
+            deleted = [exc] * len(doc_ids)
+        orphaned = [doc_id for doc_id, exc in zip(doc_ids, deleted) if exc is not None]
+        if orphaned:
+            logger.error(f"Could not delete half-created Google Docs: {', '.join(orphaned)}")
+
+    async def delete_documents(self, doc_ids: List[str]) -> List[Union[None, Exception]]:
+        """Delete Google Docs, e.g. ones created for rows that were never saved"""
+        if self.rest_client:
+            semaphore = asyncio.Semaphore(GOOGLE_BATCH_CONCURRENCY)
+
+            async def delete(doc_id: str):
+                async with semaphore:
+                    await self.rest_client.delete_file(doc_id)
+
+            return await asyncio.gather(*(delete(doc_id) for doc_id in doc_ids), return_exceptions=True)
+        results = await run_google_call(lambda: execute_batch(self.drive_service, [
+            self.drive_service.files().delete(fileId=doc_id) for doc_id in doc_ids
+        ]))
+        return [exc for _, exc in results]
+
+    def _create_documents_batched(
+        self, documents: List[Tuple[str, str]]
+    ) -> Tuple[List[Union[dict, Exception]], List[str]]:
+        """Three batch HTTP requests (create, insertText, permissions) for the whole group.
+
+        Also returns the ids of Docs that were created but failed a later step.
+        """
+        results: List[Union[dict, Exception, None]] = [None] * len(documents)
+        abandoned: List[str] = []
+
+        created = execute_batch(self.docs_service, [
+            self.docs_service.documents().create(body={'title': title})
+            for title, _ in documents
+        ])
+        pending = []
+        for index, (response, exc) in enumerate(created):
+            doc_id = response.get('documentId') if response else None
+            if exc or not doc_id:
+                results[index] = GoogleAPIError(f"Failed to create Google document: {exc or 'no document ID'}")
+            else:
+                pending.append((index, doc_id))
+
+        updated = execute_batch(self.docs_service, [
             self.docs_service.documents().batchUpdate(
                 documentId=doc_id,
                 body={'requests': [{
                     'insertText': {
                         'location': {'index': 1},
-                        'text': content
+                        'text': documents[index][1]
                     }
                 }]}
-            ).execute()
+            )
+            for index, doc_id in pending
+        ])
+        inserted = []
+        for (index, doc_id), (_, exc) in zip(pending, updated):
+            if exc:
+                results[index] = GoogleAPIError(f"Failed to create Google document: {exc}")
+                abandoned.append(doc_id)
+            else:
+                inserted.append((index, doc_id))
 
-            # Set permissions, etc.
+        shared = execute_batch(self.drive_service, [
             self.drive_service.permissions().create(
                 fileId=doc_id,
                 body={'role': 'reader', 'type': 'anyone'}
-            ).execute()
-
-            return {'doc_id': doc_id, 'doc_url': f"https://docs.google.com/document/d/{doc_id}/edit"}
+            )
+            for _, doc_id in inserted
+        ])
+        for (index, doc_id), (_, exc) in zip(inserted, shared):
+            if exc:
+                results[index] = GoogleAPIError(f"Failed to create Google document: {exc}")
+                abandoned.append(doc_id)
+            else:
+                results[index] = {'doc_id': doc_id, 'doc_url': f"https://docs.google.com/document/d/{doc_id}/edit"}
 
-        except Exception as exc:
-            logger.error(f"Error creating document: {exc}")
-            raise GoogleAPIError(f"Failed to create Google document: {str(exc)}") 
\ No newline at end of file
+        return results, abandoned
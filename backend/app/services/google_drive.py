@@ -1,10 +1,19 @@
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
 from googleapiclient.http import MediaIoBaseUpload
 from io import BytesIO
 import logging
-from ..config import GOOGLE_CREDENTIALS_PATH, GOOGLE_DRIVE_FOLDER_ID, TESTING, SKIP_GOOGLE_AUTH
+from ..config import (
+    GOOGLE_CREDENTIALS_PATH,
+    GOOGLE_DRIVE_FOLDER_ID,
+    TESTING,
+    SKIP_GOOGLE_AUTH,
+    GOOGLE_API_BACKEND,
+    GOOGLE_BATCH_ENABLED,
+)
 from ..exceptions import GoogleAPIError
+from .google_executor import run_google_call
+from .google_batch import get_drive_batcher
+from .google_rest import GoogleRestClient
+from .google_clients import ThreadLocalClient, get_service_account_credentials
 import os
 from unittest.mock import Mock
 
@@ -12,6 +21,7 @@ logger = logging.getLogger(__name__)
 
 class GoogleDriveService:
     def __init__(self):
+        self.rest_client = None
         if TESTING or SKIP_GOOGLE_AUTH:
             self.service = Mock()
             mock_file = {'id': 'mock-id', 'webViewLink': 'https://drive.google.com/mock-id'}
@@ -23,11 +33,15 @@ class GoogleDriveService:
                 if not os.path.exists(GOOGLE_CREDENTIALS_PATH):
                     raise FileNotFoundError(f"Google credentials file not found at {GOOGLE_CREDENTIALS_PATH}")
 
-                self.credentials = service_account.Credentials.from_service_account_file(
+                self.credentials = get_service_account_credentials(
                     GOOGLE_CREDENTIALS_PATH,
                     scopes=['https://www.googleapis.com/auth/drive.file']
                 )
-                self.service = build('drive', 'v3', credentials=self.credentials)
+                if GOOGLE_API_BACKEND == 'rest':
+                    self.rest_client = GoogleRestClient(self.credentials)
+                    self.service = self.rest_client
+                else:
+                    self.service = ThreadLocalClient('drive', 'v3', self.credentials)
                 logger.info("Successfully initialized Google Drive service")
             except Exception as e:
                 logger.error(f"Failed to initialize Google Drive service: {e}")
@@ -56,25 +70,50 @@ class GoogleDriveService:
                 elif filename.endswith('.pdf'):
                     mime_type = 'application/pdf'
             
+            if self.rest_client:
+                file = await self.rest_client.create_file(
+                    file_metadata,
+                    content=content.encode(),
+                    mime_type=mime_type,
+                    fields='id, webViewLink'
+                )
+                await self.rest_client.create_permission(
+                    file.get('id'),
+                    {'type': 'anyone', 'role': 'reader'},
+                    fields='id'
+                )
+                return {
+                    'doc_id': file.get('id'),
+                    'doc_url': file.get('webViewLink')
+                }
+
             media = MediaIoBaseUpload(
                 BytesIO(content.encode()),
                 mimetype=mime_type,
                 resumable=True
             )
 
-            file = self.service.files().create(
-                body=file_metadata,
-                media_body=media,
-                fields='id, webViewLink',
-                supportsAllDrives=True
-            ).execute()
+            file = await run_google_call(
+                lambda: self.service.files().create(
+                    body=file_metadata,
+                    media_body=media,
+                    fields='id, webViewLink',
+                    supportsAllDrives=True
+                ).execute()
+            )
 
             # Set file permissions to anyone with link can view
-            self.service.permissions().create(
-                fileId=file.get('id'),
-                body={'type': 'anyone', 'role': 'reader'},
-                fields='id'
-            ).execute()
+            permission = {'type': 'anyone', 'role': 'reader'}
+            if GOOGLE_BATCH_ENABLED:
+                await get_drive_batcher(self.service).create_permission(file.get('id'), permission, fields='id')
+            else:
+                await run_google_call(
+                    lambda: self.service.permissions().create(
+                        fileId=file.get('id'),
+                        body=permission,
+                        fields='id'
+                    ).execute()
+                )
 
             return {
                 'doc_id': file.get('id'),
@@ -87,7 +126,12 @@ class GoogleDriveService:
     async def delete_document(self, doc_id: str) -> None:
         """Delete a document from Google Drive"""
         try:
-            self.service.files().delete(fileId=doc_id).execute()
+            if self.rest_client:
+                await self.rest_client.delete_file(doc_id)
+            elif GOOGLE_BATCH_ENABLED:
+                await get_drive_batcher(self.service).delete_file(doc_id)
+            else:
+                await run_google_call(lambda: self.service.files().delete(fileId=doc_id).execute())
         except Exception as e:
             logger.error(f"Error deleting from Google Drive: {e}")
             raise GoogleAPIError(f"Failed to delete document: {str(e)}")
\ No newline at end of file
@@ -0,0 +1,103 @@
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional
+from ..config import GOOGLE_EXECUTOR_WORKERS, GOOGLE_EXECUTOR_MAX_QUEUE
+from ..exceptions import GoogleAPIError
+from .monitoring import (
+    GOOGLE_API_LATENCY,
+    GOOGLE_EXECUTOR_QUEUE_DEPTH,
+    GOOGLE_EXECUTOR_ACTIVE,
+    GOOGLE_EXECUTOR_REJECTED,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class GoogleExecutor:
+    """Bounded thread pool for blocking Google API calls"""
+
+    def __init__(self, max_workers: int = GOOGLE_EXECUTOR_WORKERS, max_queue: int = GOOGLE_EXECUTOR_MAX_QUEUE):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="google-api")
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queued
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    def _run(self, func: Callable, *args, **kwargs) -> Any:
+        with self._lock:
+            self._queued -= 1
+            self._active += 1
+        GOOGLE_EXECUTOR_QUEUE_DEPTH.dec()
+        GOOGLE_EXECUTOR_ACTIVE.inc()
+        start_time = time.time()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            GOOGLE_API_LATENCY.observe(time.time() - start_time)
+            with self._lock:
+                self._active -= 1
+            GOOGLE_EXECUTOR_ACTIVE.dec()
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """Run a blocking Google call in the pool without blocking the event loop"""
+        with self._lock:
+            # Calls beyond the worker count wait in the queue; refuse once that is full
+            if self._queued + self._active >= self.max_workers + self.max_queue:
+                GOOGLE_EXECUTOR_REJECTED.inc()
+                raise GoogleAPIError("Google API executor is overloaded, try again later")
+            self._queued += 1
+        GOOGLE_EXECUTOR_QUEUE_DEPTH.inc()
+
+        loop = asyncio.get_running_loop()
+        try:
+            future = loop.run_in_executor(self._executor, partial(self._run, func, *args, **kwargs))
+        except RuntimeError:
+            # The pool was shut down before the call could be scheduled
+            with self._lock:
+                self._queued -= 1
+            GOOGLE_EXECUTOR_QUEUE_DEPTH.dec()
+            raise
+        return await future
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+
+
+_executor: Optional[GoogleExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_google_executor() -> GoogleExecutor:
+    """Return the process-wide Google executor, creating it on first use"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = GoogleExecutor()
+    return _executor
+
+
+async def run_google_call(func: Callable, *args, **kwargs) -> Any:
+    """Run a blocking Google API call on the shared Google executor"""
+    return await get_google_executor().run(func, *args, **kwargs)
+
+
+def shutdown_google_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+            _executor = None
@@ -0,0 +1,132 @@
+import asyncio
+import json
+import logging
+import uuid
+from typing import Dict, List, Optional
+import httpx
+from google.auth.transport.requests import Request as GoogleAuthRequest
+from ..config import GOOGLE_HTTP_MAX_CONNECTIONS, GOOGLE_HTTP_MAX_KEEPALIVE, GOOGLE_HTTP_TIMEOUT
+from ..exceptions import GoogleAPIError
+from .google_executor import run_google_call
+
+logger = logging.getLogger(__name__)
+
+DOCS_API_URL = "https://docs.googleapis.com/v1"
+DRIVE_API_URL = "https://www.googleapis.com/drive/v3"
+DRIVE_UPLOAD_URL = "https://www.googleapis.com/upload/drive/v3"
+
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_google_http_client() -> httpx.AsyncClient:
+    """Return the process-wide pooled HTTP client used for Google REST calls"""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=GOOGLE_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=GOOGLE_HTTP_MAX_KEEPALIVE
+            ),
+            timeout=GOOGLE_HTTP_TIMEOUT
+        )
+    return _http_client
+
+
+async def close_google_http_client():
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+class GoogleRestClient:
+    """Async client for the Docs and Drive REST endpoints the app uses"""
+
+    def __init__(self, credentials, http_client: Optional[httpx.AsyncClient] = None):
+        self.credentials = credentials
+        self._http_client = http_client
+        self._refresh_lock: Optional[asyncio.Lock] = None
+
+    @property
+    def http(self) -> httpx.AsyncClient:
+        return self._http_client or get_google_http_client()
+
+    async def _authorization_header(self) -> Dict[str, str]:
+        if not self.credentials.valid:
+            if self._refresh_lock is None:
+                self._refresh_lock = asyncio.Lock()
+            async with self._refresh_lock:
+                if not self.credentials.valid:
+                    # google-auth refreshes synchronously, keep it off the event loop
+                    await run_google_call(self.credentials.refresh, GoogleAuthRequest())
+        return {'Authorization': f"Bearer {self.credentials.token}"}
+
+    async def _request(self, method: str, url: str, **kwargs) -> dict:
+        headers = kwargs.pop('headers', {})
+        headers.update(await self._authorization_header())
+        try:
+            response = await self.http.request(method, url, headers=headers, **kwargs)
+        except httpx.HTTPError as e:
+            raise GoogleAPIError(f"Google API request {method} {url} failed: {str(e)}")
+
+        if response.status_code >= 400:
+            raise GoogleAPIError(
+                f"Google API request {method} {url} failed with status {response.status_code}: {response.text}"
+            )
+        if not response.content:
+            return {}
+        return response.json()
+
+    async def create_document(self, title: str) -> dict:
+        """documents.create"""
+        return await self._request('POST', f"{DOCS_API_URL}/documents", json={'title': title})
+
+    async def batch_update_document(self, document_id: str, requests: List[dict]) -> dict:
+        """documents.batchUpdate"""
+        return await self._request(
+            'POST',
+            f"{DOCS_API_URL}/documents/{document_id}:batchUpdate",
+            json={'requests': requests}
+        )
+
+    async def create_file(self, metadata: dict, content: Optional[bytes] = None,
+                          mime_type: str = 'text/plain', fields: Optional[str] = None) -> dict:
+        """files.create, with a multipart media upload when content is given"""
+        params = {'supportsAllDrives': 'true'}
+        if fields:
+            params['fields'] = fields
+
+        if content is None:
+            return await self._request('POST', f"{DRIVE_API_URL}/files", params=params, json=metadata)
+
+        boundary = uuid.uuid4().hex
+        body = b"".join([
+            f"--{boundary}\r\nContent-Type: application/json; charset=UTF-8\r\n\r\n".encode(),
+            json.dumps(metadata).encode(),
+            f"\r\n--{boundary}\r\nContent-Type: {mime_type}\r\n\r\n".encode(),
+            content,
+            f"\r\n--{boundary}--".encode(),
+        ])
+        params['uploadType'] = 'multipart'
+        return await self._request(
+            'POST',
+            f"{DRIVE_UPLOAD_URL}/files",
+            params=params,
+            content=body,
+            headers={'Content-Type': f"multipart/related; boundary={boundary}"}
+        )
+
+    async def delete_file(self, file_id: str) -> dict:
+        """files.delete"""
+        return await self._request(
+            'DELETE', f"{DRIVE_API_URL}/files/{file_id}", params={'supportsAllDrives': 'true'}
+        )
+
+    async def create_permission(self, file_id: str, permission: dict, fields: Optional[str] = None) -> dict:
+        """permissions.create"""
+        params = {'supportsAllDrives': 'true'}
+        if fields:
+            params['fields'] = fields
+        return await self._request(
+            'POST', f"{DRIVE_API_URL}/files/{file_id}/permissions", params=params, json=permission
+        )
@@ -0,0 +1,261 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+import redis
+from google.auth import credentials as google_credentials
+from google.auth.transport.requests import Request as GoogleAuthRequest
+from ..config import (
+    GOOGLE_TOKEN_CACHE_BACKEND,
+    GOOGLE_TOKEN_CACHE_PATH,
+    GOOGLE_TOKEN_REFRESH_MARGIN,
+    REDIS_HOST,
+    REDIS_PORT,
+    REDIS_DB,
+    TESTING,
+)
+from .monitoring import GOOGLE_TOKEN_CACHE_HITS, GOOGLE_TOKEN_REFRESHES, GOOGLE_TOKEN_REFRESH_ERRORS
+
+try:
+    import fcntl
+except ImportError:  # Windows dev machines: writes are still atomic, just not serialized
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# google-auth treats tokens within 3m45s of expiry as expired, so never hand out anything closer
+MIN_TOKEN_LIFETIME = 240
+
+TokenEntry = Tuple[str, float]
+
+
+class RedisTokenStore:
+    """Share access tokens between workers through Redis"""
+
+    def __init__(self, client: Optional[redis.Redis] = None):
+        self.client = client or redis.Redis(
+            host=REDIS_HOST,
+            port=REDIS_PORT,
+            db=REDIS_DB,
+            decode_responses=True,
+            socket_timeout=1
+        )
+
+    def get(self, key: str) -> Optional[TokenEntry]:
+        raw = self.client.get(f"google:token:{key}")
+        if not raw:
+            return None
+        data = json.loads(raw)
+        return data['token'], data['expiry']
+
+    def set(self, key: str, token: str, expiry: float):
+        ttl = int(expiry - time.time())
+        if ttl > 0:
+            self.client.set(f"google:token:{key}", json.dumps({'token': token, 'expiry': expiry}), ex=ttl)
+
+
+class FileTokenStore:
+    """Share access tokens between workers on one host through a local file"""
+
+    def __init__(self, path: str = GOOGLE_TOKEN_CACHE_PATH):
+        self.path = path
+
+    def _read(self) -> Dict[str, dict]:
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def get(self, key: str) -> Optional[TokenEntry]:
+        data = self._read().get(key)
+        if not data:
+            return None
+        return data['token'], data['expiry']
+
+    def set(self, key: str, token: str, expiry: float):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        with open(f"{self.path}.lock", 'w') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            now = time.time()
+            data = {k: v for k, v in self._read().items() if v.get('expiry', 0) > now}
+            data[key] = {'token': token, 'expiry': expiry}
+            # Tokens are bearer secrets: write owner-only and swap atomically
+            fd, tmp_path = tempfile.mkstemp(dir=directory)
+            with os.fdopen(fd, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+
+
+class TokenCache:
+    """Access-token cache that refreshes tokens in the background before they expire"""
+
+    def __init__(self, store=None, refresh_margin: int = GOOGLE_TOKEN_REFRESH_MARGIN, background: bool = True):
+        self.store = store
+        self.background = background
+        self.refresh_margin = max(refresh_margin, MIN_TOKEN_LIFETIME)
+        self._entries: Dict[str, TokenEntry] = {}
+        self._sources: Dict[str, Any] = {}
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+    def _usable(self, entry: Optional[TokenEntry], min_lifetime: float = MIN_TOKEN_LIFETIME) -> bool:
+        return entry is not None and entry[1] - time.time() > min_lifetime
+
+    def _key_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _register(self, key: str, source):
+        if key in self._sources:
+            return
+        with self._lock:
+            self._sources.setdefault(key, source)
+            if self.background and self._thread is None and not self._stopped:
+                self._thread = threading.Thread(target=self._run, name="google-token-refresh", daemon=True)
+                self._thread.start()
+
+    def _load_shared(self, key: str) -> Optional[TokenEntry]:
+        if self.store is None:
+            return None
+        try:
+            return self.store.get(key)
+        except Exception as e:
+            logger.error(f"Token cache read error: {e}")
+            return None
+
+    def _save_shared(self, key: str, entry: TokenEntry):
+        if self.store is None:
+            return
+        try:
+            self.store.set(key, *entry)
+        except Exception as e:
+            logger.error(f"Token cache write error: {e}")
+
+    def _refresh(self, key: str, source, mode: str) -> TokenEntry:
+        try:
+            source.refresh(GoogleAuthRequest())
+        except Exception:
+            GOOGLE_TOKEN_REFRESH_ERRORS.inc()
+            raise
+        if source.expiry:
+            expiry = source.expiry.replace(tzinfo=timezone.utc).timestamp()
+        else:
+            expiry = time.time() + 3600
+        entry = (source.token, expiry)
+        self._entries[key] = entry
+        GOOGLE_TOKEN_REFRESHES.labels(mode=mode).inc()
+        self._save_shared(key, entry)
+        self._wakeup.set()
+        return entry
+
+    def get_token(self, key: str, source) -> TokenEntry:
+        """Return (token, expiry timestamp), fetching a token only if none is cached anywhere"""
+        self._register(key, source)
+
+        entry = self._entries.get(key)
+        if self._usable(entry):
+            GOOGLE_TOKEN_CACHE_HITS.labels(tier='memory').inc()
+            return entry
+
+        with self._key_lock(key):
+            entry = self._entries.get(key)
+            if self._usable(entry):
+                GOOGLE_TOKEN_CACHE_HITS.labels(tier='memory').inc()
+                return entry
+
+            shared = self._load_shared(key)
+            if self._usable(shared):
+                self._entries[key] = shared
+                GOOGLE_TOKEN_CACHE_HITS.labels(tier='shared').inc()
+                return shared
+
+            return self._refresh(key, source, mode='inline')
+
+    def refresh_due(self) -> float:
+        """Refresh tokens inside the refresh margin; returns seconds until the next one is due"""
+        next_due = 60.0
+        for key in list(self._sources):
+            entry = self._entries.get(key)
+            if self._usable(entry, self.refresh_margin):
+                next_due = min(next_due, entry[1] - time.time() - self.refresh_margin)
+                continue
+            try:
+                with self._key_lock(key):
+                    # A request thread or another worker may already have refreshed it
+                    if self._usable(self._entries.get(key), self.refresh_margin):
+                        continue
+                    shared = self._load_shared(key)
+                    if self._usable(shared, self.refresh_margin):
+                        self._entries[key] = shared
+                    else:
+                        self._refresh(key, self._sources[key], mode='background')
+            except Exception as e:
+                logger.error(f"Background token refresh failed for {key}: {e}")
+                next_due = min(next_due, 10.0)
+        return max(next_due, 5.0)
+
+    def _run(self):
+        while not self._stopped:
+            wait = self.refresh_due()
+            self._wakeup.wait(wait)
+            self._wakeup.clear()
+
+    def stop(self):
+        self._stopped = True
+        self._wakeup.set()
+
+
+class CachedCredentials(google_credentials.Credentials):
+    """Credentials whose tokens come from the shared TokenCache instead of a per-instance fetch"""
+
+    def __init__(self, source, cache: Optional[TokenCache] = None):
+        super().__init__()
+        self.source = source
+        self._cache = cache
+        scopes = getattr(source, 'scopes', None) or ()
+        email = getattr(source, 'service_account_email', 'default')
+        self.cache_key = f"{email}:{' '.join(sorted(scopes))}"
+
+    def refresh(self, request):
+        cache = self._cache or get_token_cache()
+        token, expiry = cache.get_token(self.cache_key, self.source)
+        self.token = token
+        # google-auth compares against naive UTC datetimes
+        self.expiry = datetime.fromtimestamp(expiry, timezone.utc).replace(tzinfo=None)
+
+
+_token_cache: Optional[TokenCache] = None
+_token_cache_lock = threading.Lock()
+
+
+def get_token_cache() -> TokenCache:
+    """Return the process-wide token cache with the configured shared store"""
+    global _token_cache
+    if _token_cache is None:
+        with _token_cache_lock:
+            if _token_cache is None:
+                store = None
+                if not TESTING:
+                    if GOOGLE_TOKEN_CACHE_BACKEND == 'redis':
+                        store = RedisTokenStore()
+                    elif GOOGLE_TOKEN_CACHE_BACKEND == 'file':
+                        store = FileTokenStore()
+                _token_cache = TokenCache(store=store)
+    return _token_cache
+
+
+def stop_token_cache():
+    global _token_cache
+    with _token_cache_lock:
+        if _token_cache is not None:
+            _token_cache.stop()
+            _token_cache = None
@@ -1,8 +1,7 @@
 from typing import Dict
-import redis
 from sqlalchemy import text
 from ..database import engine
-from ..config import REDIS_HOST, REDIS_PORT
+from .redis_pool import get_redis_client
 from .google_drive import GoogleDriveService
 
 async def check_db_connection() -> Dict[str, bool]:
@@ -15,8 +14,7 @@ async def check_db_connection() -> Dict[str, bool]:
 
 async def check_redis_connection() -> Dict[str, bool]:
     try:
-        r = redis.Redis(host=REDIS_HOST, port=REDIS_PORT)
-        r.ping()
+        await get_redis_client().ping()
         return {"status": True}
     except Exception as e:
         return {"status": False, "error": str(e)}
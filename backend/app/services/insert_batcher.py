@@ -0,0 +1,118 @@
+import asyncio
+import logging
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from sqlalchemy import insert
+from ..config import DOCUMENT_INSERT_WINDOW_MS, DOCUMENT_INSERT_BATCH_MAX
+from ..database import AsyncSessionLocal
+from ..exceptions import DatabaseError
+from ..models import GeneratedDocument
+from .monitoring import DOCUMENT_INSERT_BATCH_SIZE
+
+logger = logging.getLogger(__name__)
+
+InsertedRow = Tuple[int, datetime]
+
+
+class InsertBatcher:
+    """Group commit for document rows inserted by concurrent requests.
+
+    Rows are collected for a short window (or until the batch is full), written with one
+    multi-row INSERT ... RETURNING in a single transaction, and each caller gets back the
+    id and created_at assigned to its row.
+    """
+
+    def __init__(self, session_factory: Callable = AsyncSessionLocal,
+                 window: float = DOCUMENT_INSERT_WINDOW_MS / 1000,
+                 max_size: int = DOCUMENT_INSERT_BATCH_MAX):
+        self.session_factory = session_factory
+        self.window = window
+        self.max_size = max_size
+        self._pending: List[Tuple[Dict, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._loop = None
+        # The loop only keeps weak references to tasks; hold in-flight writes until they finish
+        self._writing: Set[asyncio.Task] = set()
+
+    async def insert(self, row: Dict) -> InsertedRow:
+        """Queue a row for the next group commit and wait until it is durable"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._pending = []
+            self._timer = None
+            self._writing = set()
+
+        future = loop.create_future()
+        self._pending.append((row, future))
+        if len(self._pending) >= self.max_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, []
+        if pending:
+            task = self._loop.create_task(self._write(pending))
+            self._writing.add(task)
+            task.add_done_callback(self._writing.discard)
+
+    async def drain(self):
+        """Write whatever is still queued and wait for every outstanding group commit"""
+        if self._loop is not asyncio.get_running_loop():
+            return
+        self._flush()
+        if self._writing:
+            await asyncio.gather(*self._writing, return_exceptions=True)
+
+    async def _write(self, pending: List[Tuple[Dict, asyncio.Future]]):
+        rows = [row for row, _ in pending]
+        try:
+            inserted = await self._insert_rows(rows)
+        except Exception as e:
+            if len(pending) == 1:
+                self._fail(pending, e)
+                return
+            # One bad row (a duplicate doc_id, say) must not fail everyone else's insert
+            logger.warning(f"Group commit of {len(rows)} documents failed, retrying one by one: {e}")
+            for row, future in pending:
+                try:
+                    self._resolve([future], await self._insert_rows([row]))
+                except Exception as row_error:
+                    self._fail([(row, future)], row_error)
+            return
+        self._resolve([future for _, future in pending], inserted)
+
+    async def _insert_rows(self, rows: List[Dict]) -> List[InsertedRow]:
+        async with self.session_factory() as db:
+            inserted = (await db.execute(
+                insert(GeneratedDocument).returning(
+                    GeneratedDocument.id,
+                    GeneratedDocument.created_at,
+                    sort_by_parameter_order=True
+                ),
+                rows
+            )).all()
+            await db.commit()
+        DOCUMENT_INSERT_BATCH_SIZE.observe(len(rows))
+        return [tuple(row) for row in inserted]
+
+    @staticmethod
+    def _resolve(futures: List[asyncio.Future], inserted: List[InsertedRow]):
+        for future, row in zip(futures, inserted):
+            if not future.done():
+                future.set_result(row)
+
+    @staticmethod
+    def _fail(pending: List[Tuple[Dict, asyncio.Future]], error: Exception):
+        logger.error(f"Database error while inserting document: {error}")
+        for _, future in pending:
+            if not future.done():
+                future.set_exception(DatabaseError(f"Error saving document: {str(error)}"))
+
+
+document_inserter = InsertBatcher()
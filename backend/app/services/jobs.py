@@ -0,0 +1,146 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional
+from sqlalchemy import and_, or_, select, update
+from ..config import GENERATION_WORKERS, GENERATION_JOB_LEASE_SECONDS
+from ..database import AsyncSessionLocal
+from ..models import GeneratedDocument
+from .cache import invalidate_document_lists
+
+logger = logging.getLogger(__name__)
+
+JOB_PENDING = "pending"
+JOB_PROCESSING = "processing"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+
+class GenerationWorkerPool:
+    """Finishes Google Doc creation for documents accepted in async mode"""
+
+    def __init__(self, workers: int = GENERATION_WORKERS, session_factory: Callable = AsyncSessionLocal,
+                 service_factory: Optional[Callable] = None, lease: int = GENERATION_JOB_LEASE_SECONDS):
+        self.workers = workers
+        self.lease = lease
+        self.session_factory = session_factory
+        self.service_factory = service_factory
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._loop = None
+
+    def _get_service(self):
+        if self.service_factory is None:
+            from .document import DocumentService
+            self.service_factory = DocumentService
+        return self.service_factory()
+
+    def _ensure_started(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._tasks:
+            return
+        # Queues and tasks belong to one event loop; start fresh on a new one
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        self._tasks = [loop.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def start(self):
+        """Start the workers and pick up jobs no live worker is holding"""
+        self._ensure_started()
+        async with self.session_factory() as db:
+            result = await db.execute(
+                select(GeneratedDocument.id).where(self._claimable(datetime.utcnow()))
+            )
+            pending = result.scalars().all()
+        for document_id in pending:
+            self._queue.put_nowait(document_id)
+        if pending:
+            logger.info(f"Re-queued {len(pending)} pending generation jobs")
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def submit(self, document_id: int):
+        """Queue Google Doc creation for a persisted pending document"""
+        self._ensure_started()
+        self._queue.put_nowait(document_id)
+
+    async def join(self):
+        """Wait until every queued job has been processed"""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def _worker(self):
+        while True:
+            document_id = await self._queue.get()
+            try:
+                await self.process(document_id)
+            except Exception as e:
+                logger.error(f"Generation job for document {document_id} crashed: {e}", exc_info=True)
+            finally:
+                self._queue.task_done()
+
+    def _claimable(self, now: datetime):
+        lease_expired = now - timedelta(seconds=self.lease)
+        return or_(
+            GeneratedDocument.google_status == JOB_PENDING,
+            and_(
+                GeneratedDocument.google_status == JOB_PROCESSING,
+                or_(GeneratedDocument.google_claimed_at.is_(None),
+                    GeneratedDocument.google_claimed_at < lease_expired)
+            )
+        )
+
+    async def process(self, document_id: int):
+        async with self.session_factory() as db:
+            # Claim atomically so two workers (or processes) never create two Docs for one row
+            claimed_at = datetime.utcnow()
+            result = await db.execute(
+                update(GeneratedDocument)
+                .where(GeneratedDocument.id == document_id, self._claimable(claimed_at))
+                .values(google_status=JOB_PROCESSING, google_claimed_at=claimed_at)
+                .returning(GeneratedDocument.name, GeneratedDocument.content)
+            )
+            claimed = result.first()
+            await db.commit()
+            if claimed is None:
+                return
+
+            service = self._get_service()
+            try:
+                google_doc = await service.create_google_document(claimed.name, claimed.content)
+            except Exception as e:
+                logger.error(f"Google creation failed for document {document_id}: {e}")
+                values = {"google_status": JOB_FAILED, "google_error": str(e)}
+            else:
+                values = {
+                    "doc_id": google_doc["doc_id"],
+                    "doc_url": google_doc["doc_url"],
+                    "google_status": JOB_DONE,
+                    "google_error": None,
+                }
+
+            # Only record the outcome if our claim still stands
+            result = await db.execute(
+                update(GeneratedDocument)
+                .where(
+                    GeneratedDocument.id == document_id,
+                    GeneratedDocument.google_status == JOB_PROCESSING,
+                    GeneratedDocument.google_claimed_at == claimed_at
+                )
+                .values(**values)
+            )
+            await db.commit()
+            if result.rowcount == 0:
+                logger.warning(f"Lease on generation job for document {document_id} expired before it finished")
+                # Another worker owns the row now; its Doc is the one that gets recorded
+                if "doc_id" in values:
+                    await service.delete_google_documents([values["doc_id"]])
+            else:
+                await invalidate_document_lists()
+
+
+generation_pool = GenerationWorkerPool()
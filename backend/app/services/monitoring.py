@@ -1,4 +1,4 @@
-from prometheus_client import Counter, Histogram, CollectorRegistry
+from prometheus_client import Counter, Gauge, Histogram, CollectorRegistry
 import time
 from functools import wraps
 from typing import Dict
@@ -36,6 +36,133 @@ GOOGLE_API_LATENCY = Histogram(
     registry=registry
 )
 
+GOOGLE_EXECUTOR_QUEUE_DEPTH = Gauge(
+    'google_executor_queue_depth',
+    'Google API calls waiting for a free executor worker',
+    registry=registry
+)
+
+GOOGLE_EXECUTOR_ACTIVE = Gauge(
+    'google_executor_active_calls',
+    'Google API calls currently running in the executor',
+    registry=registry
+)
+
+GOOGLE_EXECUTOR_REJECTED = Counter(
+    'google_executor_rejected_total',
+    'Google API calls rejected because the executor queue was full',
+    registry=registry
+)
+
+GOOGLE_TOKEN_CACHE_HITS = Counter(
+    'google_token_cache_hits_total',
+    'Google access tokens served from the token cache',
+    ['tier'],
+    registry=registry
+)
+
+GOOGLE_TOKEN_REFRESHES = Counter(
+    'google_token_refreshes_total',
+    'Google access tokens fetched from the OAuth endpoint',
+    ['mode'],
+    registry=registry
+)
+
+GOOGLE_TOKEN_REFRESH_ERRORS = Counter(
+    'google_token_refresh_errors_total',
+    'Failed Google access-token refreshes',
+    registry=registry
+)
+
+DOCUMENT_INSERT_BATCH_SIZE = Histogram(
+    'document_insert_batch_size',
+    'Documents written per group-commit transaction',
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200),
+    registry=registry
+)
+
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    'db_pool_checkout_wait_seconds',
+    'Time spent waiting for a database connection from the pool',
+    ['engine'],
+    registry=registry
+)
+
+DB_POOL_IN_USE = Gauge(
+    'db_pool_connections_in_use',
+    'Database connections currently checked out of the pool',
+    ['engine'],
+    registry=registry
+)
+
+DB_POOL_OVERFLOW = Gauge(
+    'db_pool_overflow_connections',
+    'Database connections open beyond the pool size',
+    ['engine'],
+    registry=registry
+)
+
+DB_POOL_TIMEOUTS = Counter(
+    'db_pool_checkout_timeouts_total',
+    'Checkouts that gave up waiting for a database connection',
+    ['engine'],
+    registry=registry
+)
+
+CACHE_LOOKUPS = Counter(
+    'cache_lookups_total',
+    'cache_response lookups per decorated function; hit ratio is hit / (hit + miss)',
+    ['function', 'result'],
+    registry=registry
+)
+
+CACHE_COALESCED = Counter(
+    'cache_coalesced_total',
+    'Cache misses that reused another caller\'s computation instead of running their own',
+    ['function', 'via'],
+    registry=registry
+)
+
+CACHE_STALE_SERVES = Counter(
+    'cache_stale_serves_total',
+    'Responses served past their soft TTL while a background refresh runs',
+    ['function'],
+    registry=registry
+)
+
+CACHE_REFRESH_LATENCY = Histogram(
+    'cache_refresh_duration_seconds',
+    'Background cache refresh duration (stale or refresh-ahead)',
+    ['function'],
+    registry=registry
+)
+
+CACHE_TIER_EVENTS = Counter(
+    'cache_tier_events_total',
+    'Cache hits, misses and evictions per tier (local in-process LRU, redis)',
+    ['tier', 'event'],
+    registry=registry
+)
+
+CACHE_LOCAL_BYTES = Gauge(
+    'cache_local_bytes',
+    'Approximate memory held by the in-process cache tier',
+    registry=registry
+)
+
+REDIS_POOL_CONNECTIONS = Gauge(
+    'redis_pool_connections',
+    'Connections in the shared Redis pool by state',
+    ['state'],
+    registry=registry
+)
+
+REDIS_POOL_MAX_CONNECTIONS = Gauge(
+    'redis_pool_max_connections',
+    'Size limit of the shared Redis pool',
+    registry=registry
+)
+
 # Request tracking
 request_times = defaultdict(list)
 request_counts = defaultdict(int)
@@ -110,6 +237,25 @@ __all__ = [
     'REQUEST_LATENCY',
     'DOCUMENT_GENERATION_COUNT',
     'GOOGLE_API_LATENCY',
+    'GOOGLE_EXECUTOR_QUEUE_DEPTH',
+    'GOOGLE_EXECUTOR_ACTIVE',
+    'GOOGLE_EXECUTOR_REJECTED',
+    'GOOGLE_TOKEN_CACHE_HITS',
+    'GOOGLE_TOKEN_REFRESHES',
+    'GOOGLE_TOKEN_REFRESH_ERRORS',
+    'DOCUMENT_INSERT_BATCH_SIZE',
+    'DB_POOL_CHECKOUT_WAIT',
+    'DB_POOL_IN_USE',
+    'DB_POOL_OVERFLOW',
+    'DB_POOL_TIMEOUTS',
+    'CACHE_LOOKUPS',
+    'CACHE_COALESCED',
+    'CACHE_STALE_SERVES',
+    'CACHE_REFRESH_LATENCY',
+    'CACHE_TIER_EVENTS',
+    'CACHE_LOCAL_BYTES',
+    'REDIS_POOL_CONNECTIONS',
+    'REDIS_POOL_MAX_CONNECTIONS',
     'record_request_metric',
     'generate_metrics',
     'track_latency'
@@ -0,0 +1,88 @@
+import base64
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+from sqlalchemy import text, tuple_
+from ..config import DOCUMENT_COUNT_CACHE_TTL, DOCUMENT_COUNT_CACHE_SIZE
+from ..exceptions import ValidationError
+from ..models import GeneratedDocument
+
+# Newest first; id breaks ties between rows created in the same instant
+KEYSET_ORDER = (GeneratedDocument.created_at.desc(), GeneratedDocument.id.desc())
+
+
+def encode_cursor(created_at: datetime, document_id: int) -> str:
+    """Build an opaque cursor pointing just after the given row"""
+    raw = json.dumps([created_at.isoformat(), document_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, document_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), int(document_id)
+    except (ValueError, TypeError):
+        raise ValidationError("Invalid cursor")
+
+
+def apply_keyset(query, cursor: str):
+    """Seek past the cursor row; works on ORM queries and Core selects"""
+    created_at, document_id = decode_cursor(cursor)
+    return query.filter(
+        tuple_(GeneratedDocument.created_at, GeneratedDocument.id) < tuple_(created_at, document_id)
+    )
+
+
+# Filtered counts keyed by filter signature, least recently used first: {key: (count, expires_at)}.
+# Keys come from client input (name, q), so the cache is bounded and expired entries are dropped.
+_count_cache: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+_count_cache_lock = threading.Lock()
+
+
+def count_cache_key(filters: dict) -> str:
+    return json.dumps({k: v for k, v in sorted(filters.items()) if v}, default=str)
+
+
+def get_cached_count(key: str) -> Optional[int]:
+    with _count_cache_lock:
+        entry = _count_cache.get(key)
+        if entry is None or entry[1] <= time.monotonic():
+            return None
+        _count_cache.move_to_end(key)
+        return entry[0]
+
+
+def set_cached_count(key: str, count: int, ttl: int = DOCUMENT_COUNT_CACHE_TTL,
+                     max_size: int = DOCUMENT_COUNT_CACHE_SIZE):
+    now = time.monotonic()
+    with _count_cache_lock:
+        for expired in [k for k, (_, expires_at) in _count_cache.items() if expires_at <= now]:
+            del _count_cache[expired]
+        _count_cache[key] = (count, now + ttl)
+        _count_cache.move_to_end(key)
+        while len(_count_cache) > max_size:
+            _count_cache.popitem(last=False)
+
+
+def clear_count_cache():
+    with _count_cache_lock:
+        _count_cache.clear()
+
+
+async def estimate_document_count(db) -> Optional[int]:
+    """Row estimate from PostgreSQL planner statistics; None where unavailable"""
+    if db.get_bind().dialect.name != 'postgresql':
+        return None
+    result = await db.execute(
+        text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"),
+        {'table': GeneratedDocument.__tablename__}
+    )
+    estimate = result.scalar()
+    # -1 (PG 14+) or 0 means the table has never been vacuumed/analyzed
+    if estimate is None or estimate <= 0:
+        return None
+    return int(estimate)
@@ -0,0 +1,60 @@
+from collections import namedtuple
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..models import GeneratedDocument
+
+# Values that need converting to be JSON-friendly; everything else passes through
+_CONVERTERS = {
+    "date": lambda value: value.isoformat(),
+    "created_at": lambda value: value.isoformat(),
+}
+
+
+class _DocumentRecordMixin:
+    __slots__ = ()
+
+    def to_dict(self, fields: Optional[Sequence[str]] = None) -> Dict:
+        data = dict(zip(self._fields, self))
+        for field, convert in _CONVERTERS.items():
+            value = data.get(field)
+            if value is not None:
+                data[field] = convert(value)
+        if fields is None:
+            return data
+        return {field: data[field] for field in fields}
+
+
+@lru_cache(maxsize=64)
+def record_type(fields: Tuple[str, ...]):
+    """Immutable tuple type with one attribute per selected column"""
+    base = namedtuple("DocumentRecord", fields)
+    return type("DocumentRecord", (base, _DocumentRecordMixin), {"__slots__": ()})
+
+
+def record_columns(fields: Optional[Sequence[str]] = None) -> Tuple[str, ...]:
+    """Columns to select: the requested ones plus id and created_at for ordering and cursors"""
+    if not fields:
+        return GeneratedDocument.SERIALIZED_FIELDS
+    wanted = set(fields) | {"id", "created_at"}
+    return tuple(field for field in GeneratedDocument.SERIALIZED_FIELDS if field in wanted)
+
+
+def select_documents(columns: Tuple[str, ...]):
+    return select(*(getattr(GeneratedDocument, column) for column in columns))
+
+
+def to_records(rows, columns: Tuple[str, ...]) -> List:
+    make = record_type(columns)._make
+    return [make(row) for row in rows]
+
+
+async def get_document_record(db: AsyncSession, doc_id: str):
+    """Read one document by Google doc id without building an ORM instance"""
+    columns = GeneratedDocument.SERIALIZED_FIELDS
+    result = await db.execute(
+        select_documents(columns).where(GeneratedDocument.doc_id == doc_id).limit(1)
+    )
+    row = result.first()
+    return record_type(columns)._make(row) if row is not None else None
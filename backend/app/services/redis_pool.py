@@ -0,0 +1,72 @@
+import logging
+from typing import Dict, Optional, Tuple
+from redis import asyncio as aioredis
+from ..config import (
+    REDIS_HOST,
+    REDIS_PORT,
+    REDIS_DB,
+    REDIS_MAX_CONNECTIONS,
+    REDIS_POOL_TIMEOUT,
+    REDIS_SOCKET_TIMEOUT,
+    REDIS_SOCKET_CONNECT_TIMEOUT,
+)
+from .monitoring import REDIS_POOL_CONNECTIONS, REDIS_POOL_MAX_CONNECTIONS
+
+logger = logging.getLogger(__name__)
+
+_pools: Dict[Tuple[str, int, int], aioredis.BlockingConnectionPool] = {}
+
+
+def get_redis_pool(host: str = REDIS_HOST, port: int = REDIS_PORT,
+                   db: int = REDIS_DB) -> aioredis.BlockingConnectionPool:
+    """Return the process-wide connection pool for a Redis server.
+
+    Callers block (up to REDIS_POOL_TIMEOUT) for a free connection instead of opening
+    more than REDIS_MAX_CONNECTIONS.
+    """
+    key = (host, port, db)
+    pool = _pools.get(key)
+    if pool is None:
+        pool = _pools[key] = aioredis.BlockingConnectionPool(
+            host=host,
+            port=port,
+            db=db,
+            max_connections=REDIS_MAX_CONNECTIONS,
+            timeout=REDIS_POOL_TIMEOUT,
+            socket_timeout=REDIS_SOCKET_TIMEOUT,
+            socket_connect_timeout=REDIS_SOCKET_CONNECT_TIMEOUT,
+            # Cached values are binary (see cache_codec.py)
+            decode_responses=False
+        )
+    return pool
+
+
+def get_redis_client(host: str = REDIS_HOST, port: int = REDIS_PORT, db: int = REDIS_DB) -> aioredis.Redis:
+    """Redis client on the shared pool; cheap to create, no connection of its own"""
+    return aioredis.Redis(connection_pool=get_redis_pool(host, port, db))
+
+
+async def close_redis_pools():
+    for pool in list(_pools.values()):
+        try:
+            await pool.disconnect()
+        except Exception as e:
+            logger.error(f"Error closing Redis pool: {e}")
+    _pools.clear()
+
+
+def redis_pool_usage(pool: Optional[aioredis.ConnectionPool] = None) -> Dict[str, int]:
+    """In-use and idle connections of a pool (the default server's pool when omitted)"""
+    pool = pool or _pools.get((REDIS_HOST, REDIS_PORT, REDIS_DB))
+    if pool is None:
+        return {"in_use": 0, "idle": 0}
+    return {
+        "in_use": len(getattr(pool, "_in_use_connections", ())),
+        "idle": len(getattr(pool, "_available_connections", ())),
+    }
+
+
+# Read at scrape time, so the gauges always reflect the current pool
+REDIS_POOL_CONNECTIONS.labels(state="in_use").set_function(lambda: redis_pool_usage()["in_use"])
+REDIS_POOL_CONNECTIONS.labels(state="idle").set_function(lambda: redis_pool_usage()["idle"])
+REDIS_POOL_MAX_CONNECTIONS.set(REDIS_MAX_CONNECTIONS)
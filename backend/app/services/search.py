@@ -0,0 +1,34 @@
+import re
+from sqlalchemy import column, func, literal_column, or_, table
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from ..models import GeneratedDocument
+
+# Created by DDL in models.py rather than mapped, since it only exists on PostgreSQL
+search_vector = column("search_vector", TSVECTOR)
+fts_table = table("generated_documents_fts", column("rowid"), column("rank"))
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def fts5_query(q: str) -> str:
+    """Quote each word so user input can't trip FTS5 query syntax; words are ANDed"""
+    return " ".join(f'"{token}"' for token in _TOKEN.findall(q))
+
+
+def apply_search(query, dialect: str, q: str):
+    """Filter to documents matching `q` in name or content, best matches first"""
+    if dialect == "postgresql":
+        tsquery = func.websearch_to_tsquery("english", q)
+        return query.filter(search_vector.op("@@")(tsquery)).order_by(
+            func.ts_rank(search_vector, tsquery).desc()
+        )
+    if dialect == "sqlite":
+        match = fts5_query(q)
+        if not match:
+            return query.filter(False)
+        return query.join(fts_table, fts_table.c.rowid == GeneratedDocument.id).filter(
+            literal_column("generated_documents_fts").op("MATCH")(match)
+        ).order_by(fts_table.c.rank)
+    # No full-text index on other databases
+    pattern = f"%{q}%"
+    return query.filter(or_(GeneratedDocument.name.ilike(pattern), GeneratedDocument.content.ilike(pattern)))
@@ -0,0 +1,112 @@
+"""Benchmark cache codecs on typical GET /documents list pages.
+
+Encodes and decodes cached list pages (the stored envelope around a page of full
+documents) with each available serializer/compression pair, reporting the best
+encode and decode time and the stored size. With --redis-host the pages are also
+written to Redis and MEMORY USAGE is reported per key:
+
+    cd backend
+    python -m benchmarks.cache_codec --page-sizes 10,50,100
+    python -m benchmarks.cache_codec --redis-host localhost
+"""
+import argparse
+import json
+import time
+from datetime import date, datetime, timedelta
+
+from app.services import cache_codec
+from app.services.cache_codec import CacheCodec
+from app.services.templates import DocumentTemplate
+
+
+def list_page(page_size: int) -> dict:
+    """A cached /documents page as cache_response stores it"""
+    start = datetime(2024, 1, 1)
+    items = []
+    for i in range(page_size):
+        data = {'name': f"Customer {i}", 'date': str(date(2024, 1, 1) + timedelta(days=i % 365)),
+                'amount': 100.0 + i * 3.7}
+        items.append({
+            'id': i + 1,
+            'name': data['name'],
+            'date': data['date'],
+            'amount': data['amount'],
+            'doc_id': f"doc-{i:08d}",
+            'doc_url': f"https://docs.google.com/document/d/doc-{i:08d}/edit",
+            'content': DocumentTemplate.generate_template(('receipt', 'invoice', 'contract')[i % 3], data),
+            'google_doc_id': None,
+            'google_status': None,
+            'created_at': (start + timedelta(minutes=i)).isoformat(),
+        })
+    now = time.time()
+    return {
+        'value': {'items': items, 'total': 5000, 'page': 1, 'page_size': page_size,
+                  'pages': 5000 // page_size, 'total_exact': True, 'next_cursor': None},
+        'fresh_until': now + 3600,
+        'stale_until': now + 3900,
+    }
+
+
+def codecs():
+    serializers = ['json'] + (['msgpack'] if cache_codec.msgpack is not None else [])
+    compressions = ['none', 'zlib'] + (['zstd'] if cache_codec.zstandard is not None else [])
+    return [(serializer, compression) for serializer in serializers for compression in compressions]
+
+
+def best_time(operation, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        operation()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def redis_memory(client, key: str, value: bytes) -> int:
+    client.set(key, value, ex=60)
+    try:
+        return client.memory_usage(key)
+    finally:
+        client.delete(key)
+
+
+def main(args):
+    client = None
+    if args.redis_host:
+        import redis
+        client = redis.Redis(host=args.redis_host, port=args.redis_port)
+
+    print(f"{'page':>5} {'codec':<13} {'bytes':>9} {'encode ms':>10} {'decode ms':>10}"
+          + (f" {'redis bytes':>12}" if client else ""))
+    for page_size in args.page_sizes:
+        page = list_page(page_size)
+        legacy = json.dumps(page)
+        encode = best_time(lambda: json.dumps(page), args.repeat)
+        decode = best_time(lambda: json.loads(legacy), args.repeat)
+        line = f"{page_size:>5} {'legacy text':<13} {len(legacy.encode()):>9} {encode * 1000:>10.3f} {decode * 1000:>10.3f}"
+        if client:
+            line += f" {redis_memory(client, 'bench:cache_codec', legacy.encode()):>12}"
+        print(line)
+
+        for serializer, compression in codecs():
+            codec = CacheCodec(serializer, compression, args.min_compress_bytes)
+            encoded = codec.encode(page)
+            assert codec.decode(encoded) == page
+            encode = best_time(lambda: codec.encode(page), args.repeat)
+            decode = best_time(lambda: codec.decode(encoded), args.repeat)
+            line = (f"{page_size:>5} {serializer + '+' + compression:<13} {len(encoded):>9} "
+                    f"{encode * 1000:>10.3f} {decode * 1000:>10.3f}")
+            if client:
+                line += f" {redis_memory(client, 'bench:cache_codec', encoded):>12}"
+            print(line)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--page-sizes', type=lambda value: [int(v) for v in value.split(',')],
+                        default=[10, 50, 100])
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--min-compress-bytes', type=int, default=1024)
+    parser.add_argument('--redis-host')
+    parser.add_argument('--redis-port', type=int, default=6379)
+    main(parser.parse_args())
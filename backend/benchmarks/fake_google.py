@@ -0,0 +1,81 @@
+"""Local fake of the Google Docs and Drive endpoints used by the app.
+
+Every call sleeps for a fixed simulated round trip, so benchmarks measure how
+many sequential Google calls a code path makes rather than real network noise.
+"""
+import asyncio
+import itertools
+import time
+from collections import Counter
+import httpx
+
+
+class FakeGoogleAPI:
+    def __init__(self, latency: float = 0.08):
+        self.latency = latency
+        self.calls = Counter()
+        self._ids = itertools.count(1)
+
+    def _respond(self, name: str) -> dict:
+        self.calls[name] += 1
+        if name in ('documents.create', 'files.create'):
+            new_id = f"fake-{next(self._ids)}"
+            return {'documentId': new_id, 'id': new_id, 'webViewLink': f"https://drive.google.com/{new_id}"}
+        return {}
+
+    # REST backend: an httpx transport
+
+    def transport(self) -> httpx.MockTransport:
+        async def handler(request: httpx.Request) -> httpx.Response:
+            await asyncio.sleep(self.latency)
+            path = request.url.path
+            if path == '/v1/documents':
+                name = 'documents.create'
+            elif path.endswith(':batchUpdate'):
+                name = 'documents.batchUpdate'
+            elif path.endswith('/permissions'):
+                name = 'permissions.create'
+            elif request.method == 'DELETE':
+                name = 'files.delete'
+            else:
+                name = 'files.create'
+            return httpx.Response(200, json=self._respond(name))
+        return httpx.MockTransport(handler)
+
+    # Discovery backend: objects shaped like googleapiclient Resources
+
+    def discovery_service(self):
+        return _FakeResource(self)
+
+
+class _FakeRequest:
+    def __init__(self, api: FakeGoogleAPI, name: str):
+        self.api = api
+        self.name = name
+
+    def execute(self):
+        time.sleep(self.api.latency)
+        return self.api._respond(self.name)
+
+
+class _FakeCollection:
+    def __init__(self, api: FakeGoogleAPI, prefix: str):
+        self.api = api
+        self.prefix = prefix
+
+    def __getattr__(self, method):
+        return lambda **kwargs: _FakeRequest(self.api, f"{self.prefix}.{method}")
+
+
+class _FakeResource:
+    def __init__(self, api: FakeGoogleAPI):
+        self.api = api
+
+    def documents(self):
+        return _FakeCollection(self.api, 'documents')
+
+    def files(self):
+        return _FakeCollection(self.api, 'files')
+
+    def permissions(self):
+        return _FakeCollection(self.api, 'permissions')
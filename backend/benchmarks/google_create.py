@@ -0,0 +1,81 @@
+"""Benchmark Google Doc creation: three-call Docs path vs single Drive upload.
+
+Runs against a local fake of the Google API (benchmarks/fake_google.py) with a
+simulated per-call round trip, for both the discovery and REST backends:
+
+    cd backend
+    python -m benchmarks.google_create --latency 0.08 --documents 50 --concurrency 10
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+os.environ.setdefault("SKIP_GOOGLE_AUTH", "true")
+
+import httpx  # noqa: E402
+from app.services.google_docs import GoogleDocsService  # noqa: E402
+from app.services.google_rest import GoogleRestClient  # noqa: E402
+from benchmarks.fake_google import FakeGoogleAPI  # noqa: E402
+
+
+class _StaticCredentials:
+    valid = True
+    token = "benchmark-token"
+
+
+def make_service(api: FakeGoogleAPI, backend: str, mode: str) -> GoogleDocsService:
+    service = GoogleDocsService()
+    service.create_mode = mode
+    if backend == 'rest':
+        http_client = httpx.AsyncClient(transport=api.transport())
+        service.rest_client = GoogleRestClient(_StaticCredentials(), http_client=http_client)
+    else:
+        service.docs_service = api.discovery_service()
+        service.drive_service = api.discovery_service()
+    return service
+
+
+async def run_case(backend: str, mode: str, documents: int, concurrency: int, latency: float) -> dict:
+    api = FakeGoogleAPI(latency=latency)
+    service = make_service(api, backend, mode)
+    semaphore = asyncio.Semaphore(concurrency)
+    timings = []
+
+    async def create(i: int):
+        async with semaphore:
+            start = time.perf_counter()
+            await service.create_document(f"Benchmark {i}", "RECEIPT\n" * 20)
+            timings.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(create(i) for i in range(documents)))
+    elapsed = time.perf_counter() - start
+
+    timings.sort()
+    return {
+        'backend': backend,
+        'mode': mode,
+        'mean_ms': statistics.mean(timings) * 1000,
+        'p95_ms': timings[int(len(timings) * 0.95) - 1] * 1000,
+        'docs_per_s': documents / elapsed,
+        'google_calls': sum(api.calls.values()),
+    }
+
+
+async def main(args):
+    print(f"{'backend':<10} {'mode':<7} {'mean ms':>9} {'p95 ms':>9} {'docs/s':>8} {'calls':>6}")
+    for backend in ('discovery', 'rest'):
+        for mode in ('docs', 'upload'):
+            r = await run_case(backend, mode, args.documents, args.concurrency, args.latency)
+            print(f"{r['backend']:<10} {r['mode']:<7} {r['mean_ms']:>9.1f} {r['p95_ms']:>9.1f} "
+                  f"{r['docs_per_s']:>8.1f} {r['google_calls']:>6}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--latency', type=float, default=0.08, help="simulated seconds per Google call")
+    parser.add_argument('--documents', type=int, default=50)
+    parser.add_argument('--concurrency', type=int, default=10)
+    asyncio.run(main(parser.parse_args()))
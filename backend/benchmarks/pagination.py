@@ -0,0 +1,99 @@
+"""Benchmark deep paging on GET /documents: OFFSET pages vs keyset cursors.
+
+Fills a throwaway SQLite file with generated_documents rows and times one
+DocumentService.get_documents call (page query plus any count, without the
+response cache) at increasing depths:
+
+    cd backend
+    python -m benchmarks.pagination --rows 2000000 --page-size 20
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Mock Google clients and the in-memory cache; the response cache is bypassed below
+os.environ.setdefault("TESTING", "true")
+
+from sqlalchemy import create_engine, insert, select  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine  # noqa: E402
+
+from app.database import Base  # noqa: E402
+from app.models import GeneratedDocument  # noqa: E402
+from app.services.document import DocumentService  # noqa: E402
+from app.services.pagination import KEYSET_ORDER, encode_cursor  # noqa: E402
+
+# The service call itself, without @cache_response
+get_documents = DocumentService.get_documents.__wrapped__
+
+
+def populate(engine, rows: int, chunk: int = 50000):
+    Base.metadata.create_all(engine)
+    start = datetime(2020, 1, 1)
+    with engine.begin() as conn:
+        for offset in range(0, rows, chunk):
+            conn.execute(insert(GeneratedDocument), [
+                {
+                    'name': f"User {i}",
+                    'date': (start + timedelta(seconds=i)).date(),
+                    'amount': 100.0,
+                    'content': "RECEIPT",
+                    'doc_id': f"doc-{i}",
+                    # A few timestamps repeat so the id tie-breaker matters
+                    'created_at': start + timedelta(seconds=i - i % 3),
+                }
+                for i in range(offset, min(offset + chunk, rows))
+            ])
+
+
+async def time_call(call, repeat: int = 5) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = await call()
+        best = min(best, time.perf_counter() - started)
+    assert result["items"]
+    return best * 1000
+
+
+async def run(path: str, rows: int, page_size: int):
+    service = DocumentService()
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    print(f"{'page':>8} {'offset ms':>10} {'cursor ms':>10}")
+    async with AsyncSession(engine) as db:
+        page = 1
+        while (page - 1) * page_size < rows:
+            skip = (page - 1) * page_size
+            offset_ms = await time_call(lambda: get_documents(service, db, page=page, page_size=page_size))
+            if skip:
+                # The cursor a client would hold after reading the previous page
+                last = (await db.execute(
+                    select(GeneratedDocument.created_at, GeneratedDocument.id)
+                    .order_by(*KEYSET_ORDER).offset(skip - 1).limit(1)
+                )).one()
+                cursor = encode_cursor(last.created_at, last.id)
+                cursor_ms = await time_call(
+                    lambda: get_documents(service, db, page_size=page_size, cursor=cursor)
+                )
+            else:
+                cursor_ms = offset_ms
+            print(f"{page:>8} {offset_ms:>10.2f} {cursor_ms:>10.2f}")
+            page *= 10
+    await engine.dispose()
+
+
+def main(args):
+    path = os.path.join(tempfile.mkdtemp(), 'pagination.db')
+    print(f"Populating {args.rows} rows in {path} ...")
+    populate(create_engine(f"sqlite:///{path}"), args.rows)
+    asyncio.run(run(path, args.rows, args.page_size))
+    os.remove(path)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=2000000)
+    parser.add_argument('--page-size', type=int, default=20)
+    main(parser.parse_args())
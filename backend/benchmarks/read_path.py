@@ -0,0 +1,88 @@
+"""Benchmark GET /documents read paths: ORM instances vs Core records.
+
+Reads pages from a throwaway SQLite file and serializes them the way the API
+does, reporting rows/s and peak Python memory (tracemalloc) per page size:
+
+    cd backend
+    python -m benchmarks.read_path --rows 20000 --page-sizes 100,1000,5000
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+from app.database import Base
+from app.models import GeneratedDocument
+from app.services.pagination import KEYSET_ORDER
+from app.services.records import record_columns, select_documents, to_records
+
+
+def populate(engine, rows: int):
+    Base.metadata.create_all(engine)
+    start = datetime(2024, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(GeneratedDocument), [
+            {
+                'name': f"User {i}",
+                'date': (start + timedelta(minutes=i)).date(),
+                'amount': 100.0 + i,
+                'content': "RECEIPT\n" * 40,
+                'doc_id': f"doc-{i}",
+                'doc_url': f"https://docs.google.com/document/d/doc-{i}",
+                'created_at': start + timedelta(minutes=i),
+            }
+            for i in range(rows)
+        ])
+
+
+def orm_page(db: Session, page_size: int):
+    documents = db.query(GeneratedDocument).order_by(*KEYSET_ORDER).limit(page_size).all()
+    return [document.to_dict() for document in documents]
+
+
+def core_page(db: Session, page_size: int):
+    columns = record_columns()
+    rows = db.execute(select_documents(columns).order_by(*KEYSET_ORDER).limit(page_size))
+    return [record.to_dict() for record in to_records(rows, columns)]
+
+
+def measure(engine, read, page_size: int, repeat: int):
+    best = float('inf')
+    for _ in range(repeat):
+        with Session(engine) as db:
+            started = time.perf_counter()
+            read(db, page_size)
+            best = min(best, time.perf_counter() - started)
+    with Session(engine) as db:
+        tracemalloc.start()
+        read(db, page_size)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return page_size / best, peak / 1024
+
+
+def main(args):
+    path = os.path.join(tempfile.mkdtemp(), 'read_path.db')
+    engine = create_engine(f"sqlite:///{path}")
+    populate(engine, args.rows)
+
+    print(f"{'page size':>9} {'path':<5} {'rows/s':>10} {'peak KiB':>9}")
+    for page_size in args.page_sizes:
+        for name, read in (('orm', orm_page), ('core', core_page)):
+            rate, peak = measure(engine, read, page_size, args.repeat)
+            print(f"{page_size:>9} {name:<5} {rate:>10.0f} {peak:>9.0f}")
+    os.remove(path)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--page-sizes', type=lambda value: [int(v) for v in value.split(',')],
+                        default=[100, 1000, 5000])
+    parser.add_argument('--repeat', type=int, default=5)
+    main(parser.parse_args())
@@ -1,8 +1,10 @@
+import asyncio
 import pytest
 from fastapi.testclient import TestClient
 from httpx import AsyncClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from app.database import Base
 from app.main import app
 from .test_config import TEST_DATABASE_URL
@@ -37,6 +39,16 @@ def test_db():
     finally:
         db.close()
 
+@pytest.fixture
+async def async_db(tmp_path):
+    """Async session on a fresh database for each test"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with AsyncSession(engine, expire_on_commit=False) as db:
+        yield db
+    await engine.dispose()
+
 @pytest.fixture(autouse=True)
 def setup_test_env():
     """Ensure test environment is properly configured"""
@@ -72,10 +84,23 @@ def sample_document(test_db):
 @pytest.fixture(scope="session", autouse=True)
 def setup_test_db():
     """Create all tables before running tests"""
-    from app.database import Base, engine
+    from app.database import Base, engine, async_engine
+
+    async def run_on_async_engine(operation):
+        async with async_engine.begin() as conn:
+            await conn.run_sync(operation)
+
     Base.metadata.create_all(bind=engine)
+    # Start clean even if an earlier run died before its teardown
+    asyncio.run(run_on_async_engine(Base.metadata.drop_all))
+    asyncio.run(run_on_async_engine(Base.metadata.create_all))
     yield
     Base.metadata.drop_all(bind=engine)
+    asyncio.run(run_on_async_engine(Base.metadata.drop_all))
+    # Pooled aiosqlite connections run on non-daemon threads until disposed
+    asyncio.run(async_engine.dispose())
+    if async_engine.url.database and os.path.exists(async_engine.url.database):
+        os.remove(async_engine.url.database)
 
 @pytest.fixture(autouse=True)
 def clear_cache():
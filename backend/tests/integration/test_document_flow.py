@@ -15,7 +15,7 @@ async def test_complete_document_flow(async_client: AsyncClient, test_db):
     response = await async_client.post("/generate-document", json=doc_data)
     assert response.status_code == 200
     data = response.json()["data"]
-    assert data["doc_id"] == "mock-doc-id"
+    assert data["doc_id"].startswith("mock-")
     
     # Verify document in database
     response = await async_client.get(f"/documents/{data['doc_id']}")
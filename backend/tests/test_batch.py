@@ -0,0 +1,130 @@
+import time
+from datetime import date
+import pytest
+from app.exceptions import DatabaseError, GoogleAPIError
+from app.services.document import DocumentService
+from app.services.google_docs import GoogleDocsService
+from .fakes import FakeBatch, FakeRequest
+
+def make_item(name="Batch User", template_type="receipt", amount=10.0):
+    return {
+        "name": name,
+        "date": str(date.today()),
+        "amount": amount,
+        "template_type": template_type
+    }
+
+@pytest.mark.asyncio
+async def test_batch_generation_reports_per_item_results(async_client):
+    """Valid items are generated and invalid ones reported without failing the batch"""
+    items = [
+        make_item("Batch One"),
+        make_item("Batch Two", template_type="invoice"),
+        make_item("X"),
+        make_item("Batch Four", template_type="invalid"),
+    ]
+
+    response = await async_client.post("/generate-documents/batch", json={"items": items})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["status"] == "partial"
+    data = body["data"]
+    assert data["succeeded"] == 2
+    assert data["failed"] == 2
+
+    results = data["items"]
+    assert [r["index"] for r in results] == [0, 1, 2, 3]
+    assert results[0]["status"] == "success"
+    assert results[0]["data"]["name"] == "Batch One"
+    assert isinstance(results[0]["data"]["id"], int)
+    assert results[1]["data"]["id"] == results[0]["data"]["id"] + 1
+    assert "INVOICE" in results[1]["data"]["content"]
+    assert results[2]["status"] == "error"
+    assert "at least 2 characters" in results[2]["error"]
+    assert results[3]["status"] == "error"
+    assert "Invalid template type" in results[3]["error"]
+
+@pytest.mark.asyncio
+async def test_batch_generation_rejects_empty_batch(async_client):
+    response = await async_client.post("/generate-documents/batch", json={"items": []})
+    assert response.status_code == 422
+
+@pytest.mark.asyncio
+async def test_google_docs_create_documents_uses_batches():
+    """Batch creation sends one batch request per step"""
+    service = GoogleDocsService()
+    batches = []
+
+    def new_batch(callback):
+        batches.append(FakeBatch(callback))
+        return batches[-1]
+
+    service.docs_service.new_batch_http_request.side_effect = new_batch
+    service.drive_service.new_batch_http_request.side_effect = new_batch
+    created = iter([{"documentId": "doc-1"}, {"documentId": "doc-2"}])
+    service.docs_service.documents.return_value.create.return_value.execute.side_effect = lambda: next(created)
+
+    results = await service.create_documents([("One", "first"), ("Two", "second")])
+
+    assert [r["doc_id"] for r in results] == ["doc-1", "doc-2"]
+    assert len(batches) == 3
+    assert all(len(batch.requests) == 2 for batch in batches)
+
+
+@pytest.mark.asyncio
+async def test_google_docs_batch_deletes_docs_that_fail_after_creation():
+    """Docs whose text insert or sharing fails are deleted instead of left behind"""
+    service = GoogleDocsService()
+    batches = []
+
+    def new_batch(callback):
+        batches.append(FakeBatch(callback))
+        return batches[-1]
+
+    service.docs_service.new_batch_http_request.side_effect = new_batch
+    service.drive_service.new_batch_http_request.side_effect = new_batch
+    created = iter([{"documentId": "doc-1"}, {"documentId": "doc-2"}, {"documentId": "doc-3"}])
+    service.docs_service.documents.return_value.create.return_value.execute.side_effect = lambda: next(created)
+    service.docs_service.documents.return_value.batchUpdate.side_effect = lambda documentId, body: FakeRequest(
+        error=RuntimeError("insert failed") if documentId == "doc-2" else None
+    )
+    service.drive_service.permissions.return_value.create.side_effect = lambda fileId, body: FakeRequest(
+        error=RuntimeError("share failed") if fileId == "doc-3" else None
+    )
+    files = service.drive_service.files.return_value
+
+    results = await service.create_documents([("One", "1"), ("Two", "2"), ("Three", "3")])
+
+    assert results[0]["doc_id"] == "doc-1"
+    assert isinstance(results[1], GoogleAPIError)
+    assert isinstance(results[2], GoogleAPIError)
+    assert [c.kwargs["fileId"] for c in files.delete.call_args_list] == ["doc-2", "doc-3"]
+    assert len(batches[-1].requests) == 2
+
+@pytest.mark.asyncio
+async def test_upload_mode_batch_stays_within_executor_capacity():
+    """A batch larger than the executor queue is throttled instead of rejected"""
+    service = GoogleDocsService()
+    service.create_mode = 'upload'
+    service.drive_service.files.return_value.create.return_value.execute.side_effect = (
+        lambda: time.sleep(0.002) or {"id": "uploaded"}
+    )
+
+    results = await service.create_documents([(f"Doc {i}", "body") for i in range(300)])
+
+    assert not [r for r in results if isinstance(r, Exception)]
+
+@pytest.mark.asyncio
+async def test_failed_batch_insert_deletes_created_google_docs(async_db, mocker):
+    """Google Docs created for a batch whose rows can't be saved are deleted again"""
+    service = DocumentService()
+    delete = mocker.patch.object(service, "delete_google_documents")
+    mocker.patch.object(async_db, "execute", side_effect=RuntimeError("disk full"))
+
+    with pytest.raises(DatabaseError):
+        await service.generate_documents_batch(async_db, [
+            {"name": "Orphan", "date": str(date.today()), "amount": 1.0, "template_type": "receipt"}
+        ])
+
+    (doc_ids,), _ = delete.call_args
+    assert len(doc_ids) == 1 and doc_ids[0].startswith("mock-")
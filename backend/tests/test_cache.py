@@ -2,6 +2,7 @@ import pytest
 from redis import Redis
 import json
 import asyncio
+import time
 from app.services.document import DocumentService
 from datetime import datetime
 from app.services.cache import RedisCache, cache_response
@@ -158,7 +159,9 @@ async def test_document_cache(document_service, test_db):
     result1 = await document_service.generate_document_content(**doc_data)
     result2 = await document_service.generate_document_content(**doc_data)
     
-    assert result1 == result2
+    # Rendering is deterministic; each call still gets its own Google Doc
+    assert result1["content"] == result2["content"]
+    assert result1["doc_id"] != result2["doc_id"]
 
 @pytest.mark.asyncio
 async def test_cache_expiration():
@@ -215,4 +218,304 @@ async def test_cache_behavior_in_testing():
 
     assert result1 == 1
     assert result2 == 1  # Should be cached
-    assert counter == 1  # Function should only be called once
\ No newline at end of file
+    assert counter == 1  # Function should only be called once
+
+
+@pytest.mark.asyncio
+async def test_namespace_bump_invalidates_cached_calls():
+    """Bumping a namespace makes every entry cached under it miss"""
+    from app.services.cache import get_shared_cache
+    calls = []
+
+    @cache_response(expire_time=60, namespace="test-namespace")
+    async def listing(page=1):
+        calls.append(page)
+        return {"page": page}
+
+    await listing()
+    await listing()
+    assert calls == [1]
+
+    await get_shared_cache().bump_namespace("test-namespace")
+    await listing()
+    assert calls == [1, 1]
+
+@pytest.mark.asyncio
+async def test_invalidate_document_bumps_document_lists():
+    """Invalidating one document also retires the cached document lists"""
+    from app.services.cache import DOCUMENTS_NAMESPACE
+    cache = RedisCache()
+    version = await cache.namespace_version(DOCUMENTS_NAMESPACE)
+    await cache.set_document("doc-1", {"id": 1})
+
+    await cache.invalidate_document("doc-1")
+
+    assert await cache.get_document("doc-1") is None
+    assert await cache.namespace_version(DOCUMENTS_NAMESPACE) == version + 1
+
+@pytest.mark.asyncio
+async def test_generate_document_refreshes_cached_list(async_client):
+    """A cached /documents page shows a newly generated document right away"""
+    before = (await async_client.get("/documents")).json()["data"]["total"]
+    assert (await async_client.get("/documents")).json()["data"]["total"] == before
+
+    response = await async_client.post("/generate-document", json={
+        "name": "Invalidation User",
+        "date": "2024-01-01",
+        "amount": 12.0,
+        "template_type": "receipt"
+    })
+    assert response.status_code == 200
+
+    after = (await async_client.get("/documents")).json()["data"]
+    assert after["total"] == before + 1
+    assert after["items"][0]["name"] == "Invalidation User"
+
+def test_local_cache_is_bounded_by_bytes():
+    """The local tier evicts least recently used entries once over its byte budget"""
+    from app.services.cache import LocalLRUCache
+    from app.services.monitoring import registry
+
+    def evictions():
+        return registry.get_sample_value("cache_tier_events_total", {"tier": "local", "event": "eviction"}) or 0
+
+    before = evictions()
+    local = LocalLRUCache(max_bytes=800, max_ttl=60)
+    for key in ("a", "b", "c"):
+        local.set(key, "x" * 150)
+    local.get("a")
+    local.set("d", "x" * 150)
+
+    assert local.bytes <= 800
+    assert local.get("b") is None
+    assert local.get("a") is not None
+    assert evictions() > before
+    # Values larger than the whole budget are never stored
+    local.set("huge", "x" * 1000)
+    assert local.get("huge") is None
+
+def test_local_cache_entries_expire():
+    from app.services.cache import LocalLRUCache
+    local = LocalLRUCache(max_bytes=10000, max_ttl=60)
+    local.set("short", "value", ttl=0.001)
+    time.sleep(0.002)
+    assert local.get("short") is None
+    assert local.bytes == 0
+
+@pytest.mark.asyncio
+async def test_local_tier_answers_before_backing_store():
+    """Hot keys are served in-process without reaching the shared tier"""
+    cache = RedisCache()
+    await cache.set("hot", "value")
+    cache._cache.clear()
+    assert await cache.get("hot") == "value"
+
+    await cache.delete("hot")
+    assert await cache.get("hot") is None
+
+@pytest.mark.asyncio
+async def test_invalidation_messages_evict_local_entries():
+    """Keys published by other workers are dropped from this worker's local tier"""
+    subscribed, publish, received = asyncio.Event(), asyncio.Event(), asyncio.Event()
+
+    class FakePubSub:
+        async def subscribe(self, channel):
+            self.channel = channel
+
+        async def listen(self):
+            subscribed.set()
+            await publish.wait()
+            yield {"type": "subscribe", "data": 1}
+            yield {"type": "message", "data": b"doc:1"}
+            received.set()
+            await asyncio.Event().wait()
+
+        async def aclose(self):
+            pass
+
+    class FakeRedis:
+        def pubsub(self):
+            return FakePubSub()
+
+    cache = RedisCache()
+    cache.redis = FakeRedis()
+    listener = asyncio.create_task(cache.listen_for_invalidations())
+    await asyncio.wait_for(subscribed.wait(), timeout=1)
+    cache.local.set("doc:1", "stale")
+    cache.local.set("doc:2", "fresh")
+    publish.set()
+
+    await asyncio.wait_for(received.wait(), timeout=1)
+    listener.cancel()
+    await asyncio.gather(listener, return_exceptions=True)
+
+    assert cache.local.get("doc:1") is None
+    assert cache.local.get("doc:2") == "fresh"
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_computation():
+    """Requests missing the same key together run the function once"""
+    calls = 0
+
+    @cache_response(expire_time=60)
+    async def slow_listing(page=1):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return {"page": page, "call": calls}
+
+    results = await asyncio.gather(*(slow_listing(page=1) for _ in range(5)))
+
+    assert calls == 1
+    assert all(result == {"page": 1, "call": 1} for result in results)
+
+@pytest.mark.asyncio
+async def test_lock_held_elsewhere_waits_for_other_worker(monkeypatch):
+    """While another worker holds the recompute lock, its result is used instead of recomputing"""
+    from app.services.cache import get_shared_cache
+    from app.services.cache_keys import build_cache_key
+    calls = 0
+
+    @cache_response(expire_time=60)
+    async def listing():
+        nonlocal calls
+        calls += 1
+        return {"from": "here"}
+
+    async def lock_held(key, timeout_ms):
+        return None
+
+    monkeypatch.setattr(get_shared_cache(), "acquire_lock", lock_held)
+
+    async def other_worker():
+        await asyncio.sleep(0.1)
+        IN_MEMORY_CACHE[build_cache_key(listing, (), {})] = {
+            "value": {"from": "other worker"},
+            "fresh_until": time.time() + 60,
+            "stale_until": time.time() + 60
+        }
+
+    writer = asyncio.create_task(other_worker())
+    assert await listing() == {"from": "other worker"}
+    await writer
+    assert calls == 0
+
+@pytest.mark.asyncio
+async def test_lock_wait_gives_up_and_computes(monkeypatch):
+    """A lock whose holder never delivers only delays the caller briefly"""
+    from app.services import cache_decorator
+    from app.services.cache import get_shared_cache
+
+    @cache_response(expire_time=60)
+    async def listing():
+        return {"from": "here"}
+
+    async def lock_held(key, timeout_ms):
+        return None
+
+    monkeypatch.setattr(get_shared_cache(), "acquire_lock", lock_held)
+    monkeypatch.setattr(cache_decorator, "CACHE_LOCK_WAIT_MS", 100)
+
+    assert await listing() == {"from": "here"}
+
+def age_entries(seconds):
+    """Move every cached entry's soft expiry back by this many seconds"""
+    for entry in IN_MEMORY_CACHE.values():
+        entry["fresh_until"] -= seconds
+
+async def wait_for_refreshes():
+    from app.services.cache_decorator import _refreshing
+    await asyncio.gather(*list(_refreshing.values()))
+
+@pytest.mark.asyncio
+async def test_stale_entry_served_while_refreshing():
+    """Past its soft TTL an entry is returned at once and recomputed in the background"""
+    from app.services.monitoring import registry
+    calls = 0
+
+    @cache_response(expire_time=60, stale_ttl=300)
+    async def stale_listing():
+        nonlocal calls
+        calls += 1
+        return {"call": calls}
+
+    assert await stale_listing() == {"call": 1}
+    age_entries(61)
+
+    assert await stale_listing() == {"call": 1}
+    await wait_for_refreshes()
+    assert calls == 2
+    assert await stale_listing() == {"call": 2}
+
+    function = f"{__name__}.test_stale_entry_served_while_refreshing.<locals>.stale_listing"
+    assert registry.get_sample_value("cache_stale_serves_total", {"function": function}) == 1
+    assert registry.get_sample_value("cache_refresh_duration_seconds_count", {"function": function}) == 1
+
+@pytest.mark.asyncio
+async def test_hot_entry_refreshed_ahead_of_expiry():
+    """An entry read close to expiry is refreshed before anyone sees it stale"""
+    calls = 0
+
+    @cache_response(expire_time=100, refresh_ahead=0.2)
+    async def hot_listing():
+        nonlocal calls
+        calls += 1
+        return {"call": calls}
+
+    await hot_listing()
+    age_entries(50)
+    await hot_listing()
+    await wait_for_refreshes()
+    assert calls == 1
+
+    age_entries(40)
+    assert await hot_listing() == {"call": 1}
+    await wait_for_refreshes()
+    assert calls == 2
+
+@pytest.mark.asyncio
+async def test_background_refresh_uses_its_own_session(async_db):
+    """The request's session is closed by the time a refresh runs, so it gets a new one"""
+    sessions = []
+
+    @cache_response(expire_time=60, stale_ttl=300)
+    async def listing(db):
+        sessions.append(db)
+        return {"ok": True}
+
+    await listing(async_db)
+    age_entries(61)
+    await listing(async_db)
+    await wait_for_refreshes()
+
+    assert len(sessions) == 2
+    assert sessions[1] is not async_db
+    assert sessions[1].bind is async_db.bind
+
+
+@pytest.mark.asyncio
+async def test_cancelled_first_caller_leaves_coalesced_waiter_a_session(async_db):
+    """The shared computation survives the first caller and never uses that caller's session"""
+    sessions = []
+    release = asyncio.Event()
+
+    @cache_response(expire_time=60)
+    async def listing(db):
+        sessions.append(db)
+        await release.wait()
+        return {"ok": True}
+
+    first = asyncio.create_task(listing(async_db))
+    while not sessions:
+        await asyncio.sleep(0)
+    second = asyncio.create_task(listing(async_db))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+
+    assert await second == {"ok": True}
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    assert len(sessions) == 1
+    assert sessions[0] is not async_db
+    assert sessions[0].bind is async_db.bind
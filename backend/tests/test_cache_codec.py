@@ -0,0 +1,58 @@
+import json
+import pytest
+from app.services import cache_codec
+from app.services.cache_codec import CacheCodec
+
+PAGE = {
+    "items": [
+        {"id": i, "name": f"User {i}", "amount": 10.5 + i, "content": "RECEIPT\n" * 40,
+         "created_at": "2024-01-01T00:00:00"}
+        for i in range(20)
+    ],
+    "total": 20,
+    "next_cursor": None
+}
+
+def test_small_values_are_not_compressed():
+    codec = CacheCodec("json", "zlib", min_compress_bytes=1024)
+    encoded = codec.encode({"page": 1})
+    assert encoded[0] == cache_codec.SERIALIZERS["json"]
+    assert codec.decode(encoded) == {"page": 1}
+
+def test_large_values_are_compressed():
+    codec = CacheCodec("json", "zlib", min_compress_bytes=1024)
+    encoded = codec.encode(PAGE)
+    assert encoded[0] == cache_codec.SERIALIZERS["json"] | cache_codec.COMPRESSIONS["zlib"]
+    assert len(encoded) < len(json.dumps(PAGE)) / 5
+    assert codec.decode(encoded) == PAGE
+
+def test_values_decode_by_their_own_tag():
+    """Switching codecs keeps entries written under the old one readable"""
+    written = CacheCodec("json", "zlib", min_compress_bytes=0).encode(PAGE)
+    assert CacheCodec("json", "none").decode(written) == PAGE
+
+def test_legacy_json_entries_still_decode():
+    codec = CacheCodec()
+    assert codec.decode(json.dumps(PAGE)) == PAGE
+    assert codec.decode(json.dumps(PAGE).encode()) == PAGE
+    assert codec.decode(b'"text"') == "text"
+
+def test_missing_optional_codecs_fall_back(monkeypatch):
+    monkeypatch.setattr(cache_codec, "msgpack", None)
+    monkeypatch.setattr(cache_codec, "zstandard", None)
+    codec = CacheCodec("msgpack", "zstd")
+    assert (codec.serializer, codec.compression) == ("json", "zlib")
+    with pytest.raises(ValueError):
+        codec.decode(bytes([cache_codec.SERIALIZERS["json"] | cache_codec.COMPRESSIONS["zstd"]]) + b"x")
+
+def test_unknown_codec_rejected():
+    with pytest.raises(ValueError):
+        CacheCodec("pickle", "none")
+
+@pytest.mark.skipif(cache_codec.msgpack is None or cache_codec.zstandard is None,
+                    reason="msgpack and zstandard are optional")
+def test_msgpack_zstd_round_trip():
+    codec = CacheCodec("msgpack", "zstd", min_compress_bytes=0)
+    encoded = codec.encode(PAGE)
+    assert encoded[0] == cache_codec.SERIALIZERS["msgpack"] | cache_codec.COMPRESSIONS["zstd"]
+    assert codec.decode(encoded) == PAGE
@@ -0,0 +1,56 @@
+import pytest
+from sqlalchemy.orm import Session
+from app.config import CACHE_KEY_VERSION
+from app.services.cache_decorator import IN_MEMORY_CACHE, cache_response
+from app.services.cache_keys import build_cache_key
+from app.services.document import DocumentService
+from app.services.monitoring import registry
+
+get_documents = DocumentService.get_documents.__wrapped__
+
+def test_key_ignores_self_and_session():
+    """Service instances and sessions differ per request and must not split the cache"""
+    first = build_cache_key(get_documents, (DocumentService(), Session()), {"page": 2})
+    second = build_cache_key(get_documents, (DocumentService(), Session()), {"page": 2})
+    assert first == second
+    assert "Session" not in first and "DocumentService object" not in first
+
+def test_key_normalizes_arguments():
+    """Positional, keyword, defaulted and None-valued spellings of a call share a key"""
+    service, db = DocumentService(), Session()
+    plain = build_cache_key(get_documents, (service, db), {})
+    assert build_cache_key(get_documents, (service, db, 1, 10), {"name": None}) == plain
+    assert build_cache_key(get_documents, (service,), {"db": db, "page_size": 10}) == plain
+    assert build_cache_key(get_documents, (service, db), {"name": "Ann", "page": 2}) == \
+        build_cache_key(get_documents, (service, db, 2), {"name": "Ann"})
+    assert build_cache_key(get_documents, (service, db), {"page": 2}) != plain
+
+def test_key_is_versioned_and_bounded():
+    key = build_cache_key(get_documents, (DocumentService(), Session()), {"q": "x" * 500})
+    assert key.startswith(f"cache:v{CACHE_KEY_VERSION}:app.services.document.DocumentService.get_documents:")
+    assert len(key) < 200
+
+@pytest.mark.asyncio
+async def test_decorated_method_hits_across_instances():
+    """A new service instance per request still hits the cache, and hits are counted"""
+    IN_MEMORY_CACHE.clear()
+    calls = []
+
+    class Service:
+        @cache_response(expire_time=60)
+        async def listing(self, db, page=1):
+            calls.append(page)
+            return {"page": page}
+
+    function = f"{__name__}.test_decorated_method_hits_across_instances.<locals>.Service.listing"
+
+    def lookups(result):
+        return registry.get_sample_value("cache_lookups_total", {"function": function, "result": result}) or 0
+
+    await Service().listing(Session(), page=1)
+    await Service().listing(Session(), 1)
+    await Service().listing(Session(), page=2)
+
+    assert calls == [1, 2]
+    assert lookups("hit") == 1
+    assert lookups("miss") == 2
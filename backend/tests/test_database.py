@@ -1,6 +1,8 @@
+import asyncio
 import pytest
 from sqlalchemy import create_engine, inspect
 from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
 from app.database import Base, get_db, init_db, SessionLocal
 from app.config import TESTING
 
@@ -53,4 +55,112 @@ def test_db_session_cleanup():
     
     # Test that session is closed by trying to execute a query
     with pytest.raises(Exception):
-        db.execute("SELECT 1")
\ No newline at end of file
+        db.execute("SELECT 1")
+
+
+def test_engine_options_configure_pool(mocker):
+    """File and server databases get the sized, pre-pinged, recycled pool"""
+    from app import database
+    mocker.patch.object(database, "DB_PGBOUNCER", False)
+    options = database.engine_options("postgresql://u:p@db/saam")
+    assert options["poolclass"] is database.TimedQueuePool
+    assert options["pool_size"] == database.DB_POOL_SIZE
+    assert options["max_overflow"] == database.DB_MAX_OVERFLOW
+    assert options["pool_pre_ping"] is database.DB_POOL_PRE_PING
+    assert "connect_args" not in options
+    assert database.engine_options("sqlite+aiosqlite:///:memory:", is_async=True) == {"poolclass": StaticPool}
+
+def test_pgbouncer_mode_disables_statement_caches(mocker):
+    """Transaction pooling needs asyncpg to forget prepared statements"""
+    from app import database
+    mocker.patch.object(database, "DB_PGBOUNCER", True)
+    connect_args = database.engine_options("postgresql+asyncpg://u:p@db/saam", is_async=True)["connect_args"]
+    assert connect_args["statement_cache_size"] == 0
+    assert connect_args["prepared_statement_cache_size"] == 0
+    name_func = connect_args["prepared_statement_name_func"]
+    assert name_func() != name_func()
+    assert database.engine_options("postgresql://u:p@db/saam")["connect_args"] == {}
+
+def test_pool_metrics(tmp_path, mocker):
+    """Checkouts report wait time, in-use and overflow connections, and timeouts"""
+    from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+    from app import database
+    from app.services.monitoring import registry
+    mocker.patch.object(database, "DB_POOL_SIZE", 1)
+    mocker.patch.object(database, "DB_MAX_OVERFLOW", 1)
+    mocker.patch.object(database, "DB_POOL_TIMEOUT", 0.01)
+    url = f"sqlite:///{tmp_path / 'pool.db'}"
+    engine = create_engine(url, **database.engine_options(url))
+    database.instrument_pool(engine, "test")
+
+    def sample(name):
+        return registry.get_sample_value(name, {"engine": "test"})
+
+    connections = [engine.connect(), engine.connect()]
+    assert sample("db_pool_connections_in_use") == 2
+    assert sample("db_pool_overflow_connections") == 1
+    assert sample("db_pool_checkout_wait_seconds_count") == 2
+
+    with pytest.raises(PoolTimeoutError):
+        engine.connect()
+    assert sample("db_pool_checkout_timeouts_total") == 1
+
+    for connection in connections:
+        connection.close()
+    assert sample("db_pool_connections_in_use") == 0
+    assert sample("db_pool_overflow_connections") == 0
+    engine.dispose()
+
+@pytest.fixture
+def replicas(tmp_path, monkeypatch):
+    """Two replica engines, the first unreachable, routed instead of the configured ones"""
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from app import database
+    broken = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'replica.db'}")
+    healthy = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}")
+    router = database.ReplicaRouter([broken, healthy], retry_after=60)
+    monkeypatch.setattr(database, "replica_router", router)
+    yield broken, healthy
+    for replica in (broken, healthy):
+        asyncio.run(replica.dispose())
+
+def test_replica_router_round_robin():
+    """Each read starts from the next replica in turn"""
+    from app.database import ReplicaRouter
+    router = ReplicaRouter(["a", "b", "c"])
+    assert [router.candidates()[0] for _ in range(4)] == ["a", "b", "c", "a"]
+    router.mark_down("b")
+    assert router.candidates() == ["c", "a"]
+
+@pytest.mark.asyncio
+async def test_read_session_fails_over_to_healthy_replica(replicas):
+    """An unreachable replica is marked down and the next one serves the read"""
+    from app import database
+    broken, healthy = replicas
+
+    db = await database.open_read_session()
+    async with db:
+        assert db.bind is healthy
+    # The broken replica stays out of rotation until its retry time
+    assert database.replica_router.candidates() == [healthy]
+
+@pytest.mark.asyncio
+async def test_read_session_uses_primary_after_write(replicas):
+    """A client that just wrote reads from the primary"""
+    from app import database
+    db = await database.open_read_session(recent_write=True)
+    async with db:
+        assert db.bind is database.async_engine
+
+@pytest.mark.asyncio
+async def test_generate_document_sets_read_your_writes_cookie(async_client, replicas):
+    """Writes mark the client so its next reads skip the replicas"""
+    from app.database import READ_YOUR_WRITES_COOKIE
+    response = await async_client.post("/generate-document", json={
+        "name": "Replica User",
+        "date": "2024-01-01",
+        "amount": 10.0,
+        "template_type": "receipt"
+    })
+    assert response.status_code == 200
+    assert READ_YOUR_WRITES_COOKIE in response.cookies
@@ -1,11 +1,12 @@
 import pytest
 from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.services.document import DocumentService
 from app.models import GeneratedDocument
 from app.exceptions import ValidationError, GoogleAPIError, DatabaseError, TemplateError
 
 @pytest.mark.asyncio
-async def test_document_pagination(document_service, test_db):
+async def test_document_pagination(document_service, async_db):
     """Test document pagination"""
     # Create 15 test documents
     for i in range(15):
@@ -16,17 +17,17 @@ async def test_document_pagination(document_service, test_db):
             content=f"Test content {i}",
             doc_id=f"mock-{i}"
         )
-        test_db.add(doc)
-    test_db.commit()
+        async_db.add(doc)
+    await async_db.commit()
 
     # Test first page
-    result = await document_service.get_documents(test_db, page=1, page_size=10)
+    result = await document_service.get_documents(async_db, page=1, page_size=10)
     assert len(result["items"]) == 10
     assert result["total"] == 15
     assert result["pages"] == 2
 
     # Test second page
-    result = await document_service.get_documents(test_db, page=2, page_size=10)
+    result = await document_service.get_documents(async_db, page=2, page_size=10)
     assert len(result["items"]) == 5
 
 @pytest.mark.asyncio
@@ -106,16 +107,17 @@ async def test_document_generation_with_google_api_error(document_service, mocke
         )
 
 @pytest.mark.asyncio
-async def test_document_service_database_errors(document_service, test_db, mocker):
+async def test_document_service_database_errors(document_service, async_db, mocker):
     """Test database error handling"""
+    # Cached listings run on their own session, so fail every session's queries
     mocker.patch.object(
-        test_db,
-        'query',
+        AsyncSession,
+        'execute',
         side_effect=DatabaseError("Database connection error")
     )
     
     with pytest.raises(DatabaseError, match="Error retrieving documents"):
-        await document_service.get_documents(test_db)
+        await document_service.get_documents(async_db)
 
 @pytest.mark.asyncio
 async def test_document_service_google_api_errors(document_service, mocker):
@@ -157,13 +159,13 @@ async def test_template_error_handling(document_service):
         )
 
 @pytest.mark.asyncio
-async def test_invalid_page_parameters(document_service, test_db):
+async def test_invalid_page_parameters(document_service, async_db):
     """Test invalid pagination parameters"""
     with pytest.raises(ValidationError, match="Page number must be positive"):
-        await document_service.get_documents(test_db, page=0)
+        await document_service.get_documents(async_db, page=0)
     
     with pytest.raises(ValidationError, match="Page size must be between 1 and 100"):
-        await document_service.get_documents(test_db, page_size=101)
+        await document_service.get_documents(async_db, page_size=101)
 
 @pytest.mark.asyncio
 async def test_document_generation(document_service):
@@ -175,9 +177,110 @@ async def test_document_generation(document_service):
         template_type="receipt"
     )
     
-    assert result["doc_id"] == "mock-doc-id"
-    assert result["doc_url"] == "https://docs.google.com/document/d/mock-doc-id/edit"
+    assert result["doc_id"].startswith("mock-")
+    assert result["doc_url"] == f"https://docs.google.com/document/d/{result['doc_id']}/edit"
     assert "content" in result
     assert result["name"] == "Test User"
     assert result["date"] == "2024-01-01"
-    assert result["amount"] == 100.50
\ No newline at end of file
+    assert result["amount"] == 100.50
+
+
+@pytest.mark.asyncio
+async def test_document_cursor_pagination(document_service, async_db):
+    """Test walking all documents with next_cursor"""
+    created_at = datetime(2024, 1, 1, 12, 0, 0)
+    for i in range(25):
+        async_db.add(GeneratedDocument(
+            name=f"Cursor User {i}",
+            date=created_at.date(),
+            amount=10 + i,
+            content=f"Cursor content {i}",
+            doc_id=f"cursor-{i}",
+            # Every row shares a timestamp so the id tie-breaker is exercised
+            created_at=created_at
+        ))
+    await async_db.commit()
+
+    seen = []
+    result = await document_service.get_documents(async_db, page_size=10)
+    seen.extend(doc.id for doc in result["items"])
+    while result["next_cursor"]:
+        result = await document_service.get_documents(async_db, page_size=10, cursor=result["next_cursor"])
+        assert result["page"] is None
+        # Cursor pages don't pay for a count
+        assert result["total"] is None and result["pages"] is None
+        seen.extend(doc.id for doc in result["items"])
+
+    assert seen == list(range(25, 0, -1))
+    assert len(result["items"]) == 5
+
+@pytest.mark.asyncio
+async def test_invalid_cursor(document_service, async_db):
+    """Test that a malformed cursor is rejected"""
+    with pytest.raises(ValidationError, match="Invalid cursor"):
+        await document_service.get_documents(async_db, cursor="not-a-cursor")
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("strategy", ["exact", "window", "estimated"])
+async def test_document_count_strategies(document_service, async_db, mocker, strategy):
+    """Test that every count strategy agrees on SQLite"""
+    mocker.patch("app.services.document.DOCUMENT_COUNT_STRATEGY", strategy)
+    for i in range(3):
+        async_db.add(GeneratedDocument(
+            name=f"Count {strategy} {i}",
+            date=datetime.now().date(),
+            amount=10 + i,
+            content="content",
+            doc_id=f"count-{strategy}-{i}"
+        ))
+    await async_db.commit()
+    expected = 3
+
+    result = await document_service.get_documents(async_db, page=1, page_size=2)
+    assert result["total"] == expected
+    # No planner statistics on SQLite, so "estimated" falls back to an exact count
+    assert result["total_exact"] is True
+
+    result = await document_service.get_documents(async_db, page=1000, page_size=2)
+    assert result["items"] == []
+    assert result["total"] == expected
+
+@pytest.mark.asyncio
+async def test_document_count_cached(document_service, async_db, mocker):
+    """Test that cached counts are reused per filter signature and flagged inexact"""
+    from app.services.pagination import clear_count_cache
+    mocker.patch("app.services.document.DOCUMENT_COUNT_STRATEGY", "cached")
+    clear_count_cache()
+    async_db.add(GeneratedDocument(
+        name="Cached Count", date=datetime.now().date(), amount=1, content="c", doc_id="cached-1"
+    ))
+    await async_db.commit()
+
+    first = await document_service.get_documents(async_db, page_size=5, name="Cached Count")
+    assert (first["total"], first["total_exact"]) == (1, True)
+
+    async_db.add(GeneratedDocument(
+        name="Cached Count", date=datetime.now().date(), amount=2, content="c", doc_id="cached-2"
+    ))
+    await async_db.commit()
+    second = await document_service.get_documents(async_db, page_size=10, name="Cached Count")
+    assert (second["total"], second["total_exact"]) == (1, False)
+    assert len(second["items"]) == 2
+    clear_count_cache()
+
+@pytest.mark.asyncio
+async def test_get_documents_selects_requested_columns(document_service, async_db):
+    """Test that content is not read when it isn't requested"""
+    async_db.add(GeneratedDocument(
+        name="Deferred", date=datetime.now().date(), amount=1, content="x" * 1000, doc_id="deferred-1"
+    ))
+    await async_db.commit()
+
+    result = await document_service.get_documents(async_db, page_size=100, fields=["name", "amount"])
+    document = result["items"][0]
+    # id and created_at always come along for ordering and cursors
+    assert document._fields == ("id", "name", "amount", "created_at")
+    assert document.to_dict(["name", "amount"]).keys() == {"name", "amount"}
+
+    with pytest.raises(ValidationError, match="Unknown fields"):
+        await document_service.get_documents(async_db, fields=["secret"])
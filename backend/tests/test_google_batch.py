@@ -0,0 +1,87 @@
+import asyncio
+from unittest.mock import MagicMock
+import pytest
+from app.services.google_batch import DriveBatcher, execute_batch
+from app.services.google_drive import GoogleDriveService
+from .fakes import FakeBatch, FakeRequest
+
+def make_service(batches):
+    service = MagicMock()
+
+    def new_batch(callback):
+        batches.append(FakeBatch(callback))
+        return batches[-1]
+
+    service.new_batch_http_request.side_effect = new_batch
+    service.permissions.return_value.create.side_effect = (
+        lambda fileId, body, **kwargs: FakeRequest(error=ValueError("denied")) if fileId == "bad"
+        else FakeRequest({"id": f"perm-{fileId}"})
+    )
+    service.files.return_value.delete.side_effect = lambda fileId: FakeRequest({})
+    return service
+
+def test_execute_batch_splits_at_max_size():
+    batches = []
+    service = make_service(batches)
+
+    results = execute_batch(service, [FakeRequest(i) for i in range(5)], max_size=2)
+
+    assert [response for response, _ in results] == [0, 1, 2, 3, 4]
+    assert [len(batch.requests) for batch in batches] == [2, 2, 1]
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_batch():
+    """Calls arriving within the window go out as one batch request"""
+    batches = []
+    batcher = DriveBatcher(make_service(batches), window=0.05)
+
+    results = await asyncio.gather(
+        batcher.create_permission("a", {"role": "reader", "type": "anyone"}),
+        batcher.create_permission("b", {"role": "reader", "type": "anyone"}),
+        batcher.delete_file("c"),
+    )
+
+    assert results == [{"id": "perm-a"}, {"id": "perm-b"}, {}]
+    assert len(batches) == 1
+    assert len(batches[0].requests) == 3
+
+@pytest.mark.asyncio
+async def test_batch_errors_reach_only_their_caller():
+    batches = []
+    batcher = DriveBatcher(make_service(batches), window=0.05)
+
+    good, bad = await asyncio.gather(
+        batcher.create_permission("good", {}),
+        batcher.create_permission("bad", {}),
+        return_exceptions=True
+    )
+
+    assert good == {"id": "perm-good"}
+    assert isinstance(bad, ValueError)
+
+@pytest.mark.asyncio
+async def test_full_batch_flushes_without_waiting():
+    batches = []
+    batcher = DriveBatcher(make_service(batches), window=10, max_size=2)
+
+    results = await asyncio.wait_for(
+        asyncio.gather(batcher.delete_file("a"), batcher.delete_file("b")),
+        timeout=1
+    )
+
+    assert results == [{}, {}]
+
+@pytest.mark.asyncio
+async def test_drive_upload_uses_batcher_when_enabled(mocker):
+    mocker.patch('app.services.google_drive.GOOGLE_BATCH_ENABLED', True)
+    batches = []
+    service = GoogleDriveService()
+    service.service.new_batch_http_request.side_effect = make_service(batches).new_batch_http_request.side_effect
+    service.service.files.return_value.create.return_value.execute.return_value = {
+        'id': 'file-1', 'webViewLink': 'https://drive.google.com/file-1'
+    }
+
+    result = await service.upload_document("content", "doc.txt")
+
+    assert result['doc_id'] == 'file-1'
+    assert len(batches) == 1
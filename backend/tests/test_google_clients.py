@@ -0,0 +1,61 @@
+import threading
+from unittest.mock import MagicMock
+import pytest
+from app.services import google_clients
+from app.services.google_clients import (
+    ThreadLocalClient,
+    get_discovery_document,
+    get_service_account_credentials,
+    reset_google_clients,
+)
+
+@pytest.fixture(autouse=True)
+def reset_clients():
+    reset_google_clients()
+    yield
+    reset_google_clients()
+
+def test_discovery_document_loaded_once(mocker):
+    """Static discovery documents are parsed once per process"""
+    spy = mocker.patch.object(google_clients, 'get_static_doc', wraps=google_clients.get_static_doc)
+
+    first = get_discovery_document('drive', 'v3')
+    second = get_discovery_document('drive', 'v3')
+
+    assert first is second
+    assert first['name'] == 'drive'
+    assert spy.call_count == 1
+
+def test_credentials_cached_per_scope(mocker):
+    """The service-account file is read once for each scope set"""
+    from_file = mocker.patch(
+        'google.oauth2.service_account.Credentials.from_service_account_file',
+        side_effect=lambda *args, **kwargs: MagicMock()
+    )
+
+    a = get_service_account_credentials('creds.json')
+    b = get_service_account_credentials('creds.json')
+    c = get_service_account_credentials('creds.json', ['scope'])
+
+    assert a is b
+    assert a is not c
+    assert from_file.call_count == 2
+
+def test_thread_local_client_built_once_per_thread(mocker):
+    """Each thread builds its own client once and reuses it"""
+    build = mocker.patch.object(
+        google_clients, 'build_from_document', side_effect=lambda *args, **kwargs: MagicMock()
+    )
+    creds = MagicMock()
+    proxy = ThreadLocalClient('drive', 'v3', creds)
+
+    main_files = proxy.files
+    assert proxy.files is main_files
+
+    seen = []
+    thread = threading.Thread(target=lambda: seen.append(proxy.files))
+    thread.start()
+    thread.join()
+
+    assert seen[0] is not main_files
+    assert build.call_count == 2
@@ -0,0 +1,59 @@
+import asyncio
+import threading
+import time
+import pytest
+from app.services.google_executor import GoogleExecutor, run_google_call, get_google_executor
+from app.exceptions import GoogleAPIError
+
+@pytest.mark.asyncio
+async def test_google_call_runs_off_event_loop():
+    """Blocking Google calls should not freeze the event loop"""
+    executor = GoogleExecutor(max_workers=2, max_queue=2)
+    loop_thread = threading.get_ident()
+    ticks = 0
+
+    def slow_call():
+        time.sleep(0.2)
+        return threading.get_ident()
+
+    async def ticker():
+        nonlocal ticks
+        for _ in range(5):
+            await asyncio.sleep(0.02)
+            ticks += 1
+
+    worker_thread, _ = await asyncio.gather(executor.run(slow_call), ticker())
+
+    assert worker_thread != loop_thread
+    assert ticks == 5
+    executor.shutdown()
+
+@pytest.mark.asyncio
+async def test_google_executor_rejects_when_queue_full():
+    """Calls beyond workers + queue size are rejected"""
+    executor = GoogleExecutor(max_workers=1, max_queue=1)
+    release = threading.Event()
+
+    running = [asyncio.ensure_future(executor.run(release.wait)) for _ in range(2)]
+    await asyncio.sleep(0.05)
+    assert executor.active == 1
+    assert executor.queue_depth == 1
+
+    with pytest.raises(GoogleAPIError, match="overloaded"):
+        await executor.run(lambda: None)
+
+    release.set()
+    await asyncio.gather(*running)
+    assert executor.active == 0
+    assert executor.queue_depth == 0
+    executor.shutdown()
+
+@pytest.mark.asyncio
+async def test_google_executor_propagates_errors():
+    """Exceptions raised by the call reach the caller"""
+    def failing_call():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError, match="boom"):
+        await run_google_call(failing_call)
+    assert get_google_executor().queue_depth == 0
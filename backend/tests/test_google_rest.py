@@ -0,0 +1,76 @@
+import json
+import httpx
+import pytest
+from app.services.google_rest import GoogleRestClient
+from app.services.google_docs import GoogleDocsService
+from app.services.google_drive import GoogleDriveService
+from app.exceptions import GoogleAPIError
+
+class FakeCredentials:
+    """Always-valid credentials stand-in"""
+    valid = True
+    token = "test-token"
+
+def make_client(handler):
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return GoogleRestClient(FakeCredentials(), http_client=http_client)
+
+@pytest.mark.asyncio
+async def test_rest_create_document_flow():
+    """The REST backend issues create, batchUpdate and permissions calls"""
+    calls = []
+
+    def handler(request: httpx.Request):
+        calls.append((request.method, request.url.path))
+        assert request.headers["Authorization"] == "Bearer test-token"
+        if request.url.path == "/v1/documents":
+            assert json.loads(request.content) == {"title": "Test"}
+            return httpx.Response(200, json={"documentId": "rest-doc"})
+        return httpx.Response(200, json={})
+
+    service = GoogleDocsService()
+    service.rest_client = make_client(handler)
+
+    result = await service.create_document("Test", "Body")
+
+    assert result == {"doc_id": "rest-doc", "doc_url": "https://docs.google.com/document/d/rest-doc/edit"}
+    assert calls == [
+        ("POST", "/v1/documents"),
+        ("POST", "/v1/documents/rest-doc:batchUpdate"),
+        ("POST", "/drive/v3/files/rest-doc/permissions"),
+    ]
+
+@pytest.mark.asyncio
+async def test_rest_upload_uses_multipart_body():
+    """Drive uploads send metadata and media in one multipart request"""
+    seen = {}
+
+    def handler(request: httpx.Request):
+        if request.url.path == "/upload/drive/v3/files":
+            seen["params"] = dict(request.url.params)
+            seen["content_type"] = request.headers["Content-Type"]
+            seen["body"] = request.content
+            return httpx.Response(200, json={"id": "file-1", "webViewLink": "https://drive.google.com/file-1"})
+        return httpx.Response(200, json={"id": "perm-1"})
+
+    service = GoogleDriveService()
+    service.rest_client = make_client(handler)
+
+    result = await service.upload_document("Hello", "hello.txt")
+
+    assert result == {"doc_id": "file-1", "doc_url": "https://drive.google.com/file-1"}
+    assert seen["params"]["uploadType"] == "multipart"
+    assert seen["content_type"].startswith("multipart/related; boundary=")
+    assert b'"name": "hello.txt"' in seen["body"]
+    assert b"Content-Type: text/plain\r\n\r\nHello" in seen["body"]
+
+@pytest.mark.asyncio
+async def test_rest_error_status_raises_google_api_error():
+    """HTTP errors from Google surface as GoogleAPIError"""
+    def handler(request: httpx.Request):
+        return httpx.Response(403, json={"error": {"message": "forbidden"}})
+
+    client = make_client(handler)
+
+    with pytest.raises(GoogleAPIError, match="status 403"):
+        await client.delete_file("file-1")
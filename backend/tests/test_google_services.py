@@ -151,11 +151,8 @@ async def test_document_service_generate_content(document_service):
     assert 'doc_id' in result
 
 @pytest.mark.asyncio
-async def test_document_service_get_documents(document_service, test_db):
+async def test_document_service_get_documents(document_service, async_db):
     """Test getting documents with filters"""
-    # Clear existing documents
-    test_db.query(GeneratedDocument).delete()
-    test_db.commit()
     
     # Create test documents
     docs = [
@@ -167,10 +164,10 @@ async def test_document_service_get_documents(document_service, test_db):
             doc_id=f"mock-{i}"
         ) for i in range(2)
     ]
-    test_db.add_all(docs)
-    test_db.commit()
+    async_db.add_all(docs)
+    await async_db.commit()
 
-    result = await document_service.get_documents(test_db)
+    result = await document_service.get_documents(async_db)
     assert result['total'] == 2
     assert len(result['items']) == 2
 
@@ -197,4 +194,39 @@ async def test_google_docs_service_error_handling():
     service.docs_service.documents.return_value.create.side_effect = GoogleAPIError("API connection failed")
     
     with pytest.raises(GoogleAPIError, match="API connection failed"):
-        await service.create_document("Test content")
\ No newline at end of file
+        await service.create_document("Test content")
+
+
+@pytest.mark.asyncio
+async def test_google_docs_upload_mode_single_create_call():
+    """Upload mode creates the Doc with one converting Drive upload"""
+    service = GoogleDocsService()
+    service.create_mode = 'upload'
+    service.drive_service.files.return_value.create.return_value.execute.return_value = {'id': 'uploaded-doc'}
+
+    result = await service.create_document("Upload Test", "Body text")
+
+    assert result == {
+        'doc_id': 'uploaded-doc',
+        'doc_url': 'https://docs.google.com/document/d/uploaded-doc/edit'
+    }
+    create_kwargs = service.drive_service.files.return_value.create.call_args.kwargs
+    assert create_kwargs['body']['mimeType'] == 'application/vnd.google-apps.document'
+    assert create_kwargs['media_body'].mimetype() == 'text/plain'
+    service.docs_service.documents.return_value.create.assert_not_called()
+    service.drive_service.permissions.return_value.create.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_google_docs_upload_mode_shares_via_folder(mocker):
+    """A shared parent folder replaces the per-file permission call"""
+    mocker.patch('app.services.google_docs.GOOGLE_DRIVE_FOLDER_ID', 'shared-folder')
+    mocker.patch('app.services.google_docs.GOOGLE_SHARE_VIA_FOLDER', True)
+    service = GoogleDocsService()
+    service.create_mode = 'upload'
+    service.drive_service.files.return_value.create.return_value.execute.return_value = {'id': 'uploaded-doc'}
+
+    await service.create_document("Upload Test", "Body text")
+
+    create_kwargs = service.drive_service.files.return_value.create.call_args.kwargs
+    assert create_kwargs['body']['parents'] == ['shared-folder']
+    service.drive_service.permissions.return_value.create.assert_not_called()
@@ -0,0 +1,77 @@
+import time
+from datetime import datetime, timedelta
+import pytest
+from app.services.google_tokens import TokenCache, FileTokenStore, CachedCredentials
+
+class FakeSource:
+    """Service-account credentials stand-in that counts token fetches"""
+    service_account_email = "svc@example.iam.gserviceaccount.com"
+    scopes = ["scope-a"]
+
+    def __init__(self, lifetime=3600):
+        self.lifetime = lifetime
+        self.refreshes = 0
+        self.token = None
+        self.expiry = None
+
+    def refresh(self, request):
+        self.refreshes += 1
+        self.token = f"token-{self.refreshes}"
+        self.expiry = datetime.utcnow() + timedelta(seconds=self.lifetime)
+
+@pytest.fixture
+def token_cache():
+    cache = TokenCache(refresh_margin=300, background=False)
+    yield cache
+    cache.stop()
+
+def test_token_fetched_once_and_reused(token_cache):
+    """Repeated lookups hit the in-memory cache"""
+    source = FakeSource()
+
+    first = token_cache.get_token("key", source)
+    second = token_cache.get_token("key", source)
+
+    assert first == second
+    assert source.refreshes == 1
+
+def test_refresh_due_renews_tokens_near_expiry(token_cache):
+    """Tokens inside the refresh margin are renewed without a caller waiting"""
+    source = FakeSource(lifetime=280)
+    token, _ = token_cache.get_token("key", source)
+    assert token == "token-1"
+
+    token_cache.refresh_due()
+
+    token, expiry = token_cache.get_token("key", source)
+    assert token == "token-2"
+    assert expiry - time.time() > 270
+
+def test_file_store_shares_tokens_between_caches(tmp_path):
+    """A second worker picks up the token another worker already fetched"""
+    path = str(tmp_path / "tokens.json")
+    worker_a = TokenCache(store=FileTokenStore(path), background=False)
+    worker_b = TokenCache(store=FileTokenStore(path), background=False)
+    source_a, source_b = FakeSource(), FakeSource()
+
+    try:
+        token_a, _ = worker_a.get_token("key", source_a)
+        token_b, _ = worker_b.get_token("key", source_b)
+    finally:
+        worker_a.stop()
+        worker_b.stop()
+
+    assert token_a == token_b
+    assert source_b.refreshes == 0
+
+def test_cached_credentials_use_token_cache(token_cache):
+    """CachedCredentials take token and expiry from the cache"""
+    source = FakeSource()
+    creds = CachedCredentials(source, cache=token_cache)
+    assert not creds.valid
+
+    creds.refresh(None)
+
+    assert creds.valid
+    assert creds.token == "token-1"
+    assert creds.cache_key == "svc@example.iam.gserviceaccount.com:scope-a"
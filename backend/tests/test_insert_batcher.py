@@ -0,0 +1,95 @@
+import asyncio
+from datetime import date
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from app.database import Base
+from app.exceptions import DatabaseError
+from app.models import GeneratedDocument
+from app.services.insert_batcher import InsertBatcher
+
+@pytest.fixture
+async def session_factory(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'inserts.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    opened = []
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+
+    def factory():
+        opened.append(1)
+        return sessions()
+
+    factory.opened = opened
+    factory.sessions = sessions
+    yield factory
+    await engine.dispose()
+
+def make_row(i, doc_id=None):
+    return {
+        "name": f"User {i}",
+        "date": date(2024, 1, 1),
+        "amount": 10.0 + i,
+        "content": f"Content {i}",
+        "doc_id": doc_id or f"doc-{i}",
+        "doc_url": f"https://docs.google.com/document/d/doc-{i}"
+    }
+
+@pytest.mark.asyncio
+async def test_concurrent_inserts_share_one_transaction(session_factory):
+    """Rows submitted together are written by one transaction and each caller gets its own id"""
+    batcher = InsertBatcher(session_factory, window=0.01)
+
+    inserted = await asyncio.gather(*(batcher.insert(make_row(i)) for i in range(10)))
+
+    assert len(session_factory.opened) == 1
+    async with session_factory.sessions() as db:
+        stored = dict((await db.execute(select(GeneratedDocument.id, GeneratedDocument.doc_id))).all())
+    assert [stored[pk] for pk, _ in inserted] == [f"doc-{i}" for i in range(10)]
+    assert all(created_at is not None for _, created_at in inserted)
+
+@pytest.mark.asyncio
+async def test_full_batch_is_written_without_waiting(session_factory):
+    """Reaching max_size flushes immediately instead of waiting out the window"""
+    batcher = InsertBatcher(session_factory, window=60, max_size=3)
+
+    inserted = await asyncio.wait_for(
+        asyncio.gather(*(batcher.insert(make_row(i)) for i in range(3))), timeout=5
+    )
+
+    assert len(inserted) == 3
+
+@pytest.mark.asyncio
+async def test_bad_row_only_fails_its_caller(session_factory):
+    """A duplicate doc_id fails that insert; the rest of the batch is still saved"""
+    batcher = InsertBatcher(session_factory, window=0.01)
+    await batcher.insert(make_row(0))
+
+    results = await asyncio.gather(
+        batcher.insert(make_row(1)),
+        batcher.insert(make_row(2, doc_id="doc-0")),
+        batcher.insert(make_row(3)),
+        return_exceptions=True
+    )
+
+    assert isinstance(results[1], DatabaseError)
+    assert not isinstance(results[0], Exception)
+    assert not isinstance(results[2], Exception)
+    async with session_factory.sessions() as db:
+        doc_ids = (await db.execute(select(GeneratedDocument.doc_id))).scalars().all()
+    assert sorted(doc_ids) == ["doc-0", "doc-1", "doc-3"]
+
+
+@pytest.mark.asyncio
+async def test_drain_writes_queued_rows(session_factory):
+    """Draining on shutdown commits rows still waiting out the window"""
+    batcher = InsertBatcher(session_factory, window=60)
+    pending = asyncio.ensure_future(batcher.insert(make_row(0)))
+    await asyncio.sleep(0)
+
+    await asyncio.wait_for(batcher.drain(), timeout=5)
+
+    assert pending.done()
+    assert not batcher._writing
+    async with session_factory.sessions() as db:
+        assert (await db.execute(select(GeneratedDocument.doc_id))).scalars().all() == ["doc-0"]
@@ -0,0 +1,160 @@
+import asyncio
+from datetime import date, datetime, timedelta
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from app.models import GeneratedDocument
+from app.services.jobs import GenerationWorkerPool, generation_pool, JOB_DONE, JOB_PENDING, JOB_PROCESSING
+from app.exceptions import GoogleAPIError
+
+@pytest.fixture(autouse=True)
+async def stop_generation_pool():
+    yield
+    await generation_pool.stop()
+
+@pytest.fixture
+def doc_data():
+    return {
+        "name": "Async User",
+        "date": str(date.today()),
+        "amount": 42.0,
+        "template_type": "invoice"
+    }
+
+@pytest.mark.asyncio
+async def test_async_generation_returns_job(async_client, doc_data):
+    """Async mode answers 202 with a job id and a worker finishes the Google Doc"""
+    response = await async_client.post("/generate-document?mode=async", json=doc_data)
+    assert response.status_code == 202
+    data = response.json()["data"]
+    assert data["status"] == "pending"
+    assert data["status_url"] == f"/jobs/{data['job_id']}"
+
+    await generation_pool.join()
+
+    response = await async_client.get(data["status_url"])
+    assert response.status_code == 200
+    job = response.json()["data"]
+    assert job["status"] == "done"
+    assert job["error"] is None
+    assert job["document"]["doc_id"].startswith("mock-")
+    assert "INVOICE" in job["document"]["content"]
+
+@pytest.mark.asyncio
+async def test_async_generation_records_google_failure(async_client, doc_data, mocker):
+    """Google failures are reported on the job instead of the original request"""
+    mocker.patch(
+        "app.services.document.DocumentService.create_google_document",
+        side_effect=GoogleAPIError("quota exceeded")
+    )
+
+    response = await async_client.post("/generate-document?mode=async", json=doc_data)
+    assert response.status_code == 202
+    await generation_pool.join()
+
+    job = (await async_client.get(response.json()["data"]["status_url"])).json()["data"]
+    assert job["status"] == "failed"
+    assert job["error"] == "quota exceeded"
+    assert job["document"] is None
+
+@pytest.mark.asyncio
+async def test_async_generation_validation_error(async_client, doc_data):
+    """Invalid templates are rejected before anything is queued"""
+    doc_data["template_type"] = "invalid"
+
+    response = await async_client.post("/generate-document?mode=async", json=doc_data)
+
+    assert response.status_code == 422
+    assert "Invalid template type" in response.json()["detail"]
+
+@pytest.mark.asyncio
+async def test_unknown_job_returns_404(async_client):
+    response = await async_client.get("/jobs/does-not-exist")
+    assert response.status_code == 404
+
+
+class CountingService:
+    def __init__(self):
+        self.calls = 0
+
+    async def create_google_document(self, name, content):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return {"doc_id": f"claimed-{self.calls}", "doc_url": "url"}
+
+async def add_job(db, **columns):
+    document = GeneratedDocument(
+        name="Claim", date=date.today(), amount=1, content="c", job_id="job", **columns
+    )
+    db.add(document)
+    await db.commit()
+    return document.id
+
+@pytest.mark.asyncio
+async def test_job_is_claimed_once(async_db):
+    """Two workers racing for the same job create only one Google Doc"""
+    service = CountingService()
+    pool = GenerationWorkerPool(
+        session_factory=async_sessionmaker(async_db.bind, expire_on_commit=False),
+        service_factory=lambda: service
+    )
+    document_id = await add_job(async_db, google_status=JOB_PENDING)
+
+    await asyncio.gather(pool.process(document_id), pool.process(document_id))
+
+    assert service.calls == 1
+    document = await async_db.get(GeneratedDocument, document_id, populate_existing=True)
+    assert document.google_status == JOB_DONE
+
+@pytest.mark.asyncio
+async def test_processing_job_reclaimed_only_after_lease(async_db):
+    """A job another worker holds is left alone until its lease runs out"""
+    service = CountingService()
+    pool = GenerationWorkerPool(
+        session_factory=async_sessionmaker(async_db.bind, expire_on_commit=False),
+        service_factory=lambda: service,
+        lease=60
+    )
+    held = await add_job(async_db, google_status=JOB_PROCESSING, google_claimed_at=datetime.utcnow())
+    abandoned = await add_job(
+        async_db, google_status=JOB_PROCESSING, google_claimed_at=datetime.utcnow() - timedelta(minutes=5)
+    )
+
+    await pool.process(held)
+    await pool.process(abandoned)
+
+    assert service.calls == 1
+    assert (await async_db.get(GeneratedDocument, held, populate_existing=True)).google_status == JOB_PROCESSING
+    assert (await async_db.get(GeneratedDocument, abandoned, populate_existing=True)).google_status == JOB_DONE
+
+
+@pytest.mark.asyncio
+async def test_expired_lease_deletes_created_doc(async_db):
+    """A worker whose lease ran out deletes the Doc it created instead of recording it"""
+    session_factory = async_sessionmaker(async_db.bind, expire_on_commit=False)
+
+    class ReclaimedService(CountingService):
+        def __init__(self):
+            super().__init__()
+            self.deleted = []
+
+        async def create_google_document(self, name, content):
+            # Another worker reclaims the job while this one talks to Google
+            async with session_factory() as db:
+                document = await db.get(GeneratedDocument, document_id)
+                document.google_claimed_at = datetime.utcnow() + timedelta(seconds=1)
+                await db.commit()
+            return await super().create_google_document(name, content)
+
+        async def delete_google_documents(self, doc_ids):
+            self.deleted.extend(doc_ids)
+
+    service = ReclaimedService()
+    pool = GenerationWorkerPool(session_factory=session_factory, service_factory=lambda: service)
+    document_id = await add_job(async_db, google_status=JOB_PENDING)
+
+    await pool.process(document_id)
+
+    assert service.deleted == ["claimed-1"]
+    document = await async_db.get(GeneratedDocument, document_id, populate_existing=True)
+    assert document.google_status == JOB_PROCESSING
+    assert document.doc_id is None
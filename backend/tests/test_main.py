@@ -1,6 +1,6 @@
 from datetime import date, datetime
 import pytest
-from app import models
+from app import main, models
 
 @pytest.mark.asyncio
 async def test_health_check(async_client):
@@ -154,4 +154,48 @@ async def test_generate_document_validation_error(async_client):
     assert any("String should have at least 2 characters" in e["msg"] 
               for e in error_detail)
 
-# ... rest of the file remains the same ... 
\ No newline at end of file
+# ... rest of the file remains the same ... 
+
+
+@pytest.mark.asyncio
+async def test_get_documents_summary_view(async_client):
+    """Test that the summary view leaves out document bodies"""
+    response = await async_client.post("/generate-document", json={
+        "name": "Summary User",
+        "date": str(date.today()),
+        "amount": 42.0,
+        "template_type": "receipt"
+    })
+    assert response.status_code == 200
+
+    response = await async_client.get("/documents", params={"view": "summary", "page_size": 100})
+    assert response.status_code == 200
+    items = response.json()["data"]["items"]
+    assert items
+    assert set(items[0]) == set(models.GeneratedDocument.SUMMARY_FIELDS)
+
+    response = await async_client.get("/documents", params={"fields": "name,amount"})
+    assert response.status_code == 200
+    assert set(response.json()["data"]["items"][0]) == {"name", "amount"}
+
+    response = await async_client.get("/documents", params={"fields": "name,secret"})
+    assert response.status_code == 422
+
+@pytest.mark.asyncio
+async def test_get_documents_fields_on_cache_hit(async_client, monkeypatch):
+    """Cached listings hold full dicts; they are filtered by fields like fresh records"""
+    cached_item = {"id": 1, "name": "Cached", "amount": 7.0, "content": "Body",
+                   "created_at": "2024-01-01T00:00:00"}
+
+    async def cached_get_documents(self, db, **kwargs):
+        return {"items": [cached_item], "total": 1, "page": 1, "page_size": 10,
+                "pages": 1, "total_exact": True, "next_cursor": None}
+
+    monkeypatch.setattr(main.DocumentService, "get_documents", cached_get_documents)
+
+    response = await async_client.get("/documents", params={"fields": "name,amount"})
+    assert response.status_code == 200
+    assert response.json()["data"]["items"] == [{"name": "Cached", "amount": 7.0}]
+
+    response = await async_client.get("/documents")
+    assert response.json()["data"]["items"] == [cached_item]
@@ -0,0 +1,28 @@
+import time
+from app.services import pagination
+from app.services.pagination import clear_count_cache, get_cached_count, set_cached_count
+
+def test_count_cache_is_bounded():
+    """Least recently used counts are evicted past the size limit"""
+    clear_count_cache()
+    for i in range(5):
+        set_cached_count(f"q{i}", i, max_size=3)
+    assert get_cached_count("q0") is None
+    assert get_cached_count("q1") is None
+    assert [get_cached_count(f"q{i}") for i in range(2, 5)] == [2, 3, 4]
+
+    # Reading q2 makes q3 the oldest entry
+    get_cached_count("q2")
+    set_cached_count("q5", 5, max_size=3)
+    assert get_cached_count("q3") is None
+    assert get_cached_count("q2") == 2
+    clear_count_cache()
+
+def test_count_cache_drops_expired_entries_on_write():
+    """Expired counts are purged instead of lingering until evicted"""
+    clear_count_cache()
+    set_cached_count("old", 1, ttl=0)
+    time.sleep(0.001)
+    set_cached_count("new", 2)
+    assert list(pagination._count_cache) == ["new"]
+    clear_count_cache()
@@ -0,0 +1,105 @@
+"""Guard the hot document lookups against regressing to full table scans"""
+import os
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.orm import Session
+
+from app.database import Base
+from app.models import GeneratedDocument
+from app.services.pagination import KEYSET_ORDER, apply_keyset, encode_cursor
+from app.services.search import apply_search
+
+
+@pytest.fixture(scope="module")
+def plan_db():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    with Session(engine) as db:
+        yield db
+
+
+def query_plan(db: Session, statement) -> str:
+    compiled = statement.compile(db.get_bind(), compile_kwargs={"literal_binds": True})
+    rows = db.execute(text(f"EXPLAIN QUERY PLAN {compiled}")).all()
+    return "\n".join(row[-1] for row in rows)
+
+
+def assert_uses_index(plan: str, index: str, seek: bool = True):
+    # SEARCH seeks into the index; SCAN walks it in order (fine when a LIMIT stops it early)
+    assert f"{'SEARCH' if seek else 'SCAN'} generated_documents USING INDEX {index}" in plan, plan
+    assert "USE TEMP B-TREE" not in plan, plan
+
+
+def test_doc_id_lookup_uses_index(plan_db):
+    plan = query_plan(plan_db, select(GeneratedDocument).where(GeneratedDocument.doc_id == "abc"))
+    assert_uses_index(plan, "ix_generated_documents_doc_id")
+
+
+def test_date_filter_uses_index(plan_db):
+    plan = query_plan(plan_db, select(GeneratedDocument).where(GeneratedDocument.date == date(2024, 1, 1)))
+    assert_uses_index(plan, "ix_generated_documents_date")
+
+
+def test_list_order_uses_index(plan_db):
+    plan = query_plan(plan_db, select(GeneratedDocument).order_by(*KEYSET_ORDER).offset(20).limit(10))
+    assert_uses_index(plan, "ix_generated_documents_created_at_id", seek=False)
+
+
+def test_keyset_page_uses_index(plan_db):
+    cursor = encode_cursor(datetime(2024, 1, 1), 42)
+    statement = apply_keyset(select(GeneratedDocument).order_by(*KEYSET_ORDER), cursor).limit(10)
+    assert_uses_index(query_plan(plan_db, statement), "ix_generated_documents_created_at_id")
+
+
+def test_search_uses_fulltext_index(plan_db):
+    statement = apply_search(select(GeneratedDocument), "sqlite", "contract").limit(10)
+    plan = query_plan(plan_db, statement)
+    assert "SCAN generated_documents_fts VIRTUAL TABLE INDEX" in plan, plan
+    assert "SCAN generated_documents " not in plan + " ", plan
+
+
+POSTGRES_URL = os.getenv("TEST_POSTGRES_URL")
+
+
+@pytest.fixture(scope="module")
+def pg_plan_db():
+    if not POSTGRES_URL:
+        pytest.skip("TEST_POSTGRES_URL is not set")
+    engine = create_engine(POSTGRES_URL)
+    with engine.connect() as conn:
+        # Build the schema inside a transaction that is rolled back, leaving the database untouched
+        transaction = conn.begin()
+        Base.metadata.create_all(bind=conn)
+        # An empty table is cheapest to scan; make the planner show which index it would use
+        conn.execute(text("SET LOCAL enable_seqscan = off"))
+        with Session(bind=conn) as db:
+            yield db
+        transaction.rollback()
+    engine.dispose()
+
+
+def pg_query_plan(db: Session, statement) -> str:
+    compiled = statement.compile(db.get_bind())
+    rows = db.connection().exec_driver_sql(f"EXPLAIN {compiled}", compiled.params).all()
+    return "\n".join(row[0] for row in rows)
+
+
+def test_pg_name_filter_uses_trigram_index(pg_plan_db):
+    statement = select(GeneratedDocument).where(GeneratedDocument.name.ilike("%smith%")).limit(10)
+    plan = pg_query_plan(pg_plan_db, statement)
+    assert "Bitmap Index Scan on ix_generated_documents_name_trgm" in plan, plan
+
+
+def test_pg_doc_id_lookup_uses_unique_index(pg_plan_db):
+    plan = pg_query_plan(pg_plan_db, select(GeneratedDocument).where(GeneratedDocument.doc_id == "abc"))
+    assert "Index Scan using ix_generated_documents_doc_id" in plan, plan
+
+
+def test_pg_keyset_page_uses_index(pg_plan_db):
+    cursor = encode_cursor(datetime(2024, 1, 1), 42)
+    statement = apply_keyset(select(GeneratedDocument).order_by(*KEYSET_ORDER), cursor).limit(10)
+    plan = pg_query_plan(pg_plan_db, statement)
+    assert "Index Scan using ix_generated_documents_created_at_id" in plan, plan
+    assert "Sort" not in plan, plan
@@ -0,0 +1,34 @@
+import pytest
+from datetime import date, datetime
+from app.models import GeneratedDocument
+from app.services.records import get_document_record, record_columns, record_type
+
+def test_record_to_dict_matches_model():
+    """Test that records serialize exactly like GeneratedDocument.to_dict"""
+    values = {
+        "id": 1, "name": "Record", "date": date(2024, 1, 2), "amount": 5.0, "doc_id": "d",
+        "doc_url": "u", "content": "c", "google_doc_id": None, "google_status": None,
+        "created_at": datetime(2024, 1, 2, 3, 4, 5, 6)
+    }
+    record = record_type(GeneratedDocument.SERIALIZED_FIELDS)(**values)
+    assert record.to_dict() == GeneratedDocument(**values).to_dict()
+    assert record.to_dict(["name", "date"]) == {"name": "Record", "date": "2024-01-02"}
+
+def test_records_are_immutable():
+    """Test that records can't be modified or given new attributes"""
+    record = record_type(record_columns(["name"]))(1, "Record", datetime(2024, 1, 1))
+    with pytest.raises(AttributeError):
+        record.name = "Changed"
+    with pytest.raises(AttributeError):
+        record.extra = 1
+
+@pytest.mark.asyncio
+async def test_get_document_record(async_db):
+    """Test single-document lookup by doc id"""
+    async_db.add(GeneratedDocument(
+        name="Lookup", date=date(2024, 1, 1), amount=1, content="c", doc_id="record-lookup"
+    ))
+    await async_db.commit()
+    record = await get_document_record(async_db, "record-lookup")
+    assert record.name == "Lookup"
+    assert await get_document_record(async_db, "missing") is None
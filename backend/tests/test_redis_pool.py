@@ -0,0 +1,40 @@
+import pytest
+from app.config import REDIS_MAX_CONNECTIONS, REDIS_SOCKET_TIMEOUT
+from app.services import cache as cache_module
+from app.services.cache import RedisCache, get_shared_cache
+from app.services.monitoring import registry
+from app.services.redis_pool import close_redis_pools, get_redis_client, get_redis_pool
+
+@pytest.fixture(autouse=True)
+async def reset_pools():
+    await close_redis_pools()
+    yield
+    await close_redis_pools()
+
+def test_pool_is_shared_and_configured():
+    """Every client for a server draws from one bounded pool"""
+    pool = get_redis_pool()
+    assert get_redis_pool() is pool
+    assert pool.max_connections == REDIS_MAX_CONNECTIONS
+    assert pool.connection_kwargs["socket_timeout"] == REDIS_SOCKET_TIMEOUT
+    assert get_redis_client().connection_pool is pool
+    assert get_redis_pool(port=6380) is not pool
+
+@pytest.mark.asyncio
+async def test_cache_instances_reuse_the_pool(monkeypatch):
+    """Initializing a RedisCache attaches to the pool instead of connecting anew"""
+    monkeypatch.setattr(cache_module, "TESTING", False)
+    first, second = RedisCache(), RedisCache()
+    await first.initialize()
+    await second.initialize()
+    assert first.redis.connection_pool is second.redis.connection_pool is get_redis_pool()
+
+def test_shared_cache_is_one_instance():
+    assert get_shared_cache() is get_shared_cache()
+
+@pytest.mark.asyncio
+async def test_pool_usage_metrics():
+    """Pool gauges are read from the live pool at scrape time"""
+    get_redis_pool()
+    assert registry.get_sample_value("redis_pool_connections", {"state": "in_use"}) == 0
+    assert registry.get_sample_value("redis_pool_max_connections") == REDIS_MAX_CONNECTIONS
@@ -0,0 +1,48 @@
+import pytest
+from datetime import datetime
+from sqlalchemy import select
+from app.models import GeneratedDocument
+from app.services.search import fts5_query
+from app.exceptions import ValidationError
+
+def test_fts5_query_quotes_terms():
+    """Test that search input is reduced to quoted FTS5 terms"""
+    assert fts5_query('contract "AND" x-ray') == '"contract" "AND" "x" "ray"'
+    assert fts5_query('***') == ''
+
+@pytest.mark.asyncio
+async def test_search_documents(document_service, async_db):
+    """Test full-text search over name and content, ranked by relevance"""
+    documents = [
+        ("Search Alpha", "Lease contract for the harbour warehouse"),
+        ("Search Beta", "Receipt for harbour fees, harbour dues and harbour parking"),
+        ("Search Gamma", "Invoice for office supplies"),
+    ]
+    for name, content in documents:
+        async_db.add(GeneratedDocument(
+            name=name, date=datetime.now().date(), amount=10, content=content, doc_id=f"search-{name}"
+        ))
+    await async_db.commit()
+
+    result = await document_service.get_documents(async_db, q="harbour")
+    assert [doc.name for doc in result["items"]] == ["Search Beta", "Search Alpha"]
+    assert result["total"] == 2
+    assert result["next_cursor"] is None
+
+    result = await document_service.get_documents(async_db, q="gamma")
+    assert [doc.name for doc in result["items"]] == ["Search Gamma"]
+
+    # Updates are re-indexed
+    gamma = (await async_db.execute(
+        select(GeneratedDocument).where(GeneratedDocument.name == "Search Gamma")
+    )).scalar_one()
+    gamma.content = "Invoice for harbour cranes"
+    await async_db.commit()
+    result = await document_service.get_documents(async_db, q="cranes")
+    assert [doc.name for doc in result["items"]] == ["Search Gamma"]
+
+@pytest.mark.asyncio
+async def test_search_rejects_cursor(document_service, async_db):
+    """Test that search results can't be paged by cursor"""
+    with pytest.raises(ValidationError):
+        await document_service.get_documents(async_db, q="harbour", cursor="abc")